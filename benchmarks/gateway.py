@@ -0,0 +1,62 @@
+import argparse
+import itertools
+import time
+from pyprosim import PyProsim, SimulatedBackend
+from pyprosim.gateway import Gateway, GatewayClient
+
+parser = argparse.ArgumentParser(description="Gateway throughput over loopback")
+parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+parser.add_argument("--datarefs", type=int, nargs="+", default=[10, 100, 1000])
+parser.add_argument("--rates", type=float, nargs="+", default=[10, 50])
+parser.add_argument("--duration", type=float, default=2.0)
+parser.add_argument("--udp", action="store_true")
+parser.add_argument("--port", type=int, default=18089)
+args = parser.parse_args()
+
+print(
+    f"{'clients':>7} {'datarefs':>8} {'rate':>6} {'updates/s':>10} {'expected':>10} {'cpu %':>6} {'get us':>7}"
+)
+for clients, datarefs, rate in itertools.product(
+    args.clients, args.datarefs, args.rates
+):
+    backend = SimulatedBackend(catalog_size=max(20000, datarefs * 2), update_rate=rate)
+    prosim = PyProsim(backend=backend)
+    prosim.connect("localhost")
+    names = [f"aircraft.engines.{i}.n1" for i in range(1, datarefs + 1)]
+    received = 0
+
+    def on_update(name, value):
+        global received
+        received += 1
+
+    with Gateway(prosim, port=args.port, udp=args.udp):
+        connections = [
+            GatewayClient(port=args.port, udp=args.udp) for _ in range(clients)
+        ]
+        for connection in connections:
+            for name in names:
+                connection.subscribe(name, 1, on_update)
+
+        # Every client gets every change of every dataref
+        received = 0
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        time.sleep(args.duration)
+        elapsed = time.perf_counter() - start
+        cpu = (time.process_time() - cpu_start) / elapsed * 100
+        updates = received / elapsed
+
+        # Request round trip
+        calls = 200
+        start = time.perf_counter()
+        for _ in range(calls):
+            connections[0].get(names[0])
+        round_trip = (time.perf_counter() - start) / calls * 1e6
+
+        for connection in connections:
+            connection.close()
+    backend.stop()
+    print(
+        f"{clients:>7} {datarefs:>8} {rate:>6.0f} {updates:>10.0f} "
+        f"{clients * datarefs * rate:>10.0f} {cpu:>6.0f} {round_trip:>7.0f}"
+    )
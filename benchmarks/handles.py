@@ -0,0 +1,26 @@
+import timeit
+from pyprosim import PyProsim, SimulatedBackend
+
+CALLS = 200000
+
+# Connect to the simulated backend and activate one dataref of each access type
+prosim = PyProsim(backend=SimulatedBackend(catalog_size=1000))
+prosim.connect("localhost")
+read_name = "aircraft.engines.1.n1"
+write_name = "system.analog.A_POT_1"
+prosim.activate_dataref(read_name, 0)
+prosim.activate_dataref(write_name, 0)
+
+read_handle = prosim.handle(read_name)
+write_handle = prosim.handle(write_name)
+
+benchmarks = {
+    "get_value": lambda: prosim.get_value(read_name),
+    "handle.get": read_handle.get,
+    "set_value": lambda: prosim.set_value(write_name, 0.5),
+    "handle.set": lambda: write_handle.set(0.5),
+}
+
+for name, call in benchmarks.items():
+    elapsed = min(timeit.repeat(call, number=CALLS, repeat=5))
+    print(f"{name:>10}: {elapsed / CALLS * 1e9:8.1f} ns/call")
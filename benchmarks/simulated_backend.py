@@ -0,0 +1,48 @@
+import argparse
+import time
+from pyprosim import PyProsim, SimulatedBackend
+
+parser = argparse.ArgumentParser(
+    description="PyProsim throughput using the simulated backend"
+)
+parser.add_argument("--catalog-size", type=int, default=20000)
+parser.add_argument("--active", type=int, default=1000)
+parser.add_argument("--rounds", type=int, default=50)
+parser.add_argument("--latency", type=float, default=0.0)
+args = parser.parse_args()
+
+backend = SimulatedBackend(catalog_size=args.catalog_size, latency=args.latency)
+prosim = PyProsim(backend=backend)
+
+# Connect, this includes the catalog transfer and parse
+start = time.perf_counter()
+prosim.connect("localhost")
+elapsed = time.perf_counter() - start
+print(f"connect ({args.catalog_size} datarefs): {elapsed * 1000:.1f} ms")
+
+# Activate datarefs with a callback
+events = 0
+
+
+def on_change(dataref):
+    global events
+    events += 1
+
+
+names = list(prosim.get_dataref_database())[: args.active]
+start = time.perf_counter()
+for name in names:
+    prosim.activate_dataref(name, 100, on_change_callback=on_change)
+elapsed = time.perf_counter() - start
+print(
+    f"activate ({len(names)} datarefs): {elapsed * 1000:.1f} ms "
+    f"({len(names) / elapsed:.0f} activations/s)"
+)
+
+# Callback throughput
+start = time.perf_counter()
+backend.pump(args.rounds)
+elapsed = time.perf_counter() - start
+print(
+    f"callbacks ({events} events): {elapsed * 1000:.1f} ms ({events / elapsed:.0f} events/s)"
+)
@@ -0,0 +1,52 @@
+import argparse
+import os
+import tempfile
+import time
+from pyprosim import PyProsim, SimulatedBackend, Snapshot
+
+parser = argparse.ArgumentParser(
+    description="Full cockpit snapshot and restore timings"
+)
+parser.add_argument("--catalog-size", type=int, default=20000)
+parser.add_argument("--changed", type=int, default=1000)
+parser.add_argument("--chunk-size", type=int, default=100)
+parser.add_argument("--latency", type=float, default=0.0)
+args = parser.parse_args()
+
+backend = SimulatedBackend(catalog_size=args.catalog_size, update_rate=0)
+prosim = PyProsim(backend=backend)
+prosim.connect("localhost")
+# Latency only for the dataref round trips, not the catalog transfer
+backend.latency = args.latency
+
+snapshot = prosim.snapshot()
+print(f"snapshot ({len(snapshot)} datarefs): {snapshot.duration * 1000:.1f} ms")
+
+path = os.path.join(tempfile.mkdtemp(), "cockpit.snapshot")
+start = time.perf_counter()
+snapshot.save(path)
+saved = time.perf_counter() - start
+start = time.perf_counter()
+snapshot = Snapshot.load(path)
+loaded = time.perf_counter() - start
+print(
+    f"file: {os.path.getsize(path) / 1024:.1f} KiB, "
+    f"save {saved * 1000:.1f} ms, load {loaded * 1000:.1f} ms"
+)
+
+
+def change_datarefs():
+    """Change some datarefs on the server side, as a training session would"""
+    for name, value in list(zip(snapshot.names, snapshot.values))[: args.changed]:
+        backend.values[name] = not value if isinstance(value, bool) else value + 1
+
+
+# First restore activates the datarefs and keeps them active for the second one
+for label in ("inactive", "active"):
+    change_datarefs()
+    report = prosim.restore(snapshot, chunk_size=args.chunk_size, keep_active=True)
+    print(
+        f"restore ({label} datarefs): {report.duration * 1000:.1f} ms, "
+        f"read {report.read_duration * 1000:.1f} ms, write {report.write_duration * 1000:.1f} ms, "
+        f"{len(report.written)} written, {report.unchanged} unchanged, {len(report.failed)} failed"
+    )
@@ -0,0 +1,58 @@
+import statistics
+import subprocess
+import sys
+
+RUNS = 15
+
+# Import time budgets in milliseconds, see README (Import Time)
+BUDGETS = {
+    "import pyprosim": 10.0,
+    "from pyprosim import PyProsim": 60.0,
+    "from pyprosim import PyProsim, SimulatedBackend": 80.0,
+}
+
+# Modules that the imports above must not load
+FORBIDDEN = ("clr", "System", "ProSimSDK", "asyncio", "http.server")
+
+# Measured in a fresh interpreter, the import machinery is already loaded there
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, *[name for name in {forbidden!r} if name in sys.modules])
+"""
+
+
+def measure(statement: str):
+    times = []
+    loaded = set()
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                PROBE.format(statement=statement, forbidden=FORBIDDEN),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        loaded.update(output[1:])
+    return statistics.median(times), min(times), loaded
+
+
+failed = False
+for statement, budget in BUDGETS.items():
+    median, best, loaded = measure(statement)
+    ok = median <= budget and not loaded
+    failed |= not ok
+    print(
+        f"{statement:>48}: median {median:6.1f} ms, best {best:6.1f} ms, "
+        f"budget {budget:5.1f} ms {'OK' if ok else 'FAIL'}"
+    )
+    if loaded:
+        print(f"{'':>48}  loaded {', '.join(sorted(loaded))}")
+
+sys.exit(1 if failed else 0)
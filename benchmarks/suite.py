@@ -0,0 +1,318 @@
+"""Benchmarks of the PyProsim hot paths on the simulated backend, with JSON
+baselines to catch regressions:
+
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --compare baseline.json --threshold 0.2
+
+Every result is the median of --repeat runs, after --warmup runs which are
+not timed, and the baseline records their spread. Compare exits with an error
+when a result is worse than its baseline by more than the threshold (0.2 is
+20 %), or by more than NOISE_FACTOR times the spread if that is larger.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import timeit
+from decimal import Decimal
+from typing import List, Tuple
+
+from pyprosim import CallbackDispatcher, PyProsim, SimulatedBackend
+from pyprosim.simulator import SIMULATED_DATA_TYPES, SimulatedDataRefDescription
+
+FORMAT_VERSION = 2
+
+# Regressions smaller than this many times the spread of the runs are noise
+NOISE_FACTOR = 3
+
+# Catalog sizes of the parse benchmark
+CATALOG_SIZES = (1000, 10000, 50000)
+
+# Value written by the set_value benchmark, per SDK type
+TYPE_VALUES = {
+    "System.Boolean": True,
+    "System.Byte": 200,
+    "System.SByte": -100,
+    "System.Char": "A",
+    "System.Decimal": Decimal("1.5"),
+    "System.Double": 0.5,
+    "System.Single": 0.5,
+    "System.Int32": 100000,
+    "System.UInt32": 100000,
+    "System.IntPtr": 100000,
+    "System.UIntPtr": 100000,
+    "System.Int64": 100000,
+    "System.UInt64": 100000,
+    "System.Int16": 1000,
+    "System.UInt16": 1000,
+    "System.String": "TEXT",
+}
+
+# Lower is better for times, higher for rates
+LOWER, HIGHER = "lower", "higher"
+
+
+def connect(backend: SimulatedBackend, **options) -> PyProsim:
+    prosim = PyProsim(backend=backend, **options)
+    prosim.connect("localhost")
+    return prosim
+
+
+def times(call, number: int, runs: Tuple[int, int]) -> List[float]:
+    """Time per call in seconds of each timed run
+
+    Args:
+        call (Callable): Function to time
+        number (int): Calls per run
+        runs (Tuple[int, int]): Warmup runs, then timed runs
+
+    Returns:
+        List[float]: Time per call of the timed runs
+    """
+    warmup, repeat = runs
+    elapsed = timeit.repeat(call, number=number, repeat=warmup + repeat)
+    return [t / number for t in elapsed[warmup:]]
+
+
+def summarize(samples: List[float]) -> Tuple[float, float]:
+    """Median of the runs and their spread
+
+    Returns:
+        Tuple[float, float]: Median, and the median absolute deviation relative
+                             to the median
+    """
+    median = statistics.median(samples)
+    if not median:
+        return median, 0.0
+    return median, statistics.median(abs(s - median) for s in samples) / median
+
+
+def bench_parse(results: dict, runs: Tuple[int, int]):
+    for size in CATALOG_SIZES:
+        prosim = connect(SimulatedBackend(catalog_size=size))
+        # Without cache or pool every parse builds the catalog, then compares it
+        # with the current one
+        samples = times(prosim._parse_supported_datarefs, 1, runs)
+        results[f"parse_datarefs.{size}"] = ([t * 1e3 for t in samples], "ms", LOWER)
+
+
+def bench_database(results: dict, runs: Tuple[int, int]):
+    prosim = connect(SimulatedBackend(catalog_size=20000))
+    samples = times(prosim.get_dataref_database, 1, runs)
+    results["get_dataref_database.20000"] = ([t * 1e3 for t in samples], "ms", LOWER)
+
+
+def bench_values(results: dict, number: int, runs: Tuple[int, int]):
+    # One readable and writable dataref per SDK type
+    catalog = [
+        SimulatedDataRefDescription(
+            f"bench.{type_name}", type_name, type_name, "", True, True
+        )
+        for type_name in SIMULATED_DATA_TYPES
+    ]
+    prosim = connect(SimulatedBackend(catalog=catalog))
+    for type_name, value in TYPE_VALUES.items():
+        name = f"bench.{type_name}"
+        prosim.activate_dataref(name, 0)
+        get = times(lambda: prosim.get_value(name), number, runs)
+        set_ = times(lambda: prosim.set_value(name, value), number, runs)
+        results[f"get_value.{type_name}"] = ([t * 1e9 for t in get], "ns/call", LOWER)
+        results[f"set_value.{type_name}"] = ([t * 1e9 for t in set_], "ns/call", LOWER)
+
+
+def bench_activate(results: dict, count: int, runs: Tuple[int, int]):
+    prosim = connect(SimulatedBackend(catalog_size=20000))
+    names = list(prosim.get_dataref_database())[:count]
+
+    def on_change(dataref):
+        pass
+
+    warmup, repeat = runs
+    rates = []
+    for _ in range(warmup + repeat):
+        start = time.perf_counter()
+        subscriptions = [prosim.activate_dataref(n, 100, on_change) for n in names]
+        rates.append(len(names) / (time.perf_counter() - start))
+        for subscription in subscriptions:
+            subscription.cancel()
+    results["activate_dataref"] = (rates[warmup:], "activations/s", HIGHER)
+
+
+def bench_dispatch(results: dict, count: int, events: int, runs: Tuple[int, int]):
+    # Rate: every active dataref changed in turn, callbacks run in the event thread
+    backend = SimulatedBackend(catalog_size=20000)
+    prosim = connect(backend)
+    delivered = 0
+
+    def on_change(dataref):
+        nonlocal delivered
+        delivered += 1
+
+    for name in list(prosim.get_dataref_database())[:count]:
+        prosim.activate_dataref(name, 100, on_change)
+    rounds = max(1, events // count)
+    warmup, repeat = runs
+    rates = []
+    for _ in range(warmup + repeat):
+        delivered = 0
+        # Like timeit, without garbage collection pauses
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            backend.pump(rounds)
+            rates.append(delivered / (time.perf_counter() - start))
+        finally:
+            gc.enable()
+    results["dispatch.rate"] = (rates[warmup:], "events/s", HIGHER)
+
+    # Latency: one event at a time, from the server side change to the callback,
+    # with the percentiles taken in each run
+    per_run = max(100, min(events, 5000) // repeat)
+    for label, options in (
+        ("inline", {}),
+        ("dispatcher", {"dispatcher": CallbackDispatcher()}),
+    ):
+        backend = SimulatedBackend(catalog_size=1000)
+        prosim = connect(backend, **options)
+        name = "aircraft.engines.1.n1"
+        received = threading.Event()
+        arrival = 0.0
+
+        def on_arrival(dataref):
+            nonlocal arrival
+            arrival = time.perf_counter()
+            received.set()
+
+        prosim.activate_dataref(name, 100, on_arrival)
+        p50, p99 = [], []
+        for run in range(warmup + repeat):
+            latencies = []
+            for i in range(per_run):
+                received.clear()
+                start = time.perf_counter()
+                backend.emit(name, float(run * per_run + i))
+                received.wait(1.0)
+                latencies.append(arrival - start)
+            latencies.sort()
+            p50.append(statistics.median(latencies) * 1e6)
+            p99.append(latencies[int(len(latencies) * 0.99)] * 1e6)
+        results[f"dispatch.latency.{label}.p50"] = (p50[warmup:], "us", LOWER)
+        results[f"dispatch.latency.{label}.p99"] = (p99[warmup:], "us", LOWER)
+        if "dispatcher" in options:
+            options["dispatcher"].stop()
+
+
+def run(args) -> dict:
+    """Run the benchmarks
+
+    Returns:
+        dict: Median, spread (see summarize), unit and direction per result name
+    """
+    samples = {}
+    runs = (args.warmup, args.repeat)
+    bench_parse(samples, runs)
+    bench_database(samples, runs)
+    bench_values(samples, args.calls, runs)
+    bench_activate(samples, args.active, runs)
+    bench_dispatch(samples, args.active, args.events, runs)
+    return {
+        name: (*summarize(values), unit, better)
+        for name, (values, unit, better) in samples.items()
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """Print the results against the baseline. A change counts when it is past
+    the threshold and past NOISE_FACTOR times the larger spread of the two runs.
+
+    Returns:
+        int: Number of regressions past the threshold
+    """
+    regressions = 0
+    for name, (value, spread, unit, better) in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<40} {value:14.2f} {unit:<14} (new)")
+            continue
+        base = reference["value"]
+        # Relative change, positive when worse
+        if base > 0:
+            change = (value - base) / base if better == LOWER else (base - value) / base
+        else:
+            change = 0.0
+        limit = max(threshold, NOISE_FACTOR * max(spread, reference["spread"]))
+        status = ""
+        if change > limit:
+            status = "REGRESSION"
+            regressions += 1
+        elif change < -limit:
+            status = "improved"
+        print(
+            f"{name:<40} {value:14.2f} {unit:<14} {-change:+8.1%} "
+            f"(limit {limit:.0%}) {status}"
+        )
+    for name in baseline.keys() - results.keys():
+        print(f"{name:<40} {'':14} {'':<14} (missing)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PyProsim hot path benchmarks")
+    parser.add_argument(
+        "--save", metavar="FILE", help="write the results as a baseline"
+    )
+    parser.add_argument("--compare", metavar="FILE", help="compare with a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative change flagged as a regression (default 0.2)",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--active", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50000)
+    args = parser.parse_args()
+
+    results = run(args)
+
+    if args.save:
+        document = {
+            "format": FORMAT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "results": {
+                name: {"value": value, "spread": spread, "unit": unit, "better": better}
+                for name, (value, spread, unit, better) in results.items()
+            },
+        }
+        with open(args.save, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            document = json.load(f)
+        if document.get("format") != FORMAT_VERSION:
+            print(f"{args.compare}: unsupported baseline format", file=sys.stderr)
+            return 2
+        regressions = compare(results, document["results"], args.threshold)
+        if regressions:
+            print(f"{regressions} regression(s) past {args.threshold:.0%}")
+            return 1
+    else:
+        for name, (value, spread, unit, _) in results.items():
+            print(f"{name:<40} {value:14.2f} {unit:<14} ±{spread:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
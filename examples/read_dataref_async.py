@@ -0,0 +1,46 @@
+import asyncio
+from pathlib import Path
+from pyprosim import AsyncPyProsim
+
+# This file path
+this_path = Path(__file__).resolve().parent
+
+# SDK DLL file path. NOTE: Exclude the extension name.
+dll_path = this_path.joinpath("../", "prosimsdk", "ProSimSDK")
+
+
+def on_connect():
+    print("Prosim is connected!")
+
+
+def on_disconnect():
+    print("Prosim is DISCONNECTED!")
+
+
+async def main():
+    # Create class passing the dll_path
+    prosim = AsyncPyProsim(
+        prosimsdk_path=dll_path,
+        on_connect_callback=on_connect,
+        on_disconnect_callback=on_disconnect,
+    )
+
+    print("Example Running... Wating to connect to ProSim")
+    # Connect to Prosim.
+    # You can also try 127.0.0.1 if you are running locally. If that does not
+    # work, please use the machine ip address.
+    await prosim.connect("localhost")
+
+    # Print some simulator info
+    print(prosim.prosim.get_info())
+
+    # Wait until the engine is running
+    await prosim.wait_for("aircraft.engines.1.thrust", lambda n1: n1 > 20)
+    print("Engine 1 running!")
+
+    # Print every change of the engines thrust
+    async for name, value in prosim.changes("aircraft.engines.*.thrust", interval=100):
+        print(f"{name} = {value}")
+
+
+asyncio.run(main())
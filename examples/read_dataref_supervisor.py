@@ -0,0 +1,48 @@
+import time
+from pathlib import Path
+from pyprosim import PyProsim, ReconnectSupervisor
+
+# This file path
+this_path = Path(__file__).resolve().parent
+
+# SDK DLL file path. NOTE: Exclude the extension name.
+dll_path = this_path.joinpath("../", "prosimsdk", "ProSimSDK")
+
+
+def on_connect():
+    print("Prosim is connected!")
+
+
+def on_disconnect():
+    print("Prosim is DISCONNECTED!")
+
+
+# Create class passing the dll_path
+prosim = PyProsim(
+    prosimsdk_path=dll_path,
+    on_connect_callback=on_connect,
+    on_disconnect_callback=on_disconnect,
+)
+
+print("Example Running... Wating to connect to ProSim")
+# The supervisor connects, and reconnects whenever the connection is lost.
+# You can also try 127.0.0.1 if you are running locally. If that does not
+# work, please use the machine ip address.
+supervisor = ReconnectSupervisor(prosim, "localhost")
+supervisor.start()
+supervisor.wait_connected()
+
+# Print some simulator info
+print(prosim.get_info())
+
+# Register dataref to interact with. They are activated again after a reconnection.
+prosim.activate_dataref("aircraft.engines.1.thrust", 100)
+prosim.activate_dataref("aircraft.fuel.left.amount.kg", 1000)
+
+while True:
+    if prosim.connected:
+        print("N1: ", prosim.get_value("aircraft.engines.1.thrust"))
+        print("Fuel Left: ", prosim.get_value("aircraft.fuel.left.amount.kg"))
+    else:
+        print("Reconnecting...", supervisor.stats())
+    time.sleep(0.25)
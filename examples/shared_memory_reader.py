@@ -0,0 +1,28 @@
+import time
+from pyprosim import SharedMemoryReader
+
+# Reads the datarefs published by another process with SharedMemoryPublisher,
+# e.g. the process owning the ProSim connection:
+#
+#   with SharedMemoryPublisher(prosim, ["aircraft.engines.*.thrust"], interval=100):
+#       ...
+#
+# This process neither loads the ProSim SDK nor connects to ProSim.
+
+print("Example Running... Waiting for the publisher")
+while True:
+    try:
+        reader = SharedMemoryReader()
+        break
+    except FileNotFoundError:
+        time.sleep(1)
+
+with reader:
+    print(f"{len(reader.names)} datarefs published")
+    last_sequence = None
+    while True:
+        sequence, value = reader.read("aircraft.engines.1.thrust")
+        if sequence != last_sequence:
+            print("Thrust: ", value)
+            last_sequence = sequence
+        time.sleep(0.25)
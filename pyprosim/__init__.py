@@ -1 +1,84 @@
-from .pyprosim import PyProsim
\ No newline at end of file
+"""Python wrapper for ProSim.
+
+The public classes are imported on first access, so "import pyprosim" stays
+cheap and does not load the .NET runtime, which is only booted by the first
+ClrBackend (see README, Import Time).
+"""
+
+from importlib import import_module
+
+# Not imported from typing, which alone takes longer than this module
+TYPE_CHECKING = False
+
+# Public name -> module defining it
+_EXPORTS = {
+    "PyProsim": ".pyprosim",
+    "PyProsimBackend": ".backend",
+    "ClrBackend": ".backend",
+    "SimulatedBackend": ".simulator",
+    "CallbackDispatcher": ".dispatcher",
+    "AsyncPyProsim": ".aio",
+    "ChangeFilter": ".filters",
+    "Deadband": ".filters",
+    "Hysteresis": ".filters",
+    "MinInterval": ".filters",
+    "DiscreteChange": ".filters",
+    "TelemetryRecorder": ".telemetry",
+    "TelemetryLog": ".telemetry",
+    "ReplayBackend": ".telemetry",
+    "SharedMemoryPublisher": ".shm",
+    "SharedMemoryReader": ".shm",
+    "Gateway": ".gateway",
+    "GatewayClient": ".gateway",
+    "Subscription": ".subscription",
+    "ReconnectSupervisor": ".supervisor",
+    "Metrics": ".metrics",
+    "MetricsExporter": ".metrics",
+    "Tracer": ".trace",
+    "DerivedDataref": ".derived",
+    "FrameGroup": ".scheduler",
+    "History": ".history",
+    "Snapshot": ".snapshot",
+    "CatalogPool": ".catalog",
+    "ProsimManager": ".manager",
+    "CatalogCache": ".cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Cache it, the next accesses do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+    from .backend import PyProsimBackend, ClrBackend
+    from .simulator import SimulatedBackend
+    from .dispatcher import CallbackDispatcher
+    from .aio import AsyncPyProsim
+    from .filters import ChangeFilter, Deadband, Hysteresis, MinInterval, DiscreteChange
+    from .telemetry import TelemetryRecorder, TelemetryLog, ReplayBackend
+    from .shm import SharedMemoryPublisher, SharedMemoryReader
+    from .gateway import Gateway, GatewayClient
+    from .subscription import Subscription
+    from .supervisor import ReconnectSupervisor
+    from .metrics import Metrics, MetricsExporter
+    from .trace import Tracer
+    from .derived import DerivedDataref
+    from .scheduler import FrameGroup
+    from .history import History
+    from .snapshot import Snapshot
+    from .catalog import CatalogPool
+    from .manager import ProsimManager
+    from .cache import CatalogCache
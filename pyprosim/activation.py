@@ -0,0 +1,45 @@
+from typing import Callable, Dict, List, Tuple, Union
+
+# Characters that turn a dataref name into a glob pattern
+GLOB_CHARACTERS = frozenset("*?[")
+
+# Activation request: a name or pattern alone, or with its interval and callback
+ActivationRequest = Union[str, Tuple[str, int], Tuple[str, int, Callable]]
+
+
+def is_pattern(name: str) -> bool:
+    """Check whether a dataref name is a glob or prefix pattern
+
+    Args:
+        name (str): Dataref name or pattern
+
+    Returns:
+        bool: True for glob patterns (e.g. "aircraft.engines.*.n1") and
+              prefix patterns ending with a dot (e.g. "aircraft.engines.")
+    """
+    return name.endswith(".") or not GLOB_CHARACTERS.isdisjoint(name)
+
+
+class ActivationReport:
+    """Result of a bulk activation"""
+
+    def __init__(self):
+        # Names of the datarefs activated
+        self.activated: List[str] = []
+        # Datarefs which could not be activated and the reason
+        self.failed: Dict[str, Exception] = {}
+        # Patterns not matching any dataref
+        self.unmatched: List[str] = []
+        # Time taken by the whole batch in seconds
+        self.duration = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.unmatched
+
+    def __repr__(self) -> str:
+        return (
+            f"ActivationReport(activated={len(self.activated)}, "
+            f"failed={len(self.failed)}, unmatched={len(self.unmatched)}, "
+            f"duration={self.duration * 1000:.1f} ms)"
+        )
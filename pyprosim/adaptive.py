@@ -0,0 +1,294 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .exceptions import PyProsimDatarefException
+from .subscription import Subscription
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+logger = logging.getLogger(__name__)
+
+# Marker of "no value", None is a valid value to compare with
+_NO_VALUE = object()
+
+
+class AdaptiveInterval:
+    """Adaptive activation interval of a dataref, tuned by AdaptiveController.
+
+    While adaptive, the SDK dataref object is activated at this interval instead
+    of the smallest interval of the subscriptions. The interval stays between:
+
+    - lower bound: min_interval, or the smallest interval asked by a subscription
+      if larger, as no consumer wants the values faster
+    - upper bound: the freshness target, the oldest a value may be, and max_interval
+
+    The upper bound wins over the lower one: subscriptions asking for a larger
+    interval than the freshness target are throttled by their Subscription.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_interval: int,
+        max_interval: int,
+        freshness: int,
+        interval: int,
+    ):
+        self.name = name
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.freshness = freshness
+        self.interval = interval
+        # Own subscription keeping the dataref active
+        self.subscription: Subscription = None
+        # Value changes in the current observation window
+        self.changes = 0
+        self.window_start = time.monotonic()
+        self.change_rate = 0.0
+        self._last_value = _NO_VALUE
+        # Counters
+        self.events = 0
+        self.adjustments = 0
+        # Guards the counters, updated from the SDK event thread
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        """Interval, bounds and counters
+
+        Returns:
+            dict: Current interval and bounds in milliseconds, observed changes per
+                  second, events received and interval adjustments
+        """
+        return {
+            "interval": self.interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "freshness": self.freshness,
+            "change_rate": self.change_rate,
+            "events": self.events,
+            "adjustments": self.adjustments,
+        }
+
+    def _on_change(self, name: str, value: object):
+        """Change listener counting the events which carry a new value"""
+        with self._lock:
+            self.events += 1
+            if value != self._last_value:
+                self._last_value = value
+                self.changes += 1
+
+    def _take_changes(self, now: float) -> Optional[float]:
+        """Close the observation window
+
+        Args:
+            now (float): time.monotonic() value
+
+        Returns:
+            float: Changes per second during the window, None if it is empty
+        """
+        with self._lock:
+            elapsed = now - self.window_start
+            if elapsed <= 0:
+                return None
+            self.change_rate = self.changes / elapsed
+            self.changes = 0
+            self.window_start = now
+        return self.change_rate
+
+
+class AdaptiveController:
+    """Tunes the activation interval of the adaptive datarefs of a PyProsim,
+    see PyProsim.set_adaptive_interval.
+
+    Every period the controller compares the changes observed on each dataref
+    with the number of samples its interval allows:
+
+    - changing on most samples, the dataref is under-sampled and the interval is
+      halved, down to the lower bound
+    - changing on few samples, it is over-polled and the interval is doubled, up
+      to the upper bound
+    - without consumers (subscriptions or listeners) it goes to the upper bound
+
+    Each adjustment re-activates the SDK dataref object and is logged.
+    """
+
+    def __init__(
+        self,
+        prosim: "PyProsim",
+        period: float = 1.0,
+        low_usage: float = 0.25,
+        high_usage: float = 0.75,
+    ):
+        """AdaptiveController class init
+
+        Args:
+            prosim (PyProsim): PyProsim owning the datarefs
+            period (float, optional): Seconds between evaluations. Defaults to 1.0.
+            low_usage (float, optional): Fraction of samples carrying a change below
+                                         which the interval is doubled. Defaults to 0.25.
+            high_usage (float, optional): Fraction of samples carrying a change above
+                                          which the interval is halved. Defaults to 0.75.
+        """
+        self.prosim = prosim
+        self.period = period
+        self.low_usage = low_usage
+        self.high_usage = high_usage
+        self.datarefs: Dict[str, AdaptiveInterval] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def add(
+        self,
+        name: str,
+        min_interval: int,
+        max_interval: int,
+        freshness: Optional[int] = None,
+    ) -> AdaptiveInterval:
+        """Make the interval of a dataref adaptive, activating it
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref, derived dataref or invalid bounds
+
+        Returns:
+            AdaptiveInterval: Adaptive interval of the dataref
+        """
+        if not 0 < min_interval <= max_interval:
+            raise PyProsimDatarefException(
+                f"Invalid adaptive interval bounds {min_interval}-{max_interval} ms"
+            )
+        prosim = self.prosim
+        dataref = prosim._get_dataref(name)
+        if not isinstance(dataref, prosim.Dataref):
+            raise PyProsimDatarefException(f'Dataref "{name}" has no SDK interval')
+        if freshness is None:
+            freshness = max_interval
+        with self._lock:
+            if name in self.datarefs:
+                self.remove(name)
+            # Start from the interval in use, within the bounds
+            interval = dataref.interval or freshness
+            interval = max(min_interval, min(interval, max_interval, freshness))
+            state = AdaptiveInterval(
+                name, min_interval, max_interval, freshness, interval
+            )
+            with prosim._subscription_lock:
+                dataref._adaptive = state
+                # Not shared with an identical consumer subscription, see Dataref.activate
+                state.subscription = Subscription(dataref, interval)
+                dataref._subscriptions = dataref._subscriptions + (state.subscription,)
+                dataref._update_sdk_dataref()
+            prosim.add_change_listener(name, state._on_change)
+            self.datarefs[name] = state
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="pyprosim-adaptive", daemon=True
+                )
+                self._thread.start()
+        return state
+
+    def remove(self, name: str) -> None:
+        """Go back to the intervals of the subscriptions for a dataref
+
+        Args:
+            name (str): Dataref name
+        """
+        prosim = self.prosim
+        with self._lock:
+            state = self.datarefs.pop(name, None)
+            if state is None:
+                return
+            prosim.remove_change_listener(name, state._on_change)
+            dataref = prosim._get_dataref(name)
+            with prosim._subscription_lock:
+                dataref._adaptive = None
+                state.subscription.cancel()
+                dataref._update_sdk_dataref()
+
+    def stop(self) -> None:
+        """Stop tuning the intervals, they keep their last value"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def evaluate(self, now: float = None) -> int:
+        """Tune the intervals from the changes observed since the last evaluation
+
+        Args:
+            now (float, optional): time.monotonic() value. Defaults to None, now.
+
+        Returns:
+            int: Number of intervals adjusted
+        """
+        if now is None:
+            now = time.monotonic()
+        adjusted = 0
+        with self._lock:
+            for state in list(self.datarefs.values()):
+                if state._take_changes(now) is None:
+                    continue
+                target = self._target(state)
+                if target == state.interval:
+                    continue
+                logger.info(
+                    'Dataref "%s" interval %d -> %d ms (%.2f changes/s)',
+                    state.name,
+                    state.interval,
+                    target,
+                    state.change_rate,
+                )
+                state.interval = target
+                state.adjustments += 1
+                adjusted += 1
+                dataref = self.prosim._get_dataref(state.name)
+                with self.prosim._subscription_lock:
+                    dataref._update_sdk_dataref()
+        return adjusted
+
+    def stats(self) -> dict:
+        """Adaptive intervals and the SDK traffic they ask for
+
+        Returns:
+            dict: Stats per dataref (see AdaptiveInterval.stats), and the updates per
+                  second the intervals allow in total
+        """
+        datarefs = {name: state.stats() for name, state in list(self.datarefs.items())}
+        return {
+            "datarefs": datarefs,
+            "max_updates": sum(1000 / s["interval"] for s in datarefs.values()),
+        }
+
+    def _target(self, state: AdaptiveInterval) -> int:
+        """Interval for the observed changes and consumers, within the bounds"""
+        dataref = self.prosim._get_dataref(state.name)
+        consumers = [s for s in dataref._subscriptions if s is not state.subscription]
+        listeners = len(dataref._listeners) - 1
+        upper = min(state.max_interval, state.freshness)
+        lower = state.min_interval
+        demanded = [s.interval for s in consumers if s.interval > 0]
+        if demanded:
+            lower = max(lower, min(demanded))
+        lower = min(lower, upper)
+
+        if not consumers and listeners <= 0:
+            return upper
+        interval = state.interval
+        # Fraction of the samples allowed by the interval which carried a change
+        usage = state.change_rate * interval / 1000
+        if usage > self.high_usage:
+            interval //= 2
+        elif usage < self.low_usage:
+            interval *= 2
+        return max(lower, min(interval, upper))
+
+    def _run(self):
+        while not self._stop.wait(self.period):
+            try:
+                self.evaluate()
+            except Exception:
+                logger.exception("Adaptive interval evaluation failed")
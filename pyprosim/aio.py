@@ -0,0 +1,221 @@
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+from .exceptions import PyProsimDatarefException
+from .pyprosim import PyProsim
+from .subscription import Subscription
+
+
+class AsyncPyProsim:
+    """asyncio facade of PyProsim.
+
+    The SDK events are handed over to the event loop running connect() with
+    loop.call_soon_threadsafe, so awaiting coroutines are woken up as soon as
+    the event arrives, without polling. Each dataref is activated once, however
+    many coroutines wait for it or stream it.
+
+    The synchronous API is still available through the prosim attribute.
+    """
+
+    def __init__(
+        self,
+        prosimsdk_path: Path = None,
+        on_connect_callback: Callable = None,
+        on_disconnect_callback: Callable = None,
+        **kwargs,
+    ):
+        """AsyncPyProsim class init
+
+        Args:
+            prosimsdk_path (Path): Path to prosim SDK DLL library. Not used when
+                                   a backend is given.
+            on_connect_callback (Callable, optional): Called in the event loop once we
+                                                      are connected to prosim. Defaults to None.
+            on_disconnect_callback (Callable, optional): Called in the event loop once
+                                                         prosim disconnects. Defaults to None.
+            **kwargs: Other PyProsim arguments, e.g. backend or catalog_cache
+        """
+        self._on_connect_cb = on_connect_callback
+        self._on_disconnect_cb = on_disconnect_callback
+        self.prosim = PyProsim(
+            prosimsdk_path,
+            on_connect_callback=self._on_connect,
+            on_disconnect_callback=self._on_disconnect,
+            **kwargs,
+        )
+        self._loop: asyncio.AbstractEventLoop = None
+        self._connected: asyncio.Event = None
+        # Dataref name -> functions called in the event loop with (name, value)
+        self._listeners: Dict[str, List[Callable]] = {}
+        # Subscriptions of this facade, released when nobody awaits the dataref
+        self._activated: Dict[str, Subscription] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._connected is not None and self._connected.is_set()
+
+    async def connect(self, ip_addr: str, timeout: float = None) -> None:
+        """Open connection with Prosim Server and wait until it is established.
+        Returns at once if the PyProsim is already connected.
+
+        Args:
+            ip_addr (str): Host IP address when ProSim is running. Use "localhost"
+                           if prosim runs in the same PC as this script.
+            timeout (float, optional): Maximum wait in seconds. Defaults to None (no limit).
+
+        Raises:
+            asyncio.TimeoutError: The connection was not established in time
+        """
+        self._loop = asyncio.get_running_loop()
+        if self._connected is None:
+            self._connected = asyncio.Event()
+        if self.prosim.connected:
+            self._connected.set()
+            return
+        self._connected.clear()
+        self.prosim.connect(ip_addr, synchronous=False)
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def wait_for(
+        self,
+        dataref_name: str,
+        predicate: Callable[[object], bool] = bool,
+        interval: int = 100,
+        timeout: float = None,
+    ) -> object:
+        """Wait until a dataref value fulfils a condition. The condition is not
+        evaluated while the value is None, before the first update.
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            predicate (Callable[[object], bool], optional): Condition on the dataref value.
+                                                            Defaults to a true value.
+            interval (int, optional): Activation interval in milliseconds if the dataref was
+                                      not activated by this facade yet. Defaults to 100.
+            timeout (float, optional): Maximum wait in seconds. Defaults to None (no limit).
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name. Not part of prosim database
+            asyncio.TimeoutError: The condition was not fulfilled in time
+
+        Returns:
+            object: Dataref value fulfilling the condition
+        """
+        future = self._attach_loop().create_future()
+
+        def listener(name: str, value: object):
+            if future.done() or value is None:
+                return
+            try:
+                if predicate(value):
+                    future.set_result(value)
+            except Exception as e:
+                future.set_exception(e)
+
+        self._subscribe([dataref_name], listener, interval)
+        try:
+            # The current value may already fulfil the condition
+            listener(dataref_name, self.prosim.get_value(dataref_name))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._unsubscribe([dataref_name], listener)
+
+    async def changes(
+        self, pattern: str, interval: int = 100, max_queue: int = 1000
+    ) -> AsyncIterator[Tuple[str, object]]:
+        """Stream the changes of a dataref, or of every dataref matching a pattern
+        (see PyProsim.resolve). Use it with "async for name, value in ...".
+
+        Args:
+            pattern (str): Dataref name or pattern
+            interval (int, optional): Activation interval in milliseconds for the datarefs not
+                                      activated by this facade yet. Defaults to 100.
+            max_queue (int, optional): Maximum number of changes waiting to be consumed,
+                                       the oldest ones are discarded. Defaults to 1000.
+
+        Raises:
+            PyProsimDatarefException: No dataref matches the pattern
+
+        Yields:
+            Tuple[str, object]: Dataref name and value
+        """
+        names = self.prosim.resolve(pattern)
+        if not names:
+            raise PyProsimDatarefException(f'No dataref matches "{pattern}"')
+        self._attach_loop()
+        queue = asyncio.Queue(max_queue)
+
+        def listener(name: str, value: object):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((name, value))
+
+        self._subscribe(names, listener, interval)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._unsubscribe(names, listener)
+
+    def _attach_loop(self) -> asyncio.AbstractEventLoop:
+        """Hand the SDK events over to the running event loop. Needed when the
+        PyProsim was connected without connect(), e.g. by a ReconnectSupervisor."""
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            if self._connected is None:
+                self._connected = asyncio.Event()
+            if self.prosim.connected:
+                self._connected.set()
+        return loop
+
+    def _subscribe(self, names: List[str], listener: Callable, interval: int):
+        for name in names:
+            if name not in self._activated:
+                self._activated[name] = self.prosim.activate_dataref(
+                    name, interval, self._make_handler(name)
+                )
+            self._listeners.setdefault(name, []).append(listener)
+
+    def _unsubscribe(self, names: List[str], listener: Callable):
+        for name in names:
+            listeners = self._listeners.get(name)
+            if listeners is not None and listener in listeners:
+                listeners.remove(listener)
+            if not listeners and name in self._activated:
+                self._activated.pop(name).cancel()
+
+    def _make_handler(self, name: str) -> Callable:
+        """SDK change handler handing the new value over to the event loop"""
+
+        def handler(dataref):
+            loop = self._loop
+            if loop is not None and self._listeners.get(name):
+                loop.call_soon_threadsafe(self._deliver, name, dataref.value)
+
+        return handler
+
+    def _deliver(self, name: str, value: object):
+        for listener in tuple(self._listeners.get(name, ())):
+            listener(name, value)
+
+    def _on_connect(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._set_connected)
+
+    def _set_connected(self):
+        # After a reconnection PyProsim has already activated again the datarefs
+        # being awaited
+        self._connected.set()
+        if self._on_connect_cb is not None:
+            self._on_connect_cb()
+
+    def _on_disconnect(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._set_disconnected)
+
+    def _set_disconnected(self):
+        self._connected.clear()
+        if self._on_disconnect_cb is not None:
+            self._on_disconnect_cb()
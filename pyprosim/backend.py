@@ -0,0 +1,192 @@
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from .exceptions import PyProsimDLLException, PyProsimImportException
+
+
+class PyProsimBackend:
+    """Interface between PyProsim and the implementation of the ProSim SDK.
+
+    A backend knows how to create the SDK connection object, the SDK dataref
+    objects and how to map the SDK data type names into callable types.
+    The objects returned by a backend must mimic the ProSim SDK API:
+
+    - sdk: onConnect/onDisconnect events, Connect(ip, synchronous),
+      getDataRefDescriptions() and getLicensingInfo()
+    - dataref: name, value (read/write) and onDataChange event
+    """
+
+    # Exceptions raised by the SDK when a value cannot be written
+    value_exceptions: Tuple[type, ...] = (TypeError, ValueError)
+
+    # SDK version, part of the catalog cache key. None when unknown.
+    version: Optional[str] = None
+
+    def create_sdk(self) -> object:
+        """Create the SDK connection object (ProSimConnect like)
+
+        Returns:
+            object: SDK connection object
+        """
+        raise NotImplementedError
+
+    def create_dataref(self, name: str, interval: int, sdk: object) -> object:
+        """Create the SDK dataref object (DataRef like)
+
+        Args:
+            name (str): Dataref name
+            interval (int): How frequent the SDK should send this dataref in milliseconds
+            sdk (object): SDK connection object as returned by create_sdk
+
+        Returns:
+            object: SDK dataref object
+        """
+        raise NotImplementedError
+
+    def release_dataref(self, dataref: object) -> None:
+        """Release an SDK dataref object no longer used. Its onDataChange handlers
+        have already been removed.
+
+        Args:
+            dataref (object): SDK dataref object as returned by create_dataref
+        """
+
+    def get_data_type(self, type_name: str) -> Optional[object]:
+        """Resolve the SDK data type name into a callable type
+
+        Args:
+            type_name (str): Data type name as reported by the SDK, for example "System.Double"
+
+        Returns:
+            Optional[object]: Callable type or None if the type name is unknown
+        """
+        raise NotImplementedError
+
+
+class _ProSimSDKAssembly(NamedTuple):
+    """ProSim SDK classes loaded in the .NET runtime"""
+
+    path: Path
+    prosim_connect: object
+    dataref: object
+    data_types: dict
+    value_exceptions: Tuple[type, ...]
+    version: str
+
+
+# The .NET runtime and the SDK assembly are loaded once per process, on the
+# first ClrBackend, and shared by all the instances
+_assembly_lock = threading.Lock()
+_assembly: Optional[_ProSimSDKAssembly] = None
+
+
+def _load_prosim_sdk(prosimsdk_path: Path) -> _ProSimSDKAssembly:
+    """Load the ProSim SDK assembly, only the first call boots the .NET runtime
+
+    Args:
+        prosimsdk_path (Path): Path to prosim SDK DLL library
+
+    Raises:
+        PyProsimDLLException: CLR space could not be loaded or another SDK DLL
+                             has already been loaded
+        PyProsimImportException: Prosim components could not be imported
+
+    Returns:
+        _ProSimSDKAssembly: Loaded SDK classes
+    """
+    global _assembly
+    path = Path(prosimsdk_path).resolve()
+    with _assembly_lock:
+        if _assembly is not None:
+            if _assembly.path != path:
+                raise PyProsimDLLException(
+                    f"ProSim SDK already loaded from {_assembly.path}, cannot load {path}"
+                )
+            return _assembly
+
+        # Load CLR namespace
+        try:
+            import clr, System
+
+            clr.AddReference(str(path))
+        except Exception as e:
+            raise PyProsimDLLException(e)
+
+        # Finally import the required classes
+        try:
+            from ProSimSDK import ProSimConnect, DataRef
+        except Exception as e:
+            raise PyProsimImportException(e)
+
+        _assembly = _ProSimSDKAssembly(
+            path,
+            ProSimConnect,
+            DataRef,
+            {
+                f"System.{name}": getattr(System, name)
+                for name in ClrBackend.DATA_TYPE_NAMES
+            },
+            (System.AggregateException,),
+            # ProSim only accepts SDK clients of its own protocol version
+            str(System.Reflection.AssemblyName.GetAssemblyName(str(path)).Version),
+        )
+        return _assembly
+
+
+class ClrBackend(PyProsimBackend):
+    """ProSim SDK backend using pythonnet to load the ProSimSDK DLL"""
+
+    # Data types supported by Prosim datarefs
+    DATA_TYPE_NAMES = (
+        "Boolean",
+        "Byte",
+        "SByte",
+        "Char",
+        "Decimal",
+        "Double",
+        "Single",
+        "Int32",
+        "UInt32",
+        "IntPtr",
+        "UIntPtr",
+        "Int64",
+        "UInt64",
+        "Int16",
+        "UInt16",
+        "String",
+    )
+
+    def __init__(self, prosimsdk_path: Path):
+        """ClrBackend class init. The first instance of the process loads the .NET
+        runtime and the SDK assembly, the next ones share them.
+
+        Args:
+            prosimsdk_path (Path): Path to prosim SDK DLL library
+
+        Raises:
+            PyProsimDLLException: CLR space could not be loaded or another SDK DLL
+                                 has already been loaded
+            PyProsimImportException: Prosim components could not be imported
+        """
+        assembly = _load_prosim_sdk(prosimsdk_path)
+        self._prosim_connect = assembly.prosim_connect
+        self._dataref = assembly.dataref
+        self._data_types = assembly.data_types
+        self.value_exceptions = assembly.value_exceptions
+        self.version = assembly.version
+
+    def create_sdk(self) -> object:
+        return self._prosim_connect()
+
+    def create_dataref(self, name: str, interval: int, sdk: object) -> object:
+        return self._dataref(name, interval, sdk)
+
+    def release_dataref(self, dataref: object) -> None:
+        # Stop the SDK polling the dataref, if the SDK version supports it
+        dispose = getattr(dataref, "Dispose", None)
+        if dispose is not None:
+            dispose()
+
+    def get_data_type(self, type_name: str) -> Optional[object]:
+        return self._data_types.get(type_name)
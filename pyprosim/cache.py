@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+
+
+class CachedDataRefDescription(NamedTuple):
+    """Dataref description loaded from the catalog cache. The field names
+    follow the ProSim SDK DataRefDescription so both can be used alike."""
+
+    Name: str
+    Description: str
+    DataType: str
+    DataUnit: str
+    CanRead: bool
+    CanWrite: bool
+
+
+class CatalogCache:
+    """Persistent on-disk cache of the Prosim dataref catalog.
+
+    The file is a small header followed by a zlib compressed payload. Data types
+    and units are stored once in a string table and referenced by index from
+    a fixed size record per dataref, names and descriptions are stored in one
+    text block. The header holds the cache key, a digest of the catalog
+    and a CRC of the payload so that stale or corrupted files are discarded.
+    """
+
+    MAGIC = b"PPSC"
+    FORMAT_VERSION = 1
+    # magic, format version, key hash, catalog digest, count, payload length, payload crc32
+    _HEADER = struct.Struct("<4sH20s20sIII")
+    # string table count, dataref count, string table length, texts length
+    _COUNTS = struct.Struct("<IIII")
+    _RECORD = struct.Struct("<HHB")
+    _CAN_READ = 0x01
+    _CAN_WRITE = 0x02
+
+    def __init__(self, path: Path, revalidate: bool = False):
+        """CatalogCache class init
+
+        The cache key, made of the Prosim information and the SDK version, already
+        discards the file when ProSim changes. Revalidation also catches a catalog
+        changed without a new version, at the cost of a full catalog download.
+
+        Args:
+            path (Path): Cache file path
+            revalidate (bool, optional): On a cache hit, fetch the catalog from Prosim in the
+                                         background and refresh the cache when it changed.
+                                         Defaults to False.
+        """
+        self.path = Path(path)
+        self.revalidate = revalidate
+        # Digest of the last catalog loaded from or stored into the cache
+        self.digest: Optional[bytes] = None
+
+    @staticmethod
+    def make_key(info: dict, version: Optional[str] = None) -> bytes:
+        """Build the cache key from the Prosim information and version
+
+        Args:
+            info (dict): Prosim information as returned by PyProsim.get_info()
+            version (str, optional): ProSim SDK version, see PyProsimBackend.version.
+                                     Defaults to None (unknown).
+
+        Returns:
+            bytes: Cache key
+        """
+        if version is not None:
+            info = dict(info, version=version)
+        return hashlib.sha1(json.dumps(info, sort_keys=True).encode()).digest()
+
+    @classmethod
+    def encode(cls, descriptions: Iterable[object]) -> bytes:
+        """Encode dataref descriptions into the uncompressed payload
+
+        Args:
+            descriptions (Iterable[object]): SDK (or cached) dataref descriptions
+
+        Returns:
+            bytes: Encoded catalog
+        """
+        strings = {}
+        records = bytearray()
+        texts = []
+        for dr in descriptions:
+            type_index = strings.setdefault(str(dr.DataType), len(strings))
+            unit_index = strings.setdefault(str(dr.DataUnit or ""), len(strings))
+            flags = (cls._CAN_READ if dr.CanRead else 0) | (
+                cls._CAN_WRITE if dr.CanWrite else 0
+            )
+            records += cls._RECORD.pack(type_index, unit_index, flags)
+            texts.append(str(dr.Name))
+            texts.append(str(dr.Description or ""))
+
+        # Strings are NUL separated, which is never part of a Prosim name or description
+        table = "\0".join(strings).encode()
+        text = "\0".join(texts).encode()
+        return (
+            cls._COUNTS.pack(len(strings), len(texts) // 2, len(table), len(text))
+            + table
+            + text
+            + records
+        )
+
+    @classmethod
+    def decode(cls, payload: bytes) -> List[CachedDataRefDescription]:
+        """Decode the uncompressed payload into dataref descriptions
+
+        Args:
+            payload (bytes): Encoded catalog
+
+        Returns:
+            List[CachedDataRefDescription]: Dataref descriptions
+        """
+        view = memoryview(payload)
+        string_count, count, table_length, text_length = cls._COUNTS.unpack_from(view)
+        offset = cls._COUNTS.size
+        strings = str(view[offset : offset + table_length], "utf-8").split("\0")
+        offset += table_length
+        texts = str(view[offset : offset + text_length], "utf-8").split("\0")
+        offset += text_length
+        records = view[offset:]
+        if len(strings) != string_count or len(records) != count * cls._RECORD.size:
+            raise ValueError("Inconsistent catalog cache payload")
+
+        flags = (
+            (False, False),
+            (True, False),
+            (False, True),
+            (True, True),
+        )
+        return [
+            CachedDataRefDescription(
+                name,
+                description,
+                strings[type_index],
+                strings[unit_index],
+                *flags[mask]
+            )
+            for name, description, (type_index, unit_index, mask) in zip(
+                texts[0::2], texts[1::2], cls._RECORD.iter_unpack(records)
+            )
+        ]
+
+    @classmethod
+    def catalog_digest(cls, descriptions: Iterable[object]) -> bytes:
+        """Digest used to detect catalog changes
+
+        Args:
+            descriptions (Iterable[object]): SDK (or cached) dataref descriptions
+
+        Returns:
+            bytes: Catalog digest
+        """
+        return hashlib.sha1(cls.encode(descriptions)).digest()
+
+    def load(self, key: bytes) -> Optional[List[CachedDataRefDescription]]:
+        """Load the catalog from the cache file
+
+        Args:
+            key (bytes): Cache key, see make_key
+
+        Returns:
+            Optional[List[CachedDataRefDescription]]: Dataref descriptions or None when
+                                                      the cache is missing, stale or corrupted
+        """
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return None
+        if len(data) < self._HEADER.size:
+            return None
+        magic, version, key_hash, digest, count, length, crc = self._HEADER.unpack_from(
+            data
+        )
+        if magic != self.MAGIC or version != self.FORMAT_VERSION or key_hash != key:
+            return None
+        compressed = memoryview(data)[self._HEADER.size :]
+        if len(compressed) != length or zlib.crc32(compressed) != crc:
+            return None
+        try:
+            descriptions = self.decode(zlib.decompress(compressed))
+        except (zlib.error, struct.error, ValueError, IndexError):
+            return None
+        if len(descriptions) != count:
+            return None
+        self.digest = digest
+        return descriptions
+
+    def store(self, key: bytes, descriptions: Iterable[object]) -> None:
+        """Store the catalog into the cache file. The file is replaced atomically.
+
+        Args:
+            key (bytes): Cache key, see make_key
+            descriptions (Iterable[object]): SDK dataref descriptions
+        """
+        descriptions = list(descriptions)
+        payload = self.encode(descriptions)
+        compressed = zlib.compress(payload, 1)
+        digest = hashlib.sha1(payload).digest()
+        header = self._HEADER.pack(
+            self.MAGIC,
+            self.FORMAT_VERSION,
+            key,
+            digest,
+            len(descriptions),
+            len(compressed),
+            zlib.crc32(compressed),
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(header + compressed)
+        os.replace(tmp_path, self.path)
+        self.digest = digest
@@ -0,0 +1,342 @@
+import threading
+from array import array
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .backend import PyProsimBackend
+
+
+class DataTypeTable:
+    """Interned table of dataref data types. Each distinct SDK type name is
+    resolved only once through the backend and referenced by index.
+    Unknown type names are kept with a None type.
+    """
+
+    def __init__(self, backend: PyProsimBackend):
+        """DataTypeTable class init
+
+        Args:
+            backend (PyProsimBackend): Backend used to resolve the SDK type names
+        """
+        self._backend = backend
+        self._index: Dict[str, int] = {}
+        # SDK type names, for example "System.Double"
+        self.names: List[str] = []
+        # Callable types, None when the type name is unknown
+        self.types: List[Optional[object]] = []
+        # Short names as reported by the dataref database, for example "Double"
+        self.labels: List[str] = []
+
+    def intern(self, type_name: str) -> int:
+        """Get the index of a type name, resolving it if not seen before
+
+        Args:
+            type_name (str): SDK data type name
+
+        Returns:
+            int: Type index
+        """
+        index = self._index.get(type_name)
+        if index is None:
+            data_type = self._backend.get_data_type(type_name)
+            index = len(self.names)
+            self._index[type_name] = index
+            self.names.append(type_name)
+            self.types.append(data_type)
+            self.labels.append(type_name if data_type is None else data_type.__name__)
+        return index
+
+
+class Catalog:
+    """Compact storage of the Prosim dataref catalog.
+
+    The catalog is stored as struct-of-arrays indexed by dataref position: names
+    and data units in lists (units interned), descriptions in a single text block,
+    data types, units and access flags in arrays. PyProsim.Dataref objects are not
+    created here, only when a dataref is requested.
+    """
+
+    _CAN_READ = 0x01
+    _CAN_WRITE = 0x02
+
+    def __init__(self, data_types: DataTypeTable):
+        """Catalog class init
+
+        Args:
+            data_types (DataTypeTable): Interned data types
+        """
+        self.data_types = data_types
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.units: List[str] = []
+        self._unit_index: Dict[str, int] = {}
+        self._description_text = ""
+        self._description_offsets = array("I", [0])
+        self._type_index = array("H")
+        self._units = array("H")
+        self._flags = array("B")
+
+    @classmethod
+    def from_descriptions(
+        cls, descriptions: Iterable[object], data_types: DataTypeTable
+    ) -> "Catalog":
+        """Build the catalog from SDK (or cached) dataref descriptions
+
+        Args:
+            descriptions (Iterable[object]): Dataref descriptions
+            data_types (DataTypeTable): Interned data types
+
+        Returns:
+            Catalog: Catalog
+        """
+        catalog = cls(data_types)
+        names = catalog.names
+        index = catalog.index
+        type_index = catalog._type_index
+        units = catalog._units
+        flags = catalog._flags
+        unit_index = catalog._unit_index
+        offsets = catalog._description_offsets
+        texts = []
+        offset = 0
+        intern_type = data_types.intern
+        for dr in descriptions:
+            name = dr.Name
+            if name in index:
+                # Keep the first description of a repeated name
+                continue
+            index[name] = len(names)
+            names.append(name)
+            type_index.append(intern_type(dr.DataType))
+            unit = dr.DataUnit
+            unit_position = unit_index.get(unit)
+            if unit_position is None:
+                unit_position = unit_index[unit] = len(catalog.units)
+                catalog.units.append(unit)
+            units.append(unit_position)
+            flags.append(
+                (cls._CAN_READ if dr.CanRead else 0)
+                | (cls._CAN_WRITE if dr.CanWrite else 0)
+            )
+            description = dr.Description or ""
+            texts.append(description)
+            offset += len(description)
+            offsets.append(offset)
+        catalog._description_text = "".join(texts)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def same_entries(self, other: "Catalog") -> bool:
+        """Whether both catalogs hold the same entries in the same order. The
+        arrays are compared as a whole, much faster than hashing the catalog.
+
+        Args:
+            other (Catalog): Catalog to compare with
+
+        Returns:
+            bool: True if the entries are identical
+        """
+        return (
+            self.names == other.names
+            and self._description_text == other._description_text
+            and self._description_offsets == other._description_offsets
+            and self._flags == other._flags
+            and self.units == other.units
+            and self._units == other._units
+            and self.data_types.names == other.data_types.names
+            and self._type_index == other._type_index
+        )
+
+    def description(self, position: int) -> str:
+        offsets = self._description_offsets
+        return self._description_text[offsets[position] : offsets[position + 1]]
+
+    def data_type(self, position: int) -> Optional[object]:
+        return self.data_types.types[self._type_index[position]]
+
+    def type_name(self, position: int) -> str:
+        return self.data_types.names[self._type_index[position]]
+
+    def type_label(self, position: int) -> str:
+        return self.data_types.labels[self._type_index[position]]
+
+    def data_unit(self, position: int) -> str:
+        return self.units[self._units[position]]
+
+    def can_read(self, position: int) -> bool:
+        return bool(self._flags[position] & self._CAN_READ)
+
+    def can_write(self, position: int) -> bool:
+        return bool(self._flags[position] & self._CAN_WRITE)
+
+    def select(
+        self,
+        positions: Iterable[int],
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        data_type: Optional[str] = None,
+    ) -> List[int]:
+        """Filter catalog positions by access and data type
+
+        Args:
+            positions (Iterable[int]): Dataref positions in the catalog
+            can_read (bool, optional): Required read access. Defaults to None (any).
+            can_write (bool, optional): Required write access. Defaults to None (any).
+            data_type (str, optional): Required data type, as SDK name ("System.Double")
+                                       or short name ("Double"). Defaults to None (any).
+
+        Returns:
+            List[int]: Positions passing the filters
+        """
+        mask, value, type_indexes = self._filter_masks(can_read, can_write, data_type)
+        flags = self._flags
+        if type_indexes is None:
+            return [p for p in positions if flags[p] & mask == value]
+        type_index = self._type_index
+        return [
+            p
+            for p in positions
+            if flags[p] & mask == value and type_index[p] in type_indexes
+        ]
+
+    def filter_key(self, position: int) -> Tuple[int, int]:
+        """Access flags and data type index of a dataref. Datarefs with the same
+        key pass or fail the select() filters together.
+
+        Args:
+            position (int): Dataref position in the catalog
+
+        Returns:
+            Tuple[int, int]: Filter key
+        """
+        return self._flags[position], self._type_index[position]
+
+    def select_keys(
+        self,
+        keys: Iterable[Tuple[int, int]],
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        data_type: Optional[str] = None,
+    ) -> List[Tuple[int, int]]:
+        """Filter keys (see filter_key) by access and data type, like select()
+
+        Args:
+            keys (Iterable[Tuple[int, int]]): Filter keys
+            can_read (bool, optional): Required read access. Defaults to None (any).
+            can_write (bool, optional): Required write access. Defaults to None (any).
+            data_type (str, optional): Required data type. Defaults to None (any).
+
+        Returns:
+            List[Tuple[int, int]]: Keys passing the filters
+        """
+        mask, value, type_indexes = self._filter_masks(can_read, can_write, data_type)
+        return [
+            key
+            for key in keys
+            if key[0] & mask == value
+            and (type_indexes is None or key[1] in type_indexes)
+        ]
+
+    def _filter_masks(
+        self,
+        can_read: Optional[bool],
+        can_write: Optional[bool],
+        data_type: Optional[str],
+    ) -> Tuple[int, int, Optional[Set[int]]]:
+        """Flags mask and value, and data type indexes (None for any) of the filters"""
+        # Compare the access flags in one operation
+        mask = value = 0
+        if can_read is not None:
+            mask |= self._CAN_READ
+            value |= self._CAN_READ if can_read else 0
+        if can_write is not None:
+            mask |= self._CAN_WRITE
+            value |= self._CAN_WRITE if can_write else 0
+        if data_type is None:
+            return mask, value, None
+        types = self.data_types
+        type_indexes = {
+            i
+            for i, (name, label) in enumerate(zip(types.names, types.labels))
+            if data_type in (name, label)
+        }
+        return mask, value, type_indexes
+
+    def entry(self, position: int) -> Tuple[str, str, str, str, bool, bool]:
+        """Full catalog entry
+
+        Args:
+            position (int): Dataref position in the catalog
+
+        Returns:
+            Tuple[str, str, str, str, bool, bool]: name, description, type name,
+                                                   data unit, can read and can write
+        """
+        return (
+            self.names[position],
+            self.description(position),
+            self.type_name(position),
+            self.data_unit(position),
+            self.can_read(position),
+            self.can_write(position),
+        )
+
+
+class CatalogPool:
+    """Catalogs shared by several PyProsim connected to structurally identical
+    Prosim instances, so each catalog is parsed and indexed only once per process.
+
+    Entries are keyed by the catalog digest and the backend class, which decides
+    how the data types are resolved. Shared catalogs are never modified.
+    """
+
+    def __init__(self):
+        # Key -> (catalog, name index)
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_create(
+        self, digest: bytes, backend: PyProsimBackend, build: Callable[[], tuple]
+    ) -> tuple:
+        """Get a shared catalog, building it on first request. Concurrent requests
+        for the same catalog wait for a single build.
+
+        Args:
+            digest (bytes): Catalog digest, see CatalogCache.catalog_digest
+            backend (PyProsimBackend): Backend of the requesting PyProsim
+            build (Callable[[], tuple]): Builds the (catalog, name index) entry
+
+        Returns:
+            tuple: Shared (catalog, name index)
+        """
+        key = (digest, type(backend))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = self._entries[key] = build()
+            return entry
+
+    def stats(self) -> dict:
+        """Pool counters
+
+        Returns:
+            dict: Distinct catalogs held, requests served from the pool and builds
+        """
+        return {
+            "catalogs": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,432 @@
+import logging
+import re
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import PyProsimDatarefException
+from .filters import ChangeFilter
+from .subscription import Subscription
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+logger = logging.getLogger(__name__)
+
+# Dataref references in expressions, e.g. "{aircraft.engines.1.n1} > 20"
+EXPRESSION_REFERENCE = re.compile(r"\{([^{}]+)\}")
+
+# Builtins available to expressions
+EXPRESSION_BUILTINS = {
+    "abs": abs,
+    "bool": bool,
+    "float": float,
+    "int": int,
+    "max": max,
+    "min": min,
+    "round": round,
+}
+
+
+def compile_expression(expression: str) -> Tuple[Callable, List[str]]:
+    """Compile an expression over dataref values into a function
+
+    Args:
+        expression (str): Python expression, with the datarefs referenced in braces,
+                          e.g. "{system.gates.B_FUEL_LOW} or {aircraft.fuel.left} < 500"
+
+    Raises:
+        PyProsimDatarefException: The expression does not reference any dataref or
+                                  it is not valid
+
+    Returns:
+        Tuple[Callable, List[str]]: Function taking the values of the referenced
+                                    datarefs, in the order of the returned names
+    """
+    inputs: List[str] = []
+
+    def argument(match: re.Match) -> str:
+        name = match.group(1).strip()
+        if name not in inputs:
+            inputs.append(name)
+        return f"_{inputs.index(name)}"
+
+    body = EXPRESSION_REFERENCE.sub(argument, expression)
+    if not inputs:
+        raise PyProsimDatarefException(
+            f'Expression "{expression}" does not reference any dataref'
+        )
+    arguments = ", ".join(f"_{i}" for i in range(len(inputs)))
+    try:
+        function = eval(
+            f"lambda {arguments}: ({body})", {"__builtins__": EXPRESSION_BUILTINS}
+        )
+    except SyntaxError as e:
+        raise PyProsimDatarefException(f'Invalid expression "{expression}": {e}')
+    return function, inputs
+
+
+class DerivedDataref:
+    """Dataref computed from other datarefs, real or derived, by an expression
+    or a function. It is read and subscribed like a real dataref through
+    PyProsim (get_value, activate_dataref, add_change_listener, handle), it
+    cannot be written. Its callbacks receive this object, with name and value
+    as the SDK dataref objects.
+    """
+
+    __slots__ = (
+        "_parent",
+        "_name",
+        "_description",
+        "_function",
+        "_inputs",
+        "_interval",
+        "_rank",
+        "_value",
+        "_subscriptions",
+        "_listeners",
+        "_input_subscriptions",
+    )
+
+    def __init__(
+        self,
+        parent: "PyProsim",
+        name: str,
+        description: str,
+        function: Callable,
+        inputs: Tuple[str, ...],
+        interval: int,
+        rank: int,
+    ):
+        self._parent = parent
+        self._name = name
+        self._description = description
+        self._function = function
+        self._inputs = inputs
+        self._interval = interval
+        # Position in the topological order of the graph
+        self._rank = rank
+        self._value: object = None
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._listeners: Tuple[Callable, ...] = ()
+        # Subscriptions to the real datarefs among the inputs
+        self._input_subscriptions: List[Subscription] = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def inputs(self) -> Tuple[str, ...]:
+        return self._inputs
+
+    @property
+    def data_type(self) -> object:
+        return None
+
+    @property
+    def data_unit(self) -> str:
+        return ""
+
+    @property
+    def can_read(self) -> bool:
+        return True
+
+    @property
+    def can_write(self) -> bool:
+        return False
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    @property
+    def active(self) -> bool:
+        return True
+
+    @property
+    def value(self) -> object:
+        """Last computed value, None until all the inputs have a value"""
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        raise PyProsimDatarefException(f'Dataref "{self._name}" is not writable!')
+
+    @property
+    def _dataref_obj(self) -> "DerivedDataref":
+        # Stands for the SDK dataref object, see DatarefHandle
+        return self
+
+    _writer = None
+
+    def activate(
+        self,
+        interval: int,
+        on_change_callback: Callable = None,
+        filters: Iterable[ChangeFilter] = None,
+    ) -> Subscription:
+        """Subscribe to the changes of the derived value
+
+        Args:
+            interval (int): Minimum milliseconds between two callbacks. Values are
+                            computed at the interval given to add_derived.
+            on_change_callback (Callable, optional): Method to be called when the value
+                                                     changes. Defaults to None.
+            filters (Iterable[ChangeFilter], optional): Filters deciding which changes are
+                                                        passed to on_change_callback.
+                                                        Defaults to None.
+
+        Returns:
+            Subscription: Subscription to release with deactivate()
+        """
+        with self._parent._subscription_lock:
+            # The same request again only takes another reference
+            if not filters:
+                for subscription in self._subscriptions:
+                    if (
+                        subscription.callback is on_change_callback
+                        and subscription.interval == interval
+                        and subscription.filters is None
+                    ):
+                        subscription.refs += 1
+                        return subscription
+
+            subscription = Subscription(self, interval, on_change_callback, filters)
+            self._subscriptions = self._subscriptions + (subscription,)
+            return subscription
+
+    def deactivate(self, subscription: Subscription = None) -> None:
+        """Release a subscription, or all of them
+
+        Args:
+            subscription (Subscription, optional): Subscription returned by activate().
+                                                   Defaults to None, all subscriptions.
+        """
+        with self._parent._subscription_lock:
+            if subscription is None:
+                for subscription in self._subscriptions:
+                    subscription.refs = 0
+            elif subscription in self._subscriptions:
+                subscription.refs -= 1
+            else:
+                return
+            self._subscriptions = tuple(s for s in self._subscriptions if s.refs > 0)
+
+    def _compute(self, values: Dict[str, object]) -> bool:
+        """Compute the value from the input values
+
+        Returns:
+            bool: The value changed
+        """
+        arguments = [values.get(name) for name in self._inputs]
+        if None in arguments:
+            return False
+        try:
+            value = self._function(*arguments)
+        except Exception:
+            logger.exception('Cannot compute derived dataref "%s"', self._name)
+            return False
+        if value == self._value:
+            return False
+        self._value = value
+        return True
+
+    def _notify(self):
+        for listener in self._listeners:
+            listener(self._name, self._value)
+        for subscription in self._subscriptions:
+            subscription._deliver(self, self._interval)
+
+    def __repr__(self) -> str:
+        return f"DerivedDataref({self._name!r}, inputs={list(self._inputs)})"
+
+
+class DerivedGraph:
+    """Dependency graph of the derived datarefs of a PyProsim.
+
+    The real datarefs used as inputs are activated and followed through change
+    listeners. When one changes, only the derived datarefs depending on it,
+    directly or through other derived datarefs, are computed again, in
+    topological order, skipping those whose inputs did not change. A derived
+    dataref can only depend on datarefs existing when it is added, so the order
+    in which they are added is a topological order and no cycle can be made.
+    """
+
+    def __init__(self, prosim: "PyProsim"):
+        """DerivedGraph class init
+
+        Args:
+            prosim (PyProsim): PyProsim providing the input datarefs
+        """
+        self.prosim = prosim
+        self.nodes: Dict[str, DerivedDataref] = {}
+        # Input name -> derived datarefs using it directly
+        self._dependents: Dict[str, List[DerivedDataref]] = {}
+        # Input name -> derived datarefs to compute, in topological order
+        self._affected: Dict[str, Tuple[DerivedDataref, ...]] = {}
+        # Latest value of every input and derived dataref
+        self._values: Dict[str, object] = {}
+        self._ranks = 0
+        self._lock = threading.RLock()
+        # Counters
+        self.updates = 0
+        self.computed = 0
+        self.skipped = 0
+
+    def add(
+        self,
+        name: str,
+        function: Callable,
+        inputs: Iterable[str],
+        interval: int,
+        description: str = "",
+    ) -> DerivedDataref:
+        """Add a derived dataref, activating its real inputs
+
+        Raises:
+            PyProsimDatarefException: The name is already used, an input is unknown
+
+        Returns:
+            DerivedDataref: Derived dataref
+        """
+        prosim = self.prosim
+        inputs = tuple(inputs)
+        with self._lock:
+            if name in self.nodes or name in prosim._catalog.index:
+                raise PyProsimDatarefException(f'Dataref "{name}" already exists')
+            for input_name in inputs:
+                if (
+                    input_name not in self.nodes
+                    and input_name not in prosim._catalog.index
+                ):
+                    raise PyProsimDatarefException(
+                        f'Dataref "{input_name}" is not in Prosim database'
+                    )
+
+            node = DerivedDataref(
+                prosim, name, description, function, inputs, interval, self._ranks
+            )
+            self._ranks += 1
+            for input_name in inputs:
+                if input_name in self.nodes:
+                    continue
+                node._input_subscriptions.append(
+                    prosim.activate_dataref(input_name, interval)
+                )
+                if input_name not in self._dependents:
+                    prosim.add_change_listener(input_name, self._on_input_change)
+                    self._values[input_name] = self._read(input_name)
+            for input_name in set(inputs):
+                self._dependents.setdefault(input_name, []).append(node)
+            self.nodes[name] = node
+            self._affected.clear()
+
+            if node._compute(self._values):
+                self._values[name] = node._value
+            return node
+
+    def remove(self, name: str) -> None:
+        """Remove a derived dataref, releasing its subscriptions and inputs
+
+        Raises:
+            PyProsimDatarefException: Unknown derived dataref or other derived
+                                      datarefs depend on it
+        """
+        prosim = self.prosim
+        with self._lock:
+            node = self.nodes.get(name)
+            if node is None:
+                raise PyProsimDatarefException(
+                    f'Derived dataref "{name}" does not exist'
+                )
+            if self._dependents.get(name):
+                users = ", ".join(n.name for n in self._dependents[name])
+                raise PyProsimDatarefException(
+                    f'Derived dataref "{name}" is used by {users}'
+                )
+            node.deactivate()
+            for subscription in node._input_subscriptions:
+                subscription.cancel()
+            for input_name in set(node._inputs):
+                dependents = self._dependents[input_name]
+                dependents.remove(node)
+                if not dependents:
+                    del self._dependents[input_name]
+                    if input_name not in self.nodes:
+                        prosim.remove_change_listener(input_name, self._on_input_change)
+                        self._values.pop(input_name, None)
+            del self.nodes[name]
+            self._values.pop(name, None)
+            self._affected.clear()
+
+    def affected(self, input_name: str) -> Tuple[DerivedDataref, ...]:
+        """Derived datarefs depending on a dataref, in topological order
+
+        Args:
+            input_name (str): Dataref name
+
+        Returns:
+            Tuple[DerivedDataref, ...]: Derived datarefs to compute when it changes
+        """
+        affected = self._affected.get(input_name)
+        if affected is None:
+            found = {}
+            pending = [input_name]
+            while pending:
+                for node in self._dependents.get(pending.pop(), ()):
+                    if node._name not in found:
+                        found[node._name] = node
+                        pending.append(node._name)
+            affected = tuple(sorted(found.values(), key=lambda node: node._rank))
+            self._affected[input_name] = affected
+        return affected
+
+    def stats(self) -> dict:
+        """Graph counters
+
+        Returns:
+            dict: Derived datarefs, input updates, computations, and computations
+                  skipped because none of the inputs changed
+        """
+        return {
+            "derived": len(self.nodes),
+            "inputs": len(
+                [name for name in self._dependents if name not in self.nodes]
+            ),
+            "updates": self.updates,
+            "computed": self.computed,
+            "skipped": self.skipped,
+        }
+
+    def _read(self, name: str) -> Optional[object]:
+        try:
+            return self.prosim._get_dataref(name).value
+        except Exception:
+            return None
+
+    def _on_input_change(self, name: str, value: object):
+        """Change listener of the real inputs, called in the SDK event thread"""
+        changed_nodes = []
+        with self._lock:
+            values = self._values
+            if values.get(name) == value and name in values:
+                return
+            values[name] = value
+            self.updates += 1
+            changed = {name}
+            for node in self.affected(name):
+                if changed.isdisjoint(node._inputs):
+                    self.skipped += 1
+                    continue
+                self.computed += 1
+                if node._compute(values):
+                    values[node._name] = node._value
+                    changed.add(node._name)
+                    changed_nodes.append(node)
+        # Notified out of the lock, callbacks may read other derived datarefs
+        for node in changed_nodes:
+            node._notify()
@@ -0,0 +1,169 @@
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackDispatcher:
+    """Runs the dataref change callbacks in worker threads instead of the SDK
+    event thread, so a slow callback does not delay the delivery of other datarefs.
+
+    Events are queued per key (one key per dataref callback). While an event is
+    waiting, newer events for the same key replace it (merged), so a callback
+    always receives the latest change and runs at most once at a time per key.
+    When the queue is full, events for keys not already queued are dropped.
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 10000):
+        """CallbackDispatcher class init
+
+        Args:
+            workers (int, optional): Number of worker threads running the callbacks.
+                                     Defaults to 1.
+            max_pending (int, optional): Maximum number of queued events. Defaults to 10000.
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending: Dict[Hashable, Tuple[Callable, tuple]] = {}
+        self._queue = deque()
+        self._running = set()
+        lock = threading.Lock()
+        # Workers wait for queued events, join() waits for an empty queue
+        self._condition = threading.Condition(lock)
+        self._idle = threading.Condition(lock)
+        self._stopping = False
+        self._threads = []
+        # Counters
+        self.submitted = 0
+        self.delivered = 0
+        self.merged = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def wrap(self, key: Hashable, callback: Callable) -> Callable:
+        """Create an SDK event handler which queues the callback
+
+        Args:
+            key (Hashable): Coalescing key, events with the same key are merged
+            callback (Callable): User callback
+
+        Returns:
+            Callable: Event handler
+        """
+        submit = self.submit
+
+        def handler(*args):
+            submit(key, callback, args)
+
+        return handler
+
+    def submit(self, key: Hashable, callback: Callable, args: tuple) -> None:
+        """Queue a callback call
+
+        Args:
+            key (Hashable): Coalescing key
+            callback (Callable): Callback to call
+            args (tuple): Callback arguments
+        """
+        with self._condition:
+            self.submitted += 1
+            if key in self._pending:
+                self._pending[key] = (callback, args)
+                self.merged += 1
+                return
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending[key] = (callback, args)
+            # A key being delivered is queued again once its callback returns
+            if key not in self._running:
+                self._queue.append(key)
+                self._condition.notify()
+            if not self._threads:
+                self._start()
+
+    def stats(self) -> dict:
+        """Dispatcher counters
+
+        Returns:
+            dict: Submitted, delivered, merged, dropped and failed events,
+                  and the events currently pending
+        """
+        with self._condition:
+            return {
+                "submitted": self.submitted,
+                "delivered": self.delivered,
+                "merged": self.merged,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "pending": len(self._pending),
+            }
+
+    def join(self, timeout: float = None) -> bool:
+        """Wait until all queued events have been delivered
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the queue is empty
+        """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not self._pending and not self._running, timeout
+            )
+
+    def stop(self) -> None:
+        """Stop the worker threads. Queued events are discarded."""
+        with self._condition:
+            self._stopping = True
+            self._queue.clear()
+            self._pending.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        # Wake up join(), no worker is left to deliver
+        with self._idle:
+            self._running.clear()
+            self._idle.notify_all()
+
+    def _start(self):
+        self._stopping = False
+        for n in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"pyprosim-dispatcher-{n}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                while not self._queue and not self._stopping:
+                    condition.wait()
+                if self._stopping:
+                    return
+                key = self._queue.popleft()
+                callback, args = self._pending.pop(key)
+                self._running.add(key)
+
+            failed = False
+            try:
+                callback(*args)
+            except Exception:
+                failed = True
+                logger.exception("Dataref callback failed")
+
+            with condition:
+                self.errors += failed
+                self._running.discard(key)
+                self.delivered += 1
+                if key in self._pending:
+                    self._queue.append(key)
+                    condition.notify()
+                elif not self._pending and not self._running:
+                    self._idle.notify_all()
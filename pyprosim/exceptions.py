@@ -0,0 +1,14 @@
+class PyProsimDLLException(Exception):
+    pass
+
+
+class PyProsimImportException(Exception):
+    pass
+
+
+class PyProsimTypeException(Exception):
+    pass
+
+
+class PyProsimDatarefException(Exception):
+    pass
@@ -0,0 +1,211 @@
+import time
+from typing import Callable, Iterable, Optional
+
+# Marker of "no value", None is a valid value to compare with
+_NO_VALUE = object()
+
+
+class ChangeFilter:
+    """Base class of the change event filters.
+
+    Filters are evaluated on the SDK event, before the dataref callback is called
+    or queued. check() decides whether the event passes the filter, commit() is
+    called once the event is delivered, so filters comparing with the last
+    delivered value only see delivered values. Filters are stateful, use a new
+    instance for each subscription.
+    """
+
+    def __init__(self):
+        # Events suppressed by this filter
+        self.suppressed = 0
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def check(self, value: object, now: float) -> bool:
+        """Check whether a change event passes the filter
+
+        Args:
+            value (object): New dataref value
+            now (float): time.monotonic() value of the event
+
+        Returns:
+            bool: True if the event passes
+        """
+        return True
+
+    def commit(self, value: object, now: float) -> None:
+        """Called when a change event has been delivered
+
+        Args:
+            value (object): Delivered dataref value
+            now (float): time.monotonic() value of the event
+        """
+
+
+class Deadband(ChangeFilter):
+    """Deliver only changes larger than a deadband around the last delivered value.
+    The deadband is the largest of the absolute one and the relative one (fraction
+    of the last delivered value)."""
+
+    def __init__(self, absolute: float = 0.0, relative: float = 0.0):
+        """Deadband class init
+
+        Args:
+            absolute (float, optional): Absolute deadband. Defaults to 0.0.
+            relative (float, optional): Deadband relative to the last delivered value,
+                                        e.g. 0.01 for 1%. Defaults to 0.0.
+        """
+        super().__init__()
+        self.absolute = absolute
+        self.relative = relative
+        self._last = _NO_VALUE
+
+    def check(self, value: object, now: float) -> bool:
+        last = self._last
+        if last is _NO_VALUE:
+            return True
+        band = max(self.absolute, abs(last) * self.relative)
+        return abs(value - last) > band
+
+    def commit(self, value: object, now: float) -> None:
+        self._last = value
+
+
+class Hysteresis(ChangeFilter):
+    """Boolean state derived from a threshold with hysteresis. The state turns on
+    when the value rises above the high threshold and off when it falls below the
+    low threshold. Only the changes of the state are delivered, the state is
+    available in the state attribute."""
+
+    def __init__(self, low: float, high: float):
+        """Hysteresis class init
+
+        Args:
+            low (float): Threshold turning the state off
+            high (float): Threshold turning the state on
+        """
+        super().__init__()
+        if low > high:
+            raise ValueError("Hysteresis low threshold is above the high one")
+        self.low = low
+        self.high = high
+        # Current state, None until the first event
+        self.state: Optional[bool] = None
+
+    def _next_state(self, value: object) -> bool:
+        if value >= self.high:
+            return True
+        if value <= self.low:
+            return False
+        # Between thresholds the state does not change, initially it is off
+        return bool(self.state)
+
+    def check(self, value: object, now: float) -> bool:
+        return self._next_state(value) != self.state
+
+    def commit(self, value: object, now: float) -> None:
+        self.state = self._next_state(value)
+
+
+class MinInterval(ChangeFilter):
+    """Deliver at most one change every interval seconds. Changes arriving
+    earlier are dropped, not delayed."""
+
+    def __init__(self, interval: float):
+        """MinInterval class init
+
+        Args:
+            interval (float): Minimum time between deliveries in seconds
+        """
+        super().__init__()
+        self.interval = interval
+        self._last_time = float("-inf")
+
+    def check(self, value: object, now: float) -> bool:
+        return now - self._last_time >= self.interval
+
+    def commit(self, value: object, now: float) -> None:
+        self._last_time = now
+
+
+class DiscreteChange(ChangeFilter):
+    """Deliver only when the value differs from the last delivered one. Meant for
+    integer, boolean and string datarefs which Prosim may send unchanged."""
+
+    def __init__(self):
+        super().__init__()
+        self._last = _NO_VALUE
+
+    def check(self, value: object, now: float) -> bool:
+        return self._last is _NO_VALUE or value != self._last
+
+    def commit(self, value: object, now: float) -> None:
+        self._last = value
+
+
+class FilterChain:
+    """Filters of one subscription, evaluated in order. The first filter rejecting
+    an event counts it as suppressed."""
+
+    def __init__(self, filters: Iterable[ChangeFilter]):
+        """FilterChain class init
+
+        Args:
+            filters (Iterable[ChangeFilter]): Filters to evaluate
+        """
+        self.filters = tuple(filters)
+        self.received = 0
+        self.delivered = 0
+
+    def accept(self, value: object, now: float = None) -> bool:
+        """Evaluate the filters on a change event
+
+        Args:
+            value (object): New dataref value
+            now (float, optional): time.monotonic() value of the event. Defaults to now.
+
+        Returns:
+            bool: True if the event has to be delivered
+        """
+        if now is None:
+            now = time.monotonic()
+        self.received += 1
+        for change_filter in self.filters:
+            if not change_filter.check(value, now):
+                change_filter.suppressed += 1
+                return False
+        for change_filter in self.filters:
+            change_filter.commit(value, now)
+        self.delivered += 1
+        return True
+
+    def wrap(self, callback: Callable) -> Callable:
+        """Create an SDK event handler calling the callback only for accepted events
+
+        Args:
+            callback (Callable): Dataref change callback
+
+        Returns:
+            Callable: Event handler
+        """
+        accept = self.accept
+
+        def handler(dataref):
+            if accept(dataref.value):
+                callback(dataref)
+
+        return handler
+
+    def stats(self) -> dict:
+        """Filter counters
+
+        Returns:
+            dict: Events received and delivered, and the events suppressed by each filter
+        """
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "suppressed": [(f.name, f.suppressed) for f in self.filters],
+        }
@@ -0,0 +1,887 @@
+import asyncio
+import itertools
+import logging
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .exceptions import PyProsimDatarefException
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+    from .subscription import Subscription
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8089
+
+
+class GatewayProtocol:
+    """Binary protocol between the gateway and its clients.
+
+    Every message is a header (type, request id, payload length) followed by the
+    payload. The same messages are sent over TCP, as a stream, and over UDP, one
+    or more messages per datagram. Replies carry the request id of the request,
+    request id 0 means no reply is expected.
+
+    Requests, client to gateway:
+    - SUBSCRIBE: interval (uint32, milliseconds), dataref name
+    - UNSUBSCRIBE: dataref name
+    - GET: dataref name
+    - SET: value, dataref name
+    - PING: empty, keeps UDP clients alive
+
+    Replies and events, gateway to client:
+    - RESULT: SUBSCRIBE: dataref id (uint32) and current value, GET: value,
+              SET, UNSUBSCRIBE and PING: empty
+    - ERROR: UTF-8 message
+    - UPDATE: (dataref id, value) pairs, the changes since the last update
+
+    Values are a kind byte followed by the value: float64, bool, int64, uint64
+    (integers of 2^63 or more) or a UTF-8 string with its uint16 length. Longer
+    strings are truncated to 65535 bytes, integers out of the uint64 and int64
+    ranges are sent as strings.
+    """
+
+    # type, request id, payload length
+    HEADER = struct.Struct("<BII")
+    SUBSCRIBE = 1
+    UNSUBSCRIBE = 2
+    GET = 3
+    SET = 4
+    PING = 5
+    RESULT = 64
+    ERROR = 65
+    UPDATE = 66
+
+    KIND_NONE = 0
+    KIND_FLOAT = 1
+    KIND_BOOL = 2
+    KIND_INT = 3
+    KIND_STR = 4
+    KIND_UINT = 5
+    UINT32 = struct.Struct("<I")
+    FLOAT = struct.Struct("<Bd")
+    BOOL = struct.Struct("<B?")
+    INT = struct.Struct("<Bq")
+    UINT = struct.Struct("<BQ")
+    STR = struct.Struct("<BH")
+    MAX_TEXT = 2**16 - 1
+
+    @classmethod
+    def message(
+        cls, message_type: int, request_id: int = 0, payload: bytes = b""
+    ) -> bytes:
+        return cls.HEADER.pack(message_type, request_id, len(payload)) + payload
+
+    @classmethod
+    def encode_value(cls, value: object) -> bytes:
+        if value is None:
+            return bytes((cls.KIND_NONE,))
+        if isinstance(value, bool):
+            return cls.BOOL.pack(cls.KIND_BOOL, value)
+        if isinstance(value, int):
+            if -(2**63) <= value < 2**63:
+                return cls.INT.pack(cls.KIND_INT, value)
+            if 0 <= value < 2**64:
+                return cls.UINT.pack(cls.KIND_UINT, value)
+            return cls.encode_text(str(value))
+        if isinstance(value, str):
+            return cls.encode_text(value)
+        # Floats and other numeric types, e.g. Decimal
+        try:
+            return cls.FLOAT.pack(cls.KIND_FLOAT, float(value))
+        except (TypeError, ValueError, OverflowError):
+            return cls.encode_text(str(value))
+
+    @classmethod
+    def encode_text(cls, value: str) -> bytes:
+        text = value.encode()
+        if len(text) > cls.MAX_TEXT:
+            # Truncated on a character boundary
+            text = text[: cls.MAX_TEXT].decode(errors="ignore").encode()
+        return cls.STR.pack(cls.KIND_STR, len(text)) + text
+
+    @classmethod
+    def decode_value(cls, data: bytes, offset: int = 0) -> Tuple[object, int]:
+        """Decode a value
+
+        Returns:
+            Tuple[object, int]: Value and offset of the next field
+        """
+        kind = data[offset]
+        if kind == cls.KIND_FLOAT:
+            return cls.FLOAT.unpack_from(data, offset)[1], offset + cls.FLOAT.size
+        if kind == cls.KIND_BOOL:
+            return cls.BOOL.unpack_from(data, offset)[1], offset + cls.BOOL.size
+        if kind == cls.KIND_INT:
+            return cls.INT.unpack_from(data, offset)[1], offset + cls.INT.size
+        if kind == cls.KIND_UINT:
+            return cls.UINT.unpack_from(data, offset)[1], offset + cls.UINT.size
+        if kind == cls.KIND_STR:
+            length = cls.STR.unpack_from(data, offset)[1]
+            start = offset + cls.STR.size
+            return bytes(data[start : start + length]).decode(), start + length
+        return None, offset + 1
+
+    @classmethod
+    def split(cls, data: bytes) -> Tuple[List[Tuple[int, int, bytes]], bytes]:
+        """Split a byte stream into messages
+
+        Returns:
+            Tuple[List[Tuple[int, int, bytes]], bytes]: (type, request id, payload) of the
+                                                         complete messages, and the bytes
+                                                         of the incomplete one
+        """
+        messages = []
+        offset = 0
+        header_size = cls.HEADER.size
+        while len(data) - offset >= header_size:
+            message_type, request_id, length = cls.HEADER.unpack_from(data, offset)
+            end = offset + header_size + length
+            if end > len(data):
+                break
+            messages.append(
+                (message_type, request_id, data[offset + header_size : end])
+            )
+            offset = end
+        return messages, data[offset:]
+
+
+class _Session:
+    """Subscriptions and pending updates of one gateway client"""
+
+    def __init__(self, send: Callable[[bytes], None], max_message: int):
+        self.send = send
+        self.max_message = max_message
+        # Dataref id -> minimum seconds between updates
+        self.subscriptions: Dict[int, float] = {}
+        # Dataref id -> latest encoded update not sent yet
+        self.pending: Dict[int, bytes] = {}
+        self.last_sent: Dict[int, float] = {}
+        self.last_seen = time.monotonic()
+        self.updates = 0
+
+    def flush(self, now: float) -> None:
+        """Send the pending updates allowed by the subscription intervals"""
+        if not self.pending:
+            return
+        ready = []
+        last_sent = self.last_sent
+        for dataref_id, item in self.pending.items():
+            if now - last_sent.get(dataref_id, float("-inf")) >= self.subscriptions.get(
+                dataref_id, 0.0
+            ):
+                ready.append((dataref_id, item))
+        if not ready:
+            return
+
+        chunks = []
+        size = 0
+        limit = self.max_message - GatewayProtocol.HEADER.size
+        for dataref_id, item in ready:
+            del self.pending[dataref_id]
+            last_sent[dataref_id] = now
+            if size + len(item) > limit and chunks:
+                self.send(
+                    GatewayProtocol.message(GatewayProtocol.UPDATE, 0, b"".join(chunks))
+                )
+                chunks = []
+                size = 0
+            chunks.append(item)
+            size += len(item)
+        self.send(GatewayProtocol.message(GatewayProtocol.UPDATE, 0, b"".join(chunks)))
+        self.updates += len(ready)
+
+
+class _TcpConnection(asyncio.Protocol):
+    def __init__(self, gateway: "Gateway"):
+        self.gateway = gateway
+        self.session: _Session = None
+        self.buffer = b""
+
+    def connection_made(self, transport: asyncio.Transport):
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.session = _Session(transport.write, self.gateway.max_tcp_message)
+        self.gateway._sessions.append(self.session)
+
+    def data_received(self, data: bytes):
+        messages, self.buffer = GatewayProtocol.split(self.buffer + data)
+        for message in messages:
+            self.gateway._handle(self.session, *message)
+
+    def connection_lost(self, exc):
+        self.gateway._close_session(self.session)
+
+
+class _UdpEndpoint(asyncio.DatagramProtocol):
+    def __init__(self, gateway: "Gateway"):
+        self.gateway = gateway
+        self.transport: asyncio.DatagramTransport = None
+        self.sessions: Dict[tuple, _Session] = {}
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        session = self.sessions.get(addr)
+        if session is None:
+            session = _Session(
+                lambda message: self.transport.sendto(message, addr),
+                self.gateway.max_datagram,
+            )
+            self.sessions[addr] = session
+            self.gateway._sessions.append(session)
+        session.last_seen = time.monotonic()
+        messages, _ = GatewayProtocol.split(data)
+        for message in messages:
+            self.gateway._handle(session, *message)
+
+    def expire(self, now: float, timeout: float):
+        for addr, session in list(self.sessions.items()):
+            if now - session.last_seen > timeout:
+                del self.sessions[addr]
+                self.gateway._close_session(session)
+
+
+class Gateway:
+    """Serves the datarefs of one PyProsim connection to many clients over TCP and
+    UDP (see GatewayProtocol and GatewayClient).
+
+    The subscriptions of every client are merged: each dataref is activated once,
+    at the smallest interval requested, and the changes are coalesced and sent to
+    each client at most at its own interval. Writes are queued and applied in
+    batches, the latest value of each dataref wins.
+
+    The requests calling the SDK run in background threads, so a slow activation
+    or read does not hold the other clients.
+    """
+
+    def __init__(
+        self,
+        prosim: "PyProsim",
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        udp: bool = True,
+        flush_interval: float = 0.005,
+        max_datagram: int = 1400,
+        udp_timeout: float = 30.0,
+    ):
+        """Gateway class init
+
+        Args:
+            prosim (PyProsim): Connected PyProsim
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1", use
+                                  "0.0.0.0" to serve other hosts.
+            port (int, optional): TCP and UDP port. Defaults to 8089.
+            udp (bool, optional): Serve UDP clients too. Defaults to True.
+            flush_interval (float, optional): Seconds between updates and write batches.
+                                              Defaults to 0.005.
+            max_datagram (int, optional): Maximum UDP datagram size. Defaults to 1400.
+            udp_timeout (float, optional): Seconds without datagrams before an UDP client
+                                           is dropped. Defaults to 30.0.
+        """
+        self.prosim = prosim
+        self.host = host
+        self.port = port
+        self.udp = udp
+        self.flush_interval = flush_interval
+        self.max_datagram = max_datagram
+        self.max_tcp_message = 65536
+        self.udp_timeout = udp_timeout
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: threading.Thread = None
+        self._started = threading.Event()
+        # Exception which stopped the server thread
+        self._error: BaseException = None
+        self._closing: asyncio.Event = None
+        self._sessions: List[_Session] = []
+        # Dataref ids are shared by all the clients
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # Dataref name -> subscribed sessions and their PyProsim subscription
+        self._subscribers: Dict[str, Dict[_Session, "Subscription"]] = {}
+        # Subscriptions of the datarefs read or written without subscribers
+        self._owned: Dict[str, "Subscription"] = {}
+        # Guards the dataref ids, the subscribers, and the changes and writes
+        # waiting for the next flush
+        self._lock = threading.Lock()
+        self._changed: Dict[str, object] = {}
+        self._writes: Dict[str, Tuple[object, List[Tuple[_Session, int]]]] = {}
+        # The SDK is called out of the event loop: subscribe, unsubscribe and get
+        # requests in order by one thread, writes in order by another
+        self._request_executor: ThreadPoolExecutor = None
+        self._write_executor: ThreadPoolExecutor = None
+        # Counters
+        self.writes = 0
+        self.write_batches = 0
+
+    def start(self) -> "Gateway":
+        """Start serving in a background thread
+
+        Raises:
+            OSError: The gateway could not listen, e.g. the port is already in use
+
+        Returns:
+            Gateway: This gateway
+        """
+        self._started.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, name="pyprosim-gateway", daemon=True
+        )
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._error
+        return self
+
+    def _run(self):
+        try:
+            asyncio.run(self.serve())
+        except BaseException as e:
+            if self._started.is_set():
+                logger.exception("Gateway stopped")
+            self._error = e
+        finally:
+            # Not waiting forever in start() when serve() failed early
+            self._started.set()
+
+    def stop(self) -> None:
+        """Stop serving and wait for the background thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._closing.set)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "Gateway":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    async def serve(self) -> None:
+        """Serve until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._closing = asyncio.Event()
+        try:
+            server = await self._loop.create_server(
+                lambda: _TcpConnection(self), self.host, self.port
+            )
+            udp = None
+            if self.udp:
+                try:
+                    transport, udp = await self._loop.create_datagram_endpoint(
+                        lambda: _UdpEndpoint(self), local_addr=(self.host, self.port)
+                    )
+                except Exception:
+                    server.close()
+                    raise
+        except Exception:
+            self._loop = None
+            raise
+        self._request_executor = ThreadPoolExecutor(1, "pyprosim-gateway-requests")
+        self._write_executor = ThreadPoolExecutor(1, "pyprosim-gateway-writes")
+        self._started.set()
+        try:
+            while not self._closing.is_set():
+                try:
+                    await asyncio.wait_for(self._closing.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                now = time.monotonic()
+                self._flush(now)
+                if udp is not None:
+                    udp.expire(now, self.udp_timeout)
+        finally:
+            server.close()
+            if udp is not None:
+                transport.close()
+            for session in list(self._sessions):
+                self._close_session(session)
+            await server.wait_closed()
+            self._request_executor.shutdown()
+            self._write_executor.shutdown()
+            for subscription in self._owned.values():
+                subscription.cancel()
+            self._owned = {}
+            self._loop = None
+
+    def stats(self) -> dict:
+        """Gateway counters
+
+        Returns:
+            dict: Clients, subscriptions per dataref, updates sent and writes applied
+        """
+        # Changed by the request thread
+        with self._lock:
+            subscriptions = {name: len(s) for name, s in self._subscribers.items()}
+        sessions = list(self._sessions)
+        return {
+            "clients": len(sessions),
+            "datarefs": len(subscriptions),
+            "subscriptions": sum(subscriptions.values()),
+            "activated": {
+                name: self.prosim.get_dataref_obj(name).interval
+                for name in subscriptions
+            },
+            "updates": sum(s.updates for s in sessions),
+            "writes": self.writes,
+            "write_batches": self.write_batches,
+        }
+
+    def _on_change(self, name: str, value: object):
+        with self._lock:
+            self._changed[name] = value
+
+    def _flush(self, now: float):
+        with self._lock:
+            changed, self._changed = self._changed, {}
+            writes, self._writes = self._writes, {}
+            targets = [
+                (name, value, self._ids[name], list(self._subscribers[name]))
+                for name, value in changed.items()
+                if self._subscribers.get(name)
+            ]
+        # Each change is encoded once for all the subscribers
+        for name, value, dataref_id, subscribers in targets:
+            encoded = self._encode(name, value)
+            if encoded is None:
+                continue
+            item = GatewayProtocol.UINT32.pack(dataref_id) + encoded
+            for session in subscribers:
+                session.pending[dataref_id] = item
+        for session in self._sessions:
+            try:
+                session.flush(now)
+            except Exception:
+                logger.exception("Gateway update failed")
+        if writes:
+            loop = self._loop
+            future = self._write_executor.submit(self._apply_writes, writes)
+            future.add_done_callback(
+                lambda f: loop.call_soon_threadsafe(self._reply_writes, f.result())
+            )
+
+    def _encode(self, name: str, value: object) -> Optional[bytes]:
+        """Encode a dataref value, None (logged) when it cannot be encoded"""
+        try:
+            return GatewayProtocol.encode_value(value)
+        except Exception:
+            logger.exception('Gateway cannot encode the value of dataref "%s"', name)
+            return None
+
+    def _apply_writes(self, writes: dict) -> List[Tuple[_Session, int, Optional[str]]]:
+        """Apply a batch of writes, in the write thread"""
+        replies = []
+        for name, (value, requests) in writes.items():
+            error = None
+            try:
+                self._get_dataref(name).value = value
+            except Exception as e:
+                error = str(e)
+            replies.extend(
+                (session, request_id, error) for session, request_id in requests
+            )
+        self.writes += len(writes)
+        self.write_batches += 1
+        return replies
+
+    def _reply_writes(self, replies: List[Tuple[_Session, int, Optional[str]]]):
+        for session, request_id, error in replies:
+            if request_id:
+                self._reply(session, request_id, error=error)
+
+    def _reply(
+        self,
+        session: _Session,
+        request_id: int,
+        payload: bytes = b"",
+        error: str = None,
+    ):
+        if error is not None:
+            message = GatewayProtocol.message(
+                GatewayProtocol.ERROR, request_id, error.encode()
+            )
+        else:
+            message = GatewayProtocol.message(
+                GatewayProtocol.RESULT, request_id, payload
+            )
+        session.send(message)
+
+    def _handle(
+        self, session: _Session, message_type: int, request_id: int, payload: bytes
+    ):
+        try:
+            if message_type == GatewayProtocol.SUBSCRIBE:
+                interval = GatewayProtocol.UINT32.unpack_from(payload)[0]
+                name = payload[GatewayProtocol.UINT32.size :].decode()
+                self._request(
+                    session, request_id, self._subscribe, session, name, interval
+                )
+            elif message_type == GatewayProtocol.UNSUBSCRIBE:
+                self._request(
+                    session, request_id, self._unsubscribe, session, payload.decode()
+                )
+            elif message_type == GatewayProtocol.GET:
+                self._request(session, request_id, self._get, payload.decode())
+            elif message_type == GatewayProtocol.SET:
+                value, offset = GatewayProtocol.decode_value(payload)
+                name = payload[offset:].decode()
+                self.prosim.get_dataref_obj(name)
+                with self._lock:
+                    _, requests = self._writes.get(name, (None, []))
+                    requests.append((session, request_id))
+                    self._writes[name] = (value, requests)
+            elif message_type == GatewayProtocol.PING:
+                self._reply(session, request_id)
+            else:
+                raise ValueError(f"Unknown message type {message_type}")
+        except Exception as e:
+            if request_id:
+                self._reply(session, request_id, error=str(e))
+            else:
+                logger.warning("Gateway request failed: %s", e)
+
+    def _request(
+        self, session: _Session, request_id: int, function: Callable, *args
+    ) -> None:
+        """Run a request in the request thread, as it calls the SDK, and reply
+        from the event loop once done. The function returns the reply payload and
+        a callable updating the session, run in the event loop before the reply."""
+        loop = self._loop
+        future = self._request_executor.submit(function, *args)
+        future.add_done_callback(
+            lambda f: loop.call_soon_threadsafe(
+                self._reply_request, session, request_id, f
+            )
+        )
+
+    def _reply_request(self, session: _Session, request_id: int, future: Future):
+        if session not in self._sessions:
+            return
+        try:
+            payload, update = future.result()
+        except Exception as e:
+            if request_id:
+                self._reply(session, request_id, error=str(e))
+            else:
+                logger.warning("Gateway request failed: %s", e)
+            return
+        if update is not None:
+            update()
+        self._reply(session, request_id, payload)
+
+    def _get(self, name: str) -> Tuple[bytes, None]:
+        """Read a dataref, in the request thread"""
+        encoded = self._encode(name, self._get_dataref(name).value)
+        if encoded is None:
+            raise ValueError(f'Value of dataref "{name}" cannot be encoded')
+        return encoded, None
+
+    def _get_dataref(self, name: str) -> "PyProsim.Dataref":
+        """Dataref to read or write, activated without updates if needed"""
+        dataref = self.prosim.get_dataref_obj(name)
+        with self._lock:
+            if name not in self._owned:
+                self._owned[name] = self.prosim.activate_dataref(name, 0)
+        return dataref
+
+    def _subscribe(
+        self, session: _Session, name: str, interval: int
+    ) -> Tuple[bytes, Callable]:
+        """Subscribe a session to a dataref, in the request thread"""
+        dataref = self.prosim.get_dataref_obj(name)
+        with self._lock:
+            dataref_id = self._ids.get(name)
+            if dataref_id is None:
+                dataref_id = self._ids[name] = len(self._names)
+                self._names.append(name)
+            first = name not in self._subscribers
+            subscribers = self._subscribers.setdefault(name, {})
+        # The listener comes first, not to miss a change after the activation
+        if first:
+            self.prosim.add_change_listener(name, self._on_change)
+        # PyProsim shares one activation per dataref, at the smallest interval
+        try:
+            subscription = self.prosim.activate_dataref(name, interval)
+        except Exception:
+            if first:
+                with self._lock:
+                    del self._subscribers[name]
+                self.prosim.remove_change_listener(name, self._on_change)
+            raise
+        with self._lock:
+            previous = subscribers.get(session)
+            subscribers[session] = subscription
+        if previous is not None:
+            previous.cancel()
+        value = dataref.value if dataref.can_read else None
+        # Subscribed anyway, the next changes may be encoded
+        encoded = self._encode(name, value) or GatewayProtocol.encode_value(None)
+
+        def update():
+            session.subscriptions[dataref_id] = interval / 1000
+
+        return GatewayProtocol.UINT32.pack(dataref_id) + encoded, update
+
+    def _unsubscribe(self, session: _Session, name: str) -> Tuple[bytes, Callable]:
+        """Unsubscribe a session from a dataref, in the request thread"""
+        with self._lock:
+            dataref_id = self._ids.get(name)
+            subscribers = self._subscribers.get(name)
+            if subscribers is None or session not in subscribers:
+                return b"", None
+            subscription = subscribers.pop(session)
+            last = not subscribers
+            if last:
+                del self._subscribers[name]
+        subscription.cancel()
+        if last:
+            self.prosim.remove_change_listener(name, self._on_change)
+
+        def update():
+            session.subscriptions.pop(dataref_id, None)
+            session.pending.pop(dataref_id, None)
+
+        return b"", update
+
+    def _close_session(self, session: _Session):
+        if session not in self._sessions:
+            return
+        self._sessions.remove(session)
+        self._request_executor.submit(self._release_session, session)
+
+    def _release_session(self, session: _Session):
+        """Release the subscriptions of a closed session, in the request thread"""
+        with self._lock:
+            names = [name for name, s in self._subscribers.items() if session in s]
+        for name in names:
+            self._unsubscribe(session, name)
+
+
+class GatewayClient:
+    """Client of a Gateway. It only depends on the standard library, so it runs on
+    small boards without the ProSim SDK.
+
+    Subscription callbacks are called with (name, value) in the client receive
+    thread and must return quickly.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        udp: bool = False,
+        timeout: float = 5.0,
+        ping_interval: float = 10.0,
+    ):
+        """GatewayClient class init
+
+        Args:
+            host (str, optional): Gateway host. Defaults to "127.0.0.1".
+            port (int, optional): Gateway port. Defaults to 8089.
+            udp (bool, optional): Use UDP instead of TCP. Requests may then be lost
+                                  and time out. Defaults to False.
+            timeout (float, optional): Seconds to wait for replies. Defaults to 5.0.
+            ping_interval (float, optional): Seconds between keep alive messages over
+                                             UDP. Defaults to 10.0.
+        """
+        self.timeout = timeout
+        self.udp = udp
+        if udp:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.connect((host, port))
+        else:
+            self._socket = socket.create_connection((host, port), timeout)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._socket.settimeout(None)
+        self._send_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._requests: Dict[int, Future] = {}
+        # Dataref id -> name and callbacks
+        self._names: Dict[int, str] = {}
+        self._callbacks: Dict[str, List[Callable]] = {}
+        self._closed = threading.Event()
+        self._receiver = threading.Thread(
+            target=self._receive, name="pyprosim-gateway-client", daemon=True
+        )
+        self._receiver.start()
+        if udp:
+            self._pinger = threading.Thread(
+                target=self._ping, args=(ping_interval,), daemon=True
+            )
+            self._pinger.start()
+
+    def close(self) -> None:
+        """Close the connection"""
+        if self.udp:
+            # UDP clients are otherwise only dropped by the gateway timeout
+            for name in list(self._callbacks):
+                self._send(
+                    GatewayProtocol.message(
+                        GatewayProtocol.UNSUBSCRIBE, 0, name.encode()
+                    )
+                )
+        self._closed.set()
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        self._receiver.join()
+
+    def __enter__(self) -> "GatewayClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def subscribe(self, dataref_name: str, interval: int, callback: Callable) -> object:
+        """Subscribe to the changes of a dataref
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            interval (int): Minimum time between updates in milliseconds
+            callback (Callable): Called with (name, value) on every update
+
+        Raises:
+            PyProsimDatarefException: The gateway rejected the request
+            TimeoutError: No reply in time
+
+        Returns:
+            object: Current dataref value
+        """
+        self._callbacks.setdefault(dataref_name, []).append(callback)
+        payload = GatewayProtocol.UINT32.pack(interval) + dataref_name.encode()
+        try:
+            reply = self._request(GatewayProtocol.SUBSCRIBE, payload)
+        except Exception:
+            self._callbacks[dataref_name].remove(callback)
+            raise
+        dataref_id = GatewayProtocol.UINT32.unpack_from(reply)[0]
+        self._names[dataref_id] = dataref_name
+        return GatewayProtocol.decode_value(reply, GatewayProtocol.UINT32.size)[0]
+
+    def unsubscribe(self, dataref_name: str) -> None:
+        """Unsubscribe from a dataref, removing all its callbacks
+
+        Args:
+            dataref_name (str): Prosim dataref name
+        """
+        self._callbacks.pop(dataref_name, None)
+        self._request(GatewayProtocol.UNSUBSCRIBE, dataref_name.encode())
+
+    def get(self, dataref_name: str) -> object:
+        """Get a dataref value
+
+        Args:
+            dataref_name (str): Prosim dataref name
+
+        Raises:
+            PyProsimDatarefException: The gateway rejected the request
+            TimeoutError: No reply in time
+
+        Returns:
+            object: Dataref value
+        """
+        reply = self._request(GatewayProtocol.GET, dataref_name.encode())
+        return GatewayProtocol.decode_value(reply)[0]
+
+    def set(self, dataref_name: str, value: object, wait: bool = True) -> None:
+        """Set a dataref value
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            value (object): Value to set
+            wait (bool, optional): Wait until the gateway applied the write. Without
+                                   waiting, write errors are only logged by the gateway.
+                                   Defaults to True.
+
+        Raises:
+            PyProsimDatarefException: The gateway rejected the write
+            TimeoutError: No reply in time
+        """
+        payload = GatewayProtocol.encode_value(value) + dataref_name.encode()
+        if wait:
+            self._request(GatewayProtocol.SET, payload)
+        else:
+            self._send(GatewayProtocol.message(GatewayProtocol.SET, 0, payload))
+
+    def _request(self, message_type: int, payload: bytes) -> bytes:
+        request_id = next(self._request_ids)
+        future = Future()
+        self._requests[request_id] = future
+        try:
+            self._send(GatewayProtocol.message(message_type, request_id, payload))
+            try:
+                return future.result(self.timeout)
+            except FutureTimeoutError:
+                raise TimeoutError("No reply from the gateway")
+        finally:
+            self._requests.pop(request_id, None)
+
+    def _send(self, message: bytes):
+        with self._send_lock:
+            if self.udp:
+                self._socket.send(message)
+            else:
+                self._socket.sendall(message)
+
+    def _ping(self, interval: float):
+        while not self._closed.wait(interval):
+            try:
+                self._send(GatewayProtocol.message(GatewayProtocol.PING))
+            except OSError:
+                return
+
+    def _receive(self):
+        buffer = b""
+        while not self._closed.is_set():
+            try:
+                data = self._socket.recv(65536)
+            except OSError:
+                break
+            if not data:
+                break
+            if self.udp:
+                messages, _ = GatewayProtocol.split(data)
+            else:
+                messages, buffer = GatewayProtocol.split(buffer + data)
+            for message_type, request_id, payload in messages:
+                if message_type == GatewayProtocol.UPDATE:
+                    self._dispatch(payload)
+                    continue
+                future = self._requests.get(request_id)
+                if future is None:
+                    continue
+                if message_type == GatewayProtocol.ERROR:
+                    future.set_exception(PyProsimDatarefException(payload.decode()))
+                else:
+                    future.set_result(payload)
+        for future in list(self._requests.values()):
+            if not future.done():
+                future.set_exception(ConnectionError("Gateway connection closed"))
+
+    def _dispatch(self, payload: bytes):
+        offset = 0
+        while offset < len(payload):
+            dataref_id = GatewayProtocol.UINT32.unpack_from(payload, offset)[0]
+            value, offset = GatewayProtocol.decode_value(
+                payload, offset + GatewayProtocol.UINT32.size
+            )
+            name = self._names.get(dataref_id)
+            for callback in self._callbacks.get(name, ()):
+                try:
+                    callback(name, value)
+                except Exception:
+                    logger.exception("Gateway client callback failed")
@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING, Callable
+
+from .exceptions import PyProsimDatarefException, PyProsimTypeException
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+
+class DatarefHandle:
+    """Pre-resolved accessor of an active dataref.
+
+    The dataref lookup, the access checks and the data type cast are resolved
+    once when the handle is created, so get() and set() only do the SDK call.
+    If the dataref has a write pipeline, set() writes through it. Obtain it
+    through PyProsim.handle(), after configuring the writes if needed.
+    """
+
+    __slots__ = ("dataref", "get", "set")
+
+    def __init__(self, dataref: "PyProsim.Dataref"):
+        """DatarefHandle class init
+
+        Args:
+            dataref (PyProsim.Dataref): Active PyProsim dataref
+        """
+        self.dataref = dataref
+        self.get: Callable[[], object] = self._make_getter(dataref)
+        self.set: Callable[[object], None] = self._make_setter(dataref)
+
+    @property
+    def name(self) -> str:
+        return self.dataref.name
+
+    @staticmethod
+    def _make_getter(dataref: "PyProsim.Dataref") -> Callable[[], object]:
+        def get() -> object:
+            return dataref._dataref_obj.value
+
+        return get
+
+    @staticmethod
+    def _make_setter(dataref: "PyProsim.Dataref") -> Callable[[object], None]:
+        if dataref._writer is not None:
+            return dataref._writer.write
+
+        if not dataref.can_write:
+
+            def set(value: object) -> None:
+                raise PyProsimDatarefException(
+                    f'Dataref "{dataref.name}" is not writable!'
+                )
+
+            return set
+
+        cast = dataref.data_type
+        if cast is None:
+
+            def set(value: object) -> None:
+                raise PyProsimTypeException(
+                    f'Dataref "{dataref.name}" data type is unknown'
+                )
+
+            return set
+
+        value_exceptions = dataref._parent.backend.value_exceptions
+
+        def set(value: object) -> None:
+            try:
+                dataref._dataref_obj.value = cast(value)
+            except value_exceptions as e:
+                raise PyProsimTypeException(e)
+
+        return set
@@ -0,0 +1,207 @@
+import time
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .exceptions import PyProsimImportException
+
+if TYPE_CHECKING:
+    from .subscription import Subscription
+
+
+class History:
+    """Ring buffer of the last (timestamp, value) samples of a numeric dataref,
+    filled from its change events. See PyProsim.keep_history.
+
+    Samples are stored as doubles in two preallocated arrays. Each sample is
+    written twice, at its slot and one capacity further, so the latest samples
+    are always contiguous: windows are memoryview slices and NumPy views of the
+    arrays, never copies. Queries find the window start by binary search and
+    aggregate over the window only.
+
+    Timestamps are time.monotonic() values. The buffer is written without a
+    lock, a query racing a change of a full buffer may see its oldest sample
+    replaced by the newest one.
+    """
+
+    def __init__(self, name: str, capacity: int = 1024):
+        """History class init
+
+        Args:
+            name (str): Dataref name
+            capacity (int, optional): Number of samples kept. Defaults to 1024.
+        """
+        self.name = name
+        self.capacity = capacity
+        self._times = array("d", bytes(16 * capacity))
+        self._values = array("d", bytes(16 * capacity))
+        # Samples appended so far
+        self.count = 0
+        # Values which could not be converted to float
+        self.rejected = 0
+        # Subscription activating the dataref, if any
+        self.subscription: "Subscription" = None
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, replacing the oldest one when full"""
+        slot = self.count % self.capacity
+        self._times[slot] = self._times[slot + self.capacity] = timestamp
+        self._values[slot] = self._values[slot + self.capacity] = value
+        self.count += 1
+
+    def on_change(self, name: str, value: object) -> None:
+        """Change listener appending the new value"""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            self.rejected += 1
+            return
+        self.append(time.monotonic(), value)
+
+    def clear(self) -> None:
+        """Forget the samples"""
+        self.count = 0
+
+    def window(
+        self, seconds: float = None, last: int = None, now: float = None
+    ) -> Tuple[memoryview, memoryview]:
+        """Samples of a time window, or the last N samples, oldest first
+
+        Args:
+            seconds (float, optional): Window length up to now. Defaults to None,
+                                       all the samples kept.
+            last (int, optional): At most this number of latest samples.
+                                  Defaults to None, no limit.
+            now (float, optional): time.monotonic() value ending the window.
+                                   Defaults to None, now.
+
+        Returns:
+            Tuple[memoryview, memoryview]: Timestamps and values, views of the buffer
+        """
+        end, size = self._latest()
+        start = end - size
+        if last is not None:
+            start = max(start, end - last)
+        if seconds is not None:
+            if now is None:
+                now = time.monotonic()
+            times = memoryview(self._times)
+            start = bisect_left(times, now - seconds, start, end)
+        return memoryview(self._times)[start:end], memoryview(self._values)[start:end]
+
+    def last(self, n: int = 1) -> List[Tuple[float, float]]:
+        """Last samples
+
+        Args:
+            n (int, optional): Number of samples. Defaults to 1.
+
+        Returns:
+            List[Tuple[float, float]]: (timestamp, value) samples, oldest first
+        """
+        times, values = self.window(last=n)
+        return list(zip(times, values))
+
+    def min(self, seconds: float = None) -> Optional[float]:
+        """Smallest value in a window, None without samples"""
+        values = self.window(seconds)[1]
+        return min(values) if len(values) else None
+
+    def max(self, seconds: float = None) -> Optional[float]:
+        """Largest value in a window, None without samples"""
+        values = self.window(seconds)[1]
+        return max(values) if len(values) else None
+
+    def mean(self, seconds: float = None) -> Optional[float]:
+        """Mean of the values in a window, None without samples"""
+        values = self.window(seconds)[1]
+        return sum(values) / len(values) if len(values) else None
+
+    def slope(self, seconds: float = None) -> Optional[float]:
+        """Rate of change in a window, the least squares slope of the values in
+        units per second. None with less than two samples at different times."""
+        return self._slope(*self.window(seconds))
+
+    @staticmethod
+    def _slope(times: memoryview, values: memoryview) -> Optional[float]:
+        n = len(times)
+        if n < 2:
+            return None
+        # Relative to the first sample for precision
+        origin = times[0]
+        sum_t = sum_v = sum_tt = sum_tv = 0.0
+        for t, v in zip(times, values):
+            t -= origin
+            sum_t += t
+            sum_v += v
+            sum_tt += t * t
+            sum_tv += t * v
+        denominator = n * sum_tt - sum_t * sum_t
+        if denominator <= 0:
+            return None
+        return (n * sum_tv - sum_t * sum_v) / denominator
+
+    def stats(self, seconds: float = None) -> dict:
+        """Aggregates of a window
+
+        Args:
+            seconds (float, optional): Window length up to now. Defaults to None,
+                                       all the samples kept.
+
+        Returns:
+            dict: Samples, min, max, mean, slope (units per second) and last value,
+                  None without samples
+        """
+        times, values = self.window(seconds)
+        if not len(values):
+            return {
+                "samples": 0,
+                "min": None,
+                "max": None,
+                "mean": None,
+                "slope": None,
+                "last": None,
+            }
+        return {
+            "samples": len(values),
+            "min": min(values),
+            "max": max(values),
+            "mean": sum(values) / len(values),
+            "slope": self._slope(times, values),
+            "last": values[-1],
+        }
+
+    def to_numpy(
+        self, seconds: float = None, last: int = None
+    ) -> Tuple[object, object]:
+        """Window as NumPy arrays sharing the buffer memory. They change when new
+        samples arrive, copy them to keep them.
+
+        Args:
+            seconds (float, optional): Window length up to now. Defaults to None,
+                                       all the samples kept.
+            last (int, optional): At most this number of latest samples.
+                                  Defaults to None, no limit.
+
+        Raises:
+            PyProsimImportException: NumPy is not installed
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Timestamps and values
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise PyProsimImportException(e)
+
+        times, values = self.window(seconds, last)
+        return numpy.asarray(times), numpy.asarray(values)
+
+    def _latest(self) -> Tuple[int, int]:
+        """End index (exclusive) of the contiguous latest samples, and their number"""
+        count = self.count
+        if count <= self.capacity:
+            return count, count
+        return (count - 1) % self.capacity + self.capacity + 1, self.capacity
@@ -0,0 +1,364 @@
+import fnmatch
+import re
+from array import array
+from bisect import bisect_left
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .activation import GLOB_CHARACTERS
+from .catalog import Catalog
+
+_node_start = attrgetter("start")
+
+
+class NameIndex:
+    """Tree index over the dotted dataref names, for example
+    "aircraft.engines.1.thrust" is stored as aircraft -> engines -> 1 -> thrust.
+
+    Names are kept in hierarchical order, so every node of the tree covers a
+    contiguous range of names. Prefix and subtree queries are a slice of that
+    order and glob queries only walk the nodes matching the pattern.
+
+    Glob patterns are matched per segment: "*", "?" and "[...]" do not cross
+    dots, "**" matches any number of segments. A "**" followed by a plain
+    segment jumps to the nodes of that name within the subtree, and a segment
+    starting with plain text, e.g. "B_GATE_1?", only tests the children sharing
+    that text.
+
+    All queries accept the filters can_read, can_write and data_type. The data
+    type can be given by its SDK name ("System.Double") or short name ("Double").
+    Prefix and subtree queries read the filtered names from precomputed lists
+    instead of testing every dataref of the range.
+    """
+
+    class Node:
+        __slots__ = ("children", "position", "start", "end", "depth", "keys")
+
+        def __init__(self, start: int, depth: int):
+            # Child segment -> Node, in segment order. None for leaf nodes
+            self.children: Optional[Dict[str, "NameIndex.Node"]] = None
+            # Catalog position of the dataref named as this node, -1 if there is none
+            self.position = -1
+            # Range of the node subtree in the hierarchical order
+            self.start = start
+            self.end = start
+            # Number of segments of the node path
+            self.depth = depth
+            # Sorted child segments, built on the first wildcard query
+            self.keys: Optional[List[str]] = None
+
+    def __init__(self, catalog: Catalog):
+        """NameIndex class init
+
+        Args:
+            catalog (Catalog): Catalog to index
+        """
+        self._catalog = catalog
+        names = catalog.names
+        order = sorted(range(len(names)), key=lambda p: names[p].split("."))
+        # Names and catalog positions in hierarchical order
+        self._names = [names[p] for p in order]
+        self._positions = array("I", order)
+        self._root = self.Node(0, 0)
+        # Segment -> nodes of that name, in hierarchical order, for "**" queries
+        self._segments: Dict[str, List[NameIndex.Node]] = {}
+        # Filter key (see Catalog.filter_key) -> indexes in the hierarchical order
+        self._groups: Dict[Tuple[int, int], array] = {}
+
+        for i, name in enumerate(self._names):
+            node = self._root
+            node.end = i + 1
+            for segment in name.split("."):
+                if node.children is None:
+                    node.children = {}
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = self.Node(i, node.depth + 1)
+                    self._segments.setdefault(segment, []).append(child)
+                child.end = i + 1
+                node = child
+            node.position = order[i]
+            key = catalog.filter_key(order[i])
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = array("I")
+            group.append(i)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _find(self, path: str) -> Optional["NameIndex.Node"]:
+        node = self._root
+        if not path:
+            return node
+        for segment in path.split("."):
+            if node.children is None:
+                return None
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def _filter(
+        self,
+        positions: Iterable[int],
+        can_read: Optional[bool],
+        can_write: Optional[bool],
+        data_type: Optional[str],
+    ) -> List[str]:
+        names = self._catalog.names
+        if can_read is not None or can_write is not None or data_type is not None:
+            positions = self._catalog.select(positions, can_read, can_write, data_type)
+        return [names[p] for p in positions]
+
+    def _range(self, start: int, end: int, **filters) -> List[str]:
+        if not any(value is not None for value in filters.values()):
+            return self._names[start:end]
+        indexes = []
+        for key in self._catalog.select_keys(self._groups, **filters):
+            group = self._groups[key]
+            indexes += group[bisect_left(group, start) : bisect_left(group, end)]
+        # The groups are each in hierarchical order, sorting merges them
+        indexes.sort()
+        names = self._names
+        return [names[i] for i in indexes]
+
+    @staticmethod
+    def _sorted_keys(node: "NameIndex.Node") -> List[str]:
+        keys = node.keys
+        if keys is None:
+            # The children are created in hierarchical order, which sorts them
+            keys = node.keys = list(node.children)
+        return keys
+
+    def _matching_children(
+        self, node: "NameIndex.Node", segment: object
+    ) -> Iterable["NameIndex.Node"]:
+        """Children of a node matching a glob segment, see glob()"""
+        children = node.children
+        if children is None:
+            return ()
+        if segment == "*":
+            return children.values()
+        if isinstance(segment, str):
+            child = children.get(segment)
+            return () if child is None else (child,)
+        prefix, match = segment
+        if not prefix:
+            return [child for key, child in children.items() if match(key)]
+        keys = self._sorted_keys(node)
+        matches = []
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            key = keys[i]
+            if not key.startswith(prefix):
+                break
+            if match(key):
+                matches.append(children[key])
+        return matches
+
+    def _descendants(
+        self, node: "NameIndex.Node", segment: str
+    ) -> List["NameIndex.Node"]:
+        """Nodes named segment below a node, in hierarchical order"""
+        nodes = self._segments.get(segment)
+        if nodes is None:
+            return []
+        # A subtree covers a contiguous range, the ancestors of the node starting
+        # at the same index are excluded by their depth
+        start = bisect_left(nodes, node.start, key=_node_start)
+        end = bisect_left(nodes, node.end, key=_node_start)
+        return [child for child in nodes[start:end] if child.depth > node.depth]
+
+    def subtree(
+        self,
+        path: str,
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        data_type: Optional[str] = None,
+    ) -> List[str]:
+        """Datarefs under a node, including the node itself if it is a dataref
+
+        Args:
+            path (str): Node path, e.g. "aircraft.engines". Empty for the whole catalog.
+            can_read (bool, optional): Filter by read access. Defaults to None.
+            can_write (bool, optional): Filter by write access. Defaults to None.
+            data_type (str, optional): Filter by data type. Defaults to None.
+
+        Returns:
+            List[str]: Dataref names
+        """
+        node = self._find(path)
+        if node is None:
+            return []
+        return self._range(
+            node.start,
+            node.end,
+            can_read=can_read,
+            can_write=can_write,
+            data_type=data_type,
+        )
+
+    def prefix(
+        self,
+        prefix: str,
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        data_type: Optional[str] = None,
+    ) -> List[str]:
+        """Datarefs whose name starts with the given text
+
+        Args:
+            prefix (str): Name prefix, e.g. "aircraft.engines." or "system.gates.B_"
+            can_read (bool, optional): Filter by read access. Defaults to None.
+            can_write (bool, optional): Filter by write access. Defaults to None.
+            data_type (str, optional): Filter by data type. Defaults to None.
+
+        Returns:
+            List[str]: Dataref names
+        """
+        filters = dict(can_read=can_read, can_write=can_write, data_type=data_type)
+        parent, _, last = prefix.rpartition(".")
+        node = self._find(parent)
+        if node is None:
+            return []
+        if not last:
+            # Whole subtree but the node itself, which is always first in its range
+            start = node.start + 1 if node.position >= 0 else node.start
+            return self._range(start, node.end, **filters)
+        if node.children is None:
+            return []
+        # Children starting with the same text are contiguous in hierarchical order
+        keys = self._sorted_keys(node)
+        first = bisect_left(keys, last)
+        if first == len(keys) or not keys[first].startswith(last):
+            return []
+        end = first
+        while end < len(keys) and keys[end].startswith(last):
+            end += 1
+        return self._range(
+            node.children[keys[first]].start,
+            node.children[keys[end - 1]].end,
+            **filters,
+        )
+
+    def glob(
+        self,
+        pattern: str,
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        data_type: Optional[str] = None,
+    ) -> List[str]:
+        """Datarefs matching a glob pattern, e.g. "aircraft.engines.*.n1"
+
+        Args:
+            pattern (str): Glob pattern
+            can_read (bool, optional): Filter by read access. Defaults to None.
+            can_write (bool, optional): Filter by write access. Defaults to None.
+            data_type (str, optional): Filter by data type. Defaults to None.
+
+        Returns:
+            List[str]: Dataref names
+        """
+        segments = []
+        for segment in pattern.split("."):
+            if segment in ("*", "**") or GLOB_CHARACTERS.isdisjoint(segment):
+                segments.append(segment)
+            else:
+                # Plain text before the first wildcard, to narrow the children
+                prefix = re.match(r"[^*?\[]*", segment).group()
+                segments.append((prefix, re.compile(fnmatch.translate(segment)).match))
+
+        if "**" in segments:
+            positions = []
+            self._glob(self._root, segments, 0, positions)
+            # "**" can reach the same dataref through several paths
+            positions = list(dict.fromkeys(positions))
+        else:
+            # Walk the tree one level at a time, keeping the hierarchical order
+            nodes = [self._root]
+            for segment in segments:
+                matches = []
+                for node in nodes:
+                    matches += self._matching_children(node, segment)
+                nodes = matches
+            positions = [node.position for node in nodes if node.position >= 0]
+        return self._filter(positions, can_read, can_write, data_type)
+
+    def _glob(self, node: "NameIndex.Node", segments: list, i: int, positions: list):
+        if i == len(segments):
+            if node.position >= 0:
+                positions.append(node.position)
+            return
+        segment = segments[i]
+        if segment == "**":
+            if i + 1 == len(segments):
+                # The node and its whole subtree
+                positions += self._positions[node.start : node.end]
+                return
+            following = segments[i + 1]
+            if isinstance(following, str) and following not in ("*", "**"):
+                for child in self._descendants(node, following):
+                    self._glob(child, segments, i + 2, positions)
+                return
+            # Zero segments, or one segment and keep matching "**"
+            self._glob(node, segments, i + 1, positions)
+            if node.children is not None:
+                for child in node.children.values():
+                    self._glob(child, segments, i, positions)
+            return
+        for child in self._matching_children(node, segment):
+            self._glob(child, segments, i + 1, positions)
+
+    def regex(
+        self,
+        pattern: str,
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        data_type: Optional[str] = None,
+    ) -> List[str]:
+        """Datarefs matching a regular expression (re.search semantics). The
+        expression is tested on every name, prefer glob() or prefix() on large
+        catalogs when they can express the query.
+
+        Args:
+            pattern (str): Regular expression
+            can_read (bool, optional): Filter by read access. Defaults to None.
+            can_write (bool, optional): Filter by write access. Defaults to None.
+            data_type (str, optional): Filter by data type. Defaults to None.
+
+        Returns:
+            List[str]: Dataref names
+        """
+        search = re.compile(pattern).search
+        positions = [
+            self._positions[i] for i, name in enumerate(self._names) if search(name)
+        ]
+        return self._filter(positions, can_read, can_write, data_type)
+
+    def children(self, path: str = "") -> List[str]:
+        """Paths of the direct children of a node
+
+        Args:
+            path (str, optional): Node path, e.g. "aircraft". Defaults to the root.
+
+        Returns:
+            List[str]: Child paths, e.g. ["aircraft.engines", "aircraft.fuel"]
+        """
+        node = self._find(path)
+        if node is None or node.children is None:
+            return []
+        if not path:
+            return list(node.children)
+        return [f"{path}.{segment}" for segment in node.children]
+
+    def is_dataref(self, path: str) -> bool:
+        """Check whether a node is a dataref (as opposed to only a branch)
+
+        Args:
+            path (str): Node path
+
+        Returns:
+            bool: True if a dataref has this name
+        """
+        node = self._find(path)
+        return node is not None and node.position >= 0
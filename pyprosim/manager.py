@@ -0,0 +1,360 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .catalog import CatalogPool
+from .exceptions import PyProsimDatarefException
+from .filters import ChangeFilter
+from .pyprosim import PyProsim
+from .subscription import Subscription
+from .supervisor import ReconnectSupervisor
+
+# Separates the node name from the dataref name, e.g. "ios:aircraft.engines.1.n1"
+NODE_SEPARATOR = ":"
+
+
+class _EventCounter:
+    """Change listener counting the events of one dataref for a node, while one of
+    the subscriptions made through the manager is alive"""
+
+    __slots__ = ("node", "dataref", "subscriptions")
+
+    def __init__(self, node: "ProsimNode", dataref: object):
+        self.node = node
+        # Dataref object the listener is attached to, replaced on catalog changes
+        self.dataref = dataref
+        self.subscriptions: List[Subscription] = []
+
+    @property
+    def active(self) -> bool:
+        return any(subscription.active for subscription in self.subscriptions)
+
+    def attach(self) -> None:
+        self.dataref._listeners = self.dataref._listeners + (self,)
+
+    def detach(self) -> None:
+        self.dataref._listeners = tuple(
+            listener for listener in self.dataref._listeners if listener is not self
+        )
+
+    def __call__(self, name: str, value: object):
+        if self.active:
+            self.node.events += 1
+        else:
+            self.detach()
+
+
+class ProsimNode:
+    """One ProSim instance of a ProsimManager, with its own PyProsim connection,
+    reconnect supervisor and throughput counters"""
+
+    def __init__(self, name: str, ip_addr: str, prosim: PyProsim, **supervisor_options):
+        """ProsimNode class init
+
+        Args:
+            name (str): Node name, e.g. "ios"
+            ip_addr (str): Host IP address when ProSim is running
+            prosim (PyProsim): Connection to the node
+            **supervisor_options: Backoff options, see ReconnectSupervisor
+        """
+        self.name = name
+        self.ip_addr = ip_addr
+        self.prosim = prosim
+        self.supervisor = ReconnectSupervisor(prosim, ip_addr, **supervisor_options)
+        # Counters of the calls made through the manager, and of the change events
+        # of the datarefs subscribed through it
+        self.reads = 0
+        self.writes = 0
+        self.events = 0
+        # Event counters of the datarefs subscribed through the manager
+        self._counters: Dict[str, _EventCounter] = {}
+        self._lock = threading.Lock()
+        # Counters and time of the previous stats() call, for the rates
+        self._previous: Tuple[float, int, int, int] = (time.monotonic(), 0, 0, 0)
+
+    @property
+    def connected(self) -> bool:
+        return self.prosim.connected
+
+    def count_events(self, subscription: Subscription) -> None:
+        """Count the change events of a subscribed dataref, once per event whatever
+        the number of subscriptions. The counting stops when the subscriptions
+        counted are released.
+
+        Args:
+            subscription (Subscription): Subscription made through the manager
+        """
+        with self._lock:
+            self._release_counters()
+            counter = self._counters.get(subscription.name)
+            if counter is None or counter.dataref is not subscription.dataref:
+                # The dataref object is replaced when its catalog entry changes
+                if counter is not None:
+                    counter.detach()
+                counter = _EventCounter(self, subscription.dataref)
+                counter.attach()
+                self._counters[subscription.name] = counter
+            if subscription not in counter.subscriptions:
+                counter.subscriptions.append(subscription)
+
+    def _release_counters(self) -> None:
+        """Detach the counters whose subscriptions were all released. The caller
+        holds the lock."""
+        for name, counter in list(self._counters.items()):
+            if not counter.active:
+                counter.detach()
+                del self._counters[name]
+
+    def stats(self) -> dict:
+        """Throughput counters and connection state
+
+        Returns:
+            dict: Reads, writes and callback events in total and per second since the
+                  previous call, plus the reconnection stats
+        """
+        with self._lock:
+            self._release_counters()
+        now = time.monotonic()
+        reads, writes, events = self.reads, self.writes, self.events
+        then, previous_reads, previous_writes, previous_events = self._previous
+        self._previous = (now, reads, writes, events)
+        elapsed = now - then
+        return {
+            "reads": reads,
+            "writes": writes,
+            "events": events,
+            "read_rate": (reads - previous_reads) / elapsed if elapsed > 0 else 0.0,
+            "write_rate": (writes - previous_writes) / elapsed if elapsed > 0 else 0.0,
+            "event_rate": (events - previous_events) / elapsed if elapsed > 0 else 0.0,
+            "connection": self.supervisor.stats(),
+        }
+
+
+class ProsimManager:
+    """Holds the connections to several ProSim instances of one simulator, e.g.
+    the main sim, the IOS and a second seat.
+
+    Every node has its own PyProsim, connected and reconnected by its own
+    ReconnectSupervisor thread, so a node going down does not delay the others.
+    Nodes serving structurally identical catalogs share one parsed catalog
+    through a CatalogPool. Datarefs are addressed across nodes as
+    "<node>:<dataref>", e.g. "ios:aircraft.engines.1.n1".
+    """
+
+    def __init__(self, catalog_pool: CatalogPool = None):
+        """ProsimManager class init
+
+        Args:
+            catalog_pool (CatalogPool, optional): Catalogs shared by the nodes.
+                                                  Defaults to None, a new pool.
+        """
+        self.catalog_pool = catalog_pool if catalog_pool is not None else CatalogPool()
+        self.nodes: Dict[str, ProsimNode] = {}
+        self._started = False
+        self._lock = threading.Lock()
+
+    def add_node(
+        self,
+        name: str,
+        ip_addr: str,
+        prosimsdk_path: Path = None,
+        supervisor_options: dict = None,
+        **prosim_options,
+    ) -> PyProsim:
+        """Add a ProSim instance. It is connected by start(), or right away if the
+        manager is already started.
+
+        Args:
+            name (str): Node name, used as prefix of its dataref names
+            ip_addr (str): Host IP address when ProSim is running
+            prosimsdk_path (Path, optional): Path to prosim SDK DLL library. Not used when
+                                             a backend is given. Defaults to None.
+            supervisor_options (dict, optional): Backoff options, see ReconnectSupervisor.
+                                                 Defaults to None.
+            **prosim_options: Other PyProsim options, e.g. backend or dispatcher
+
+        Raises:
+            PyProsimDatarefException: The node name is already used or not valid
+
+        Returns:
+            PyProsim: Connection to the node
+        """
+        if not name or NODE_SEPARATOR in name:
+            raise PyProsimDatarefException(f'Invalid node name "{name}"')
+        with self._lock:
+            if name in self.nodes:
+                raise PyProsimDatarefException(f'Node "{name}" already exists')
+            prosim = PyProsim(
+                prosimsdk_path, catalog_pool=self.catalog_pool, **prosim_options
+            )
+            node = ProsimNode(name, ip_addr, prosim, **(supervisor_options or {}))
+            self.nodes[name] = node
+            if self._started:
+                node.supervisor.start()
+        return prosim
+
+    def node(self, name: str) -> ProsimNode:
+        """Get a node
+
+        Args:
+            name (str): Node name
+
+        Raises:
+            PyProsimDatarefException: Unknown node
+
+        Returns:
+            ProsimNode: Node
+        """
+        node = self.nodes.get(name)
+        if node is None:
+            raise PyProsimDatarefException(f'Node "{name}" does not exist')
+        return node
+
+    def start(self) -> "ProsimManager":
+        """Connect every node, each in its own supervisor thread
+
+        Returns:
+            ProsimManager: This manager
+        """
+        with self._lock:
+            self._started = True
+            for node in self.nodes.values():
+                node.supervisor.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop supervising the connections. The connections are not closed."""
+        with self._lock:
+            self._started = False
+            nodes = list(self.nodes.values())
+        for node in nodes:
+            node.supervisor.stop()
+
+    def __enter__(self) -> "ProsimManager":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """Wait until every node is connected
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: True if all the nodes are connected
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for node in list(self.nodes.values()):
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            if not node.supervisor.wait_connected(remaining):
+                return False
+        return True
+
+    def resolve(self, name: str) -> Tuple[ProsimNode, str]:
+        """Split a namespaced dataref name
+
+        Args:
+            name (str): "<node>:<dataref>" name
+
+        Raises:
+            PyProsimDatarefException: Name without node or unknown node
+
+        Returns:
+            Tuple[ProsimNode, str]: Node and dataref name
+        """
+        node_name, separator, dataref_name = name.partition(NODE_SEPARATOR)
+        if not separator:
+            raise PyProsimDatarefException(
+                f'Dataref "{name}" has no node, use "<node>{NODE_SEPARATOR}<dataref>"'
+            )
+        return self.node(node_name), dataref_name
+
+    def get_value(self, name: str) -> object:
+        """Get a dataref value
+
+        Args:
+            name (str): "<node>:<dataref>" name
+
+        Raises:
+            PyProsimDatarefException: Unknown node or dataref
+
+        Returns:
+            object: Dataref value
+        """
+        node, dataref_name = self.resolve(name)
+        node.reads += 1
+        return node.prosim.get_value(dataref_name)
+
+    def set_value(self, name: str, value: object) -> None:
+        """Set a dataref value
+
+        Args:
+            name (str): "<node>:<dataref>" name
+            value (object): Value to set dataref with, see PyProsim.set_value
+
+        Raises:
+            PyProsimDatarefException: Unknown node or dataref
+        """
+        node, dataref_name = self.resolve(name)
+        node.writes += 1
+        node.prosim.set_value(dataref_name, value)
+
+    def subscribe(
+        self,
+        name: str,
+        interval: int,
+        on_change_callback: Callable = None,
+        filters: Iterable[ChangeFilter] = None,
+    ) -> Subscription:
+        """Subscribe to a dataref, see PyProsim.activate_dataref. The subscription is
+        restored by the node on reconnection.
+
+        Args:
+            name (str): "<node>:<dataref>" name
+            interval (int): How frequent prosim should send this dataref in miliseconds
+            on_change_callback (Callable, optional): Called with the SDK dataref on changes.
+                                                     Defaults to None.
+            filters (Iterable[ChangeFilter], optional): Change filters. Defaults to None.
+
+        Raises:
+            PyProsimDatarefException: Unknown node or dataref
+
+        Returns:
+            Subscription: Subscription, release it with cancel()
+        """
+        node, dataref_name = self.resolve(name)
+        subscription = node.prosim.activate_dataref(
+            dataref_name, interval, on_change_callback, filters
+        )
+        # Counted by a listener rather than by wrapping the callback, so activating
+        # again with the same callback still shares the subscription
+        node.count_events(subscription)
+        return subscription
+
+    def subscriptions(self) -> List[Tuple[str, Subscription]]:
+        """Live subscriptions of every node
+
+        Returns:
+            List[Tuple[str, Subscription]]: Node name and subscription
+        """
+        return [
+            (name, subscription)
+            for name, node in list(self.nodes.items())
+            for subscription in node.prosim.subscriptions()
+        ]
+
+    def stats(self) -> dict:
+        """Per node throughput counters and the catalog sharing
+
+        Returns:
+            dict: Stats per node name (see ProsimNode.stats) and the catalog pool stats
+        """
+        return {
+            "nodes": {name: node.stats() for name, node in list(self.nodes.items())},
+            "catalogs": self.catalog_pool.stats(),
+        }
@@ -0,0 +1,294 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence
+
+# Histogram upper bounds in seconds, from 1 us to 10 s
+DEFAULT_BUCKETS = tuple(
+    base * 10.0**exponent for exponent in range(-6, 1) for base in (1.0, 2.5, 5.0)
+) + (10.0,)
+
+
+class Histogram:
+    """Histogram of durations with fixed buckets, Prometheus style"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Histogram class init
+
+        Args:
+            buckets (Sequence[float], optional): Sorted bucket upper bounds in seconds.
+                                                 Defaults to 1 us to 10 s.
+        """
+        self.buckets = tuple(buckets)
+        # One more bucket for the values above the last bound (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile, the upper bound of the bucket holding it
+
+        Args:
+            q (float): Quantile, e.g. 0.99
+
+        Returns:
+            float: Estimated value, 0.0 without observations
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for bound, count in zip(self.buckets, self.counts):
+                seen += count
+                if seen >= rank:
+                    return min(bound, self.max)
+            return self.max
+
+    def stats(self) -> dict:
+        """Histogram summary
+
+        Returns:
+            dict: Count, mean, max, p50 and p99 in seconds
+        """
+        count = self.count
+        return {
+            "count": count,
+            "mean": self.sum / count if count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Metrics:
+    """Instrumentation of a PyProsim instance, enabled with PyProsim(metrics=True).
+
+    - dataref updates: count of onDataChange events and update rate per dataref
+    - callback: execution time of the subscription callbacks
+    - event age: time from the SDK event to the callback start, which includes
+      the dispatcher queue
+    - bridge calls: count and latency of get_value and set_value
+    - catalog parse: duration of the catalog download and parse on connection
+
+    Subscriptions created before the metrics are enabled are not measured.
+    """
+
+    BRIDGE_CALLS = ("get_value", "set_value")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Metrics class init
+
+        Args:
+            buckets (Sequence[float], optional): Histogram bucket upper bounds in seconds.
+                                                 Defaults to 1 us to 10 s.
+        """
+        # Dataref name -> [updates, first update, last update] (perf_counter)
+        self.updates: Dict[str, List] = {}
+        self.callback_time = Histogram(buckets)
+        self.event_age = Histogram(buckets)
+        self.bridge_calls = {name: Histogram(buckets) for name in self.BRIDGE_CALLS}
+        self.catalog_parse = Histogram(buckets)
+        self._lock = threading.Lock()
+
+    def update(self, name: str) -> None:
+        """Count an onDataChange event"""
+        now = time.perf_counter()
+        with self._lock:
+            entry = self.updates.get(name)
+            if entry is None:
+                self.updates[name] = [1, now, now]
+            else:
+                entry[0] += 1
+                entry[2] = now
+
+    def wrap_callback(self, name: str, callback: Callable) -> Callable:
+        """Measure the execution time and the event age of a subscription callback
+
+        Args:
+            name (str): Dataref name
+            callback (Callable): Subscription callback
+
+        Returns:
+            Callable: Measured callback
+        """
+        updates = self.updates
+        callback_time = self.callback_time.observe
+        event_age = self.event_age.observe
+        perf_counter = time.perf_counter
+
+        def measured(*args):
+            start = perf_counter()
+            entry = updates.get(name)
+            if entry is not None:
+                event_age(start - entry[2])
+            try:
+                return callback(*args)
+            finally:
+                callback_time(perf_counter() - start)
+
+        return measured
+
+    def stats(self) -> dict:
+        """Snapshot of the metrics
+
+        Returns:
+            dict: Updates and rate (per second) per dataref, and the summary of the
+                  callback, event age, bridge call and catalog parse histograms
+        """
+        with self._lock:
+            updates = {name: list(entry) for name, entry in self.updates.items()}
+        datarefs = {}
+        for name, (count, first, last) in updates.items():
+            rate = (count - 1) / (last - first) if last > first else 0.0
+            datarefs[name] = {"updates": count, "rate": rate}
+        return {
+            "datarefs": datarefs,
+            "callback_time": self.callback_time.stats(),
+            "event_age": self.event_age.stats(),
+            "bridge_calls": {
+                name: histogram.stats() for name, histogram in self.bridge_calls.items()
+            },
+            "catalog_parse": self.catalog_parse.stats(),
+        }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics text
+        """
+        lines = [
+            "# HELP pyprosim_dataref_updates_total onDataChange events per dataref",
+            "# TYPE pyprosim_dataref_updates_total counter",
+        ]
+        with self._lock:
+            updates = [(name, entry[0]) for name, entry in self.updates.items()]
+        for name, count in updates:
+            lines.append(
+                f'pyprosim_dataref_updates_total{{dataref="{_escape(name)}"}} {count}'
+            )
+        _histogram_lines(
+            lines,
+            "pyprosim_callback_seconds",
+            "Dataref callback execution time",
+            [("", self.callback_time)],
+        )
+        _histogram_lines(
+            lines,
+            "pyprosim_event_age_seconds",
+            "Time from the SDK event to the callback start",
+            [("", self.event_age)],
+        )
+        _histogram_lines(
+            lines,
+            "pyprosim_bridge_call_seconds",
+            "Latency of the get_value and set_value SDK calls",
+            [(f'call="{name}"', h) for name, h in self.bridge_calls.items()],
+        )
+        _histogram_lines(
+            lines,
+            "pyprosim_catalog_parse_seconds",
+            "Catalog download and parse duration",
+            [("", self.catalog_parse)],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(lines: List[str], metric: str, description: str, histograms: list):
+    lines.append(f"# HELP {metric} {description}")
+    lines.append(f"# TYPE {metric} histogram")
+    for labels, histogram in histograms:
+        prefix = labels + "," if labels else ""
+        with histogram._lock:
+            counts = list(histogram.counts)
+            count = histogram.count
+            total = histogram.sum
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{metric}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{metric}_sum{suffix} {total}")
+        lines.append(f"{metric}_count{suffix} {count}")
+
+
+class MetricsExporter:
+    """Serves the metrics in the Prometheus text format over HTTP, on /metrics"""
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9108):
+        """MetricsExporter class init
+
+        Args:
+            metrics (Metrics): Metrics to serve, e.g. PyProsim.metrics
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on. Defaults to 9108.
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: threading.Thread = None
+
+    def start(self) -> "MetricsExporter":
+        """Start serving in a background thread
+
+        Returns:
+            MetricsExporter: This exporter
+        """
+        # Imported here, http.server is slow to import and rarely needed
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        # The actual port when port 0 was given
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pyprosim-metrics", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "MetricsExporter":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,22 +1,37 @@
-import clr, System
+import logging
+import threading
+import time
 from pathlib import Path
-from typing import Callable, Dict
-
-
-class PyProsimDLLException(Exception):
-    pass
-
-
-class PyProsimImportException(Exception):
-    pass
-
-
-class PyProsimTypeException(Exception):
-    pass
-
-
-class PyProsimDatarefException(Exception):
-    pass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple, Union
+
+from .activation import ActivationReport, ActivationRequest, is_pattern
+from .backend import ClrBackend, PyProsimBackend
+from .catalog import Catalog, CatalogPool, DataTypeTable
+from .exceptions import (
+    PyProsimDatarefException,
+    PyProsimDLLException,
+    PyProsimImportException,
+    PyProsimTypeException,
+)
+from .filters import ChangeFilter
+from .handle import DatarefHandle
+from .index import NameIndex
+from .subscription import Subscription
+
+# The optional features are imported when first used, see README (Import Time)
+if TYPE_CHECKING:
+    from .adaptive import AdaptiveController, AdaptiveInterval
+    from .cache import CatalogCache
+    from .derived import DerivedDataref, DerivedGraph
+    from .dispatcher import CallbackDispatcher
+    from .history import History
+    from .metrics import Metrics
+    from .scheduler import FrameGroup, FrameScheduler
+    from .snapshot import RestoreProgress, RestoreReport, Snapshot
+    from .trace import Tracer
+    from .writer import WriteFlusher, WritePipeline
+
+logger = logging.getLogger(__name__)
 
 
 class PyProsim:
@@ -26,6 +41,23 @@ class PyProsim:
         dataref object.
         """
 
+        __slots__ = (
+            "_parent",
+            "_name",
+            "_description",
+            "_data_type",
+            "_data_unit",
+            "_can_read",
+            "_can_write",
+            "_dataref_obj",
+            "_interval",
+            "_active",
+            "_writer",
+            "_subscriptions",
+            "_listeners",
+            "_adaptive",
+        )
+
         def __init__(
             self,
             parent: "PyProsim",
@@ -43,7 +75,8 @@ class PyProsim:
                 name (str): Dataref name
                 description (str): Dataref description
                 data_type (object): Dataref data type. This follows the C# data type,
-                                    for example: System.Double or System.Int32
+                                    for example: System.Double or System.Int32.
+                                    None when the data type is unknown.
                 data_unit (str): No information about what Prosim tries to represent with this.
                 can_read (bool): Dataref is readable
                 can_write (bool): Dataref is writable
@@ -61,6 +94,14 @@ class PyProsim:
             self._interval = 0
             # Flag to indicate that this PyProsim dataref has been initialized.
             self._active = False
+            # Optional write pipeline (deadband, rate limit and coalescing)
+            self._writer: "WritePipeline" = None
+            # Consumers sharing the SDK dataref object
+            self._subscriptions: Tuple[Subscription, ...] = ()
+            # Internal change listeners called with (name, value), e.g. recorders
+            self._listeners: Tuple[Callable, ...] = ()
+            # Interval tuned by the adaptive controller, None for the subscription ones
+            self._adaptive: "AdaptiveInterval" = None
 
         @property
         def name(self) -> str:
@@ -123,6 +164,20 @@ class PyProsim:
                                 'cast' is not possible an exception will
                                 be raised.
 
+            Raises:
+                PyProsimDatarefException: This dataref cannot be written
+                PyProsimTypeException: The given value type cannot be casted to
+                                       the C# type.
+            """
+            # Writes go through the write pipeline when one is configured
+            if self._writer is not None:
+                self._writer.write(value)
+            else:
+                self._send(self._cast(value))
+
+        def _cast(self, value: object) -> object:
+            """Check the dataref can be written and 'cast' the value to its C# type
+
             Raises:
                 PyProsimDatarefException: This dataref cannot be written
                 PyProsimTypeException: The given value type cannot be casted to
@@ -132,138 +187,516 @@ class PyProsim:
                 raise PyProsimDatarefException(
                     f'Dataref "{self.name}" is not writable!'
                 )
+            if self._data_type is None:
+                raise PyProsimTypeException(
+                    f'Dataref "{self.name}" data type is unknown'
+                )
+            try:
+                return self._data_type(value)
+            except self._parent.backend.value_exceptions as e:
+                raise PyProsimTypeException(e)
+
+        def _send(self, value: object):
+            """Write an already 'casted' value to Prosim
+
+            Raises:
+                PyProsimTypeException: The SDK rejected the value
+            """
             try:
-                self._dataref_obj.value = self._data_type(value)
-            except System.AggregateException as e:
+                self._dataref_obj.value = value
+            except self._parent.backend.value_exceptions as e:
                 raise PyProsimTypeException(e)
 
-        def activate(self, interval: int, on_change_callback: Callable = None):
+        def activate(
+            self,
+            interval: int,
+            on_change_callback: Callable = None,
+            filters: Iterable[ChangeFilter] = None,
+        ) -> Subscription:
             """Dataref activate. This activation means that the prosim dataref
             object is being instantiated, hence prosim has knowledge that we
             want to read or write this dataref.
 
+            Every activation adds a subscription. The subscriptions share one prosim
+            dataref object, activated at the smallest interval requested.
+
             Args:
                 interval (int): How frequent Prosim should send this dataref to us (in milliseconds)
                 on_change_callback (Callable, optional): Method to be called when this dataref changes.
                                                          Defaults to None.
+                filters (Iterable[ChangeFilter], optional): Filters deciding which changes are
+                                                            passed to on_change_callback.
+                                                            Defaults to None.
+
+            Returns:
+                Subscription: Subscription to release with deactivate()
             """
-            # Create Prosim dataref object
-            dr = DataRef(self.name, interval, self._parent.sdk)
+            tracer = self._parent.tracer
+            if tracer is None:
+                return self._activate(interval, on_change_callback, filters)
+            with tracer.span(tracer.ACTIVATE, self._name):
+                return self._activate(interval, on_change_callback, filters)
 
-            # Set callback on change if needed
-            if on_change_callback is not None:
-                dr.onDataChange += on_change_callback
+        def _activate(
+            self,
+            interval: int,
+            on_change_callback: Callable,
+            filters: Iterable[ChangeFilter],
+        ) -> Subscription:
+            with self._parent._subscription_lock:
+                # The same request again only takes another reference
+                if not filters:
+                    for subscription in self._subscriptions:
+                        if (
+                            subscription.callback is on_change_callback
+                            and subscription.interval == interval
+                            and subscription.filters is None
+                        ):
+                            subscription.refs += 1
+                            return subscription
+
+                subscription = Subscription(self, interval, on_change_callback, filters)
+                self._subscriptions = self._subscriptions + (subscription,)
+                self._update_sdk_dataref()
+                return subscription
+
+        def deactivate(self, subscription: Subscription = None) -> None:
+            """Release a subscription, or all of them. The prosim dataref object is
+            released with the last subscription.
+
+            Args:
+                subscription (Subscription, optional): Subscription returned by activate().
+                                                       Defaults to None, all subscriptions.
+            """
+            with self._parent._subscription_lock:
+                if subscription is None:
+                    for subscription in self._subscriptions:
+                        subscription.refs = 0
+                elif subscription in self._subscriptions:
+                    subscription.refs -= 1
+                else:
+                    return
+                self._subscriptions = tuple(
+                    s for s in self._subscriptions if s.refs > 0
+                )
+                self._update_sdk_dataref()
+
+        def _update_sdk_dataref(self):
+            """Create, replace or release the prosim dataref object to serve the
+            current subscriptions"""
+            old = self._dataref_obj
+            if not self._subscriptions:
+                self._dataref_obj = None
+                self._interval = 0
+                self._active = False
+                if old is not None:
+                    self._release_sdk_dataref(old)
+                return
+
+            if self._adaptive is not None:
+                interval = self._adaptive.interval
+            else:
+                # The smallest interval requested, 0 (no updates) only if none asks for updates
+                intervals = [s.interval for s in self._subscriptions if s.interval > 0]
+                interval = min(intervals) if intervals else 0
+            if old is not None and interval == self._interval:
+                return
+
+            # Create Prosim dataref object
+            dr = self._parent.backend.create_dataref(
+                self.name, interval, self._parent.sdk
+            )
+            dr.onDataChange += self._on_data_change
 
             # Store dataref object
             self._dataref_obj = dr
             self._interval = interval
             self._active = True
+            if old is not None:
+                self._release_sdk_dataref(old)
+
+        def _reactivate(self):
+            """Create a new prosim dataref object for the subscriptions after a
+            reconnection, the previous one belongs to the lost connection"""
+            old = self._dataref_obj
+            if old is not None:
+                self._release_sdk_dataref(old)
+            self._dataref_obj = None
+            self._update_sdk_dataref()
+
+        def _release_sdk_dataref(self, dr: object):
+            dr.onDataChange -= self._on_data_change
+            self._parent.backend.release_dataref(dr)
+
+        def _on_data_change(self, dataref: object):
+            """SDK change handler calling the internal change listeners, then the
+            subscriptions"""
+            metrics = self._parent.metrics
+            if metrics is not None:
+                metrics.update(self._name)
+            tracer = self._parent.tracer
+            if tracer is not None:
+                tracer.record(
+                    tracer.EVENT, tracer.intern(self._name), time.perf_counter()
+                )
+            listeners = self._listeners
+            if listeners:
+                value = dataref.value
+                for listener in listeners:
+                    listener(self._name, value)
+            interval = self._interval
+            for subscription in self._subscriptions:
+                subscription._deliver(dataref, interval)
 
     def __init__(
         self,
-        prosimsdk_path: Path,
+        prosimsdk_path: Path = None,
         on_connect_callback: Callable = None,
         on_disconnect_callback: Callable = None,
+        backend: PyProsimBackend = None,
+        catalog_cache: Union[Path, "CatalogCache"] = None,
+        dispatcher: "CallbackDispatcher" = None,
+        metrics: bool = False,
+        tracer: "Tracer" = None,
+        catalog_pool: CatalogPool = None,
     ):
         """PyProsim class init
 
         Args:
-            prosimsdk_path (Path): Path to prosim SDK DLL library
+            prosimsdk_path (Path): Path to prosim SDK DLL library. Not used when
+                                   a backend is given.
             on_connect_callback (Callable, optional): Callable object which will be called once we
                                                       are connected to prosim. Defaults to None.
             on_disconnect_callback (Callable, optional): Callable object which will be called once
                                                          prosim disconnects. Defaults to None.
+            backend (PyProsimBackend, optional): SDK backend implementation. Defaults to
+                                                 ClrBackend loading the DLL in prosimsdk_path.
+            catalog_cache (Union[Path, CatalogCache], optional): Cache file of the dataref
+                                                                 catalog, or a CatalogCache.
+                                                                 Defaults to None (no cache).
+            dispatcher (CallbackDispatcher, optional): Run the dataref change callbacks through
+                                                       this dispatcher instead of the SDK event
+                                                       thread. Defaults to None.
+            metrics (bool, optional): Collect metrics on updates, callbacks and SDK calls,
+                                      see stats(). Defaults to False.
+            tracer (Tracer, optional): Record the spans of the connection, activations,
+                                       events, callbacks and writes. Defaults to None.
+            catalog_pool (CatalogPool, optional): Share the parsed catalog with the other
+                                                  PyProsim using this pool and connected
+                                                  to an identical catalog. Defaults to None.
 
         Raises:
             PyProsimDLLException: CLR space could not be loaded
             PyProsimImportException: Prosim components could not be imported
         """
 
-        # Load CLR namespace
-        try:
-            clr.AddReference(str(prosimsdk_path))
-        except Exception as e:
-            raise PyProsimDLLException(e)
-
-        # Finally import the required classes
-        # Note the global definition is to make DataRef import available
-        # to the rest of this implementation
-        try:
-            global DataRef
-            from ProSimSDK import ProSimConnect, DataRef
-        except Exception as e:
-            raise PyProsimImportException(e)
+        # Load the SDK implementation, by default the ProSim SDK DLL
+        if backend is None:
+            backend = ClrBackend(prosimsdk_path)
+        self.backend = backend
 
         # Create Prosim SDK class
-        self.sdk = ProSimConnect()
+        self.sdk = self.backend.create_sdk()
 
         # Set callbacks if required
         self._on_connect_cb = on_connect_callback
+        self._on_disconnect_cb = on_disconnect_callback
         self.sdk.onConnect += self._on_connect
-        if on_disconnect_callback is not None:
-            self.sdk.onDisconnect += on_disconnect_callback
+        self.sdk.onDisconnect += self._on_disconnect
+
+        # Connection state, see ReconnectSupervisor
+        self._connected = threading.Event()
+        self._disconnected = threading.Event()
+        self._disconnected.set()
+        # Timings of the last connection, see _on_connect
+        self.connection_stats: dict = {}
+
+        # Prosim dataref database. The dictionary only holds the PyProsim datarefs
+        # objects requested so far, they are created from the catalog on demand.
+        self._catalog = Catalog(DataTypeTable(self.backend))
+        self._index = NameIndex(self._catalog)
+        self._datarefs: Dict[str, PyProsim.Dataref] = {}
+        # Digest of the catalog, to detect an unchanged catalog on reconnection
+        self._catalog_digest: bytes = None
+        self._catalog_pool = catalog_pool
+
+        # Serializes the changes to the dataref subscriptions
+        self._subscription_lock = threading.RLock()
+
+        # Optional queue between the SDK events and the dataref callbacks
+        self.dispatcher = dispatcher
+
+        # Optional instrumentation, None when disabled
+        self.metrics: "Metrics" = None
+        if metrics:
+            from .metrics import Metrics
+
+            self.metrics = Metrics()
+        self.tracer = tracer
 
-        # Init main dictionary which will hold Prosim datarefs objects
-        self._datarefs: Dict[PyProsim.Dataref] = {}
+        # Thread sending the writes held back by the write pipelines
+        self._write_flusher: "WriteFlusher" = None
+
+        # Derived datarefs, created with the first one
+        self._derived: "DerivedGraph" = None
+
+        # Fixed rate frame groups, created with the first one
+        self._scheduler: "FrameScheduler" = None
+
+        # Tuner of the adaptive intervals, created with the first one
+        self._adaptive: "AdaptiveController" = None
+
+        # Sample histories of numeric datarefs, see keep_history
+        self._histories: Dict[str, "History"] = {}
+
+        # Optional on-disk cache of the dataref catalog
+        self._catalog_cache = None
+        if catalog_cache is not None:
+            from .cache import CatalogCache
+
+            if not isinstance(catalog_cache, CatalogCache):
+                catalog_cache = CatalogCache(catalog_cache)
+            self._catalog_cache = catalog_cache
 
     def _on_connect(self):
         """Callback when PyProsim gets a connection with Prosim software"""
         # Read dataref database from Prosim software
-        self._parse_supported_datarefs()
+        start = time.perf_counter()
+        catalog_reused, dropped = self._parse_supported_datarefs()
+        end = time.perf_counter()
+        catalog_time = end - start
+        if self.metrics is not None:
+            self.metrics.catalog_parse.observe(catalog_time)
+        if self.tracer is not None:
+            self.tracer.record(self.tracer.CATALOG, 0, start, end)
+        # Activate again the subscriptions made before a reconnection
+        start = time.perf_counter()
+        restored = self._restore_subscriptions()
+        self.connection_stats = {
+            "catalog": catalog_time,
+            "catalog_reused": catalog_reused,
+            "resubscribe": time.perf_counter() - start,
+            "restored": restored,
+            "dropped": dropped,
+        }
+        self._disconnected.clear()
+        self._connected.set()
         # Call external callback if has been defined
         if self._on_connect_cb is not None:
             self._on_connect_cb()
 
-    def _parse_supported_datarefs(self):
-        """Request and parse Prosim dataref database"""
-        self._datarefs: Dict[PyProsim.Dataref] = {}
-        for dr in self.sdk.getDataRefDescriptions():
-            # Parse data type
-            if dr.DataType == "System.Boolean":
-                data_type = System.Boolean
-            elif dr.DataType == "System.Byte":
-                data_type = System.Byte
-            elif dr.DataType == "SystemSByte":
-                data_type = System.SByte
-            elif dr.DataType == "System.Char":
-                data_type = System.Char
-            elif dr.DataType == "System.Decimal":
-                data_type = System.Decimal
-            elif dr.DataType == "System.Double":
-                data_type = System.Double
-            elif dr.DataType == "System.Single":
-                data_type = System.Single
-            elif dr.DataType == "System.Int32":
-                data_type = System.Int32
-            elif dr.DataType == "System.UInt32":
-                data_type = System.UInt32
-            elif dr.DataType == "System.IntPtr":
-                data_type = System.IntPtr
-            elif dr.DataType == "System.UIntPtr":
-                data_type = System.UIntPtr
-            elif dr.DataType == "System.Int64":
-                data_type = System.Int64
-            elif dr.DataType == "System.UInt64":
-                data_type = System.UInt64
-            elif dr.DataType == "System.Int16":
-                data_type = System.Int16
-            elif dr.DataType == "System.UInt16":
-                data_type = System.UInt16
-            elif dr.DataType == "System.String":
-                data_type = System.String
+    def _on_disconnect(self):
+        """Callback when PyProsim loses the connection with Prosim software"""
+        self._connected.clear()
+        self._disconnected.set()
+        if self._on_disconnect_cb is not None:
+            self._on_disconnect_cb()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def _parse_supported_datarefs(self) -> Tuple[bool, int]:
+        """Request and parse Prosim dataref database. On reconnection, the current
+        catalog and datarefs are kept if the catalog did not change.
+
+        Returns:
+            Tuple[bool, int]: Whether the current catalog was kept, and the number of
+                              subscribed datarefs no longer in the catalog
+        """
+        cache = self._catalog_cache
+        descriptions = None
+        if cache is not None:
+            key = cache.make_key(self.get_info(), self.backend.version)
+            descriptions = cache.load(key)
+            revalidate = descriptions is not None and cache.revalidate
+        if descriptions is None:
+            descriptions = list(self.sdk.getDataRefDescriptions())
+            revalidate = False
+            if cache is not None:
+                cache.store(key, descriptions)
+
+        # The digest is only worth its cost to key the cache or the pool
+        if cache is not None:
+            digest = cache.digest
+        elif self._catalog_pool is not None:
+            from .cache import CatalogCache
+
+            digest = CatalogCache.catalog_digest(descriptions)
+        else:
+            digest = None
+        catalog_reused = digest is not None and digest == self._catalog_digest
+        dropped = 0
+        if not catalog_reused:
+            catalog, index = self._build_catalog(descriptions, digest)
+            if digest is None and catalog.same_entries(self._catalog):
+                catalog_reused = True
             else:
-                PyProsimTypeException(f'Data Type "{dr.DataType}" unknown')
-
-            # Create PyProsim dataref class
-            self._datarefs[dr.Name] = self.Dataref(
-                parent=self,
-                name=dr.Name,
-                description=dr.Description,
-                data_type=data_type,
-                data_unit=dr.DataUnit,
-                can_read=dr.CanRead,
-                can_write=dr.CanWrite,
+                with self._subscription_lock:
+                    dropped = self._replace_catalog(catalog, index)
+                    self._catalog_digest = digest
+
+        # The cached catalog is checked against Prosim without delaying the connection
+        if revalidate:
+            threading.Thread(
+                target=self._revalidate_catalog, args=(key,), daemon=True
+            ).start()
+        return catalog_reused, dropped
+
+    def _build_catalog(
+        self, descriptions: List[object], digest: bytes
+    ) -> Tuple[Catalog, NameIndex]:
+        """Build the catalog and its index, or get them from the catalog pool
+
+        Args:
+            descriptions (List[object]): SDK (or cached) dataref descriptions
+            digest (bytes): Catalog digest, see CatalogCache.catalog_digest. None
+                            without catalog pool.
+
+        Returns:
+            Tuple[Catalog, NameIndex]: Catalog and its index
+        """
+
+        def build() -> Tuple[Catalog, NameIndex]:
+            catalog = Catalog.from_descriptions(
+                descriptions, DataTypeTable(self.backend)
             )
+            return catalog, NameIndex(catalog)
+
+        if self._catalog_pool is not None:
+            return self._catalog_pool.get_or_create(digest, self.backend, build)
+        return build()
+
+    def _replace_catalog(self, catalog: Catalog, index: NameIndex = None) -> int:
+        """Replace the catalog, keeping the datarefs whose entry did not change.
+        The subscriptions of the other datarefs are released. The caller holds
+        the subscription lock.
+
+        Args:
+            catalog (Catalog): New catalog
+            index (NameIndex, optional): Index of the new catalog. Defaults to None,
+                                         built here.
+
+        Returns:
+            int: Number of subscribed datarefs released
+        """
+        previous = self._catalog
+        datarefs: Dict[str, PyProsim.Dataref] = {}
+        dropped = 0
+        for name, dataref in list(self._datarefs.items()):
+            position = catalog.index.get(name)
+            if position is not None and catalog.entry(position) == previous.entry(
+                previous.index[name]
+            ):
+                datarefs[name] = dataref
+            elif dataref._subscriptions:
+                dataref.deactivate()
+                dropped += 1
+        self._index = index if index is not None else NameIndex(catalog)
+        self._catalog = catalog
+        self._datarefs = datarefs
+        return dropped
+
+    def _restore_subscriptions(self) -> int:
+        """Activate the subscribed datarefs on the current connection
+
+        Returns:
+            int: Number of datarefs activated
+        """
+        restored = 0
+        with self._subscription_lock:
+            for dataref in list(self._datarefs.values()):
+                if dataref._subscriptions:
+                    dataref._reactivate()
+                    restored += 1
+        return restored
+
+    def _create_dataref(self, position: int) -> "PyProsim.Dataref":
+        """Create PyProsim dataref class from a catalog entry
+
+        Args:
+            position (int): Dataref position in the catalog
+
+        Returns:
+            PyProsim.Dataref: PyProsim dataref
+        """
+        catalog = self._catalog
+        return self.Dataref(
+            parent=self,
+            name=catalog.names[position],
+            description=catalog.description(position),
+            data_type=catalog.data_type(position),
+            data_unit=catalog.data_unit(position),
+            can_read=catalog.can_read(position),
+            can_write=catalog.can_write(position),
+        )
+
+    def _get_dataref(self, dataref_name: str) -> "PyProsim.Dataref":
+        """Get PyProsim dataref object, creating it on first use
+
+        Args:
+            dataref_name (str): Prosim dataref name
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name. Not part of prosim database
+
+        Returns:
+            PyProsim.Dataref: PyProsim dataref
+        """
+        dataref = self._datarefs.get(dataref_name)
+        if dataref is not None:
+            return dataref
+        # Not racing a catalog replacement, see _replace_catalog
+        with self._subscription_lock:
+            dataref = self._datarefs.get(dataref_name)
+            if dataref is None:
+                position = self._catalog.index.get(dataref_name)
+                if position is None:
+                    derived = self._derived
+                    if derived is not None and dataref_name in derived.nodes:
+                        return derived.nodes[dataref_name]
+                    raise PyProsimDatarefException(
+                        f'Dataref "{dataref_name}" is not in Prosim database'
+                    )
+                dataref = self._datarefs[dataref_name] = self._create_dataref(position)
+        return dataref
+
+    def _find_dataref(
+        self, dataref_name: str
+    ) -> Union["PyProsim.Dataref", "DerivedDataref", None]:
+        """Get a PyProsim dataref object already created, real or derived
+
+        Args:
+            dataref_name (str): Prosim dataref name
+
+        Returns:
+            Union[PyProsim.Dataref, DerivedDataref, None]: Dataref, None if it was
+                                                            never used or is unknown
+        """
+        dataref = self._datarefs.get(dataref_name)
+        if dataref is None and self._derived is not None:
+            dataref = self._derived.nodes.get(dataref_name)
+        return dataref
+
+    def _revalidate_catalog(self, key: bytes):
+        """Compare the cached catalog with the Prosim one. When they differ the cache
+        is refreshed and the catalog replaced, keeping the datarefs not changed.
+
+        Args:
+            key (bytes): Cache key of the catalog in use
+        """
+        try:
+            descriptions = list(self.sdk.getDataRefDescriptions())
+            cache = self._catalog_cache
+            if cache.catalog_digest(descriptions) == cache.digest:
+                return
+            cache.store(key, descriptions)
+            catalog, index = self._build_catalog(descriptions, cache.digest)
+            with self._subscription_lock:
+                self._replace_catalog(catalog, index)
+                self._catalog_digest = cache.digest
+        except Exception:
+            logger.exception("Catalog revalidation failed")
 
     def connect(self, ip_addr: str, synchronous: bool = True) -> None:
         """Open connection with Prosim Server
@@ -273,29 +706,177 @@ class PyProsim:
                            if prosim runs in the same PC as this script.
             synchronous (bool, optional): Blocking mode when True. Defaults to True.
         """
-        self.sdk.Connect(ip_addr, synchronous)
+        if self.tracer is None:
+            self.sdk.Connect(ip_addr, synchronous)
+            return
+        with self.tracer.span(self.tracer.CONNECT, ip_addr):
+            self.sdk.Connect(ip_addr, synchronous)
 
     def activate_dataref(
-        self, dataref_name: str, interval: int, on_change_callback: Callable = None
-    ) -> None:
+        self,
+        dataref_name: str,
+        interval: int,
+        on_change_callback: Callable = None,
+        filters: Iterable[ChangeFilter] = None,
+    ) -> Subscription:
         """Inform Prosim we want to read/write this dataref. Adding interval > 0
         Prosim software will periodically send this value back to us.
 
+        Each call adds a subscription to the dataref, with its own callback and
+        interval. Prosim sends the dataref once, at the smallest interval of its
+        subscriptions. Release the subscription with deactivate_dataref() or
+        Subscription.cancel().
+
         Args:
             dataref_name (str): Prosim dataref name
             interval (int): How frequent prosim should send this dataref in miliseconds
             on_change_callback (Callable, optional): Callable object which will be called when dataref
                                                      changes. Defaults to None.
+            filters (Iterable[ChangeFilter], optional): Filters evaluated before calling
+                                                        on_change_callback, e.g. Deadband or
+                                                        MinInterval. Filters keep state, do not
+                                                        share them between datarefs.
+                                                        Defaults to None.
 
         Raises:
             PyProsimDatarefException: Unknown dataref name. Not part of prosim database
+
+        Returns:
+            Subscription: Subscription of this request
         """
-        if dataref_name not in self._datarefs:
-            raise PyProsimDatarefException(
-                f'Dataref "{dataref_name}" is not in Prosim database'
-            )
+        return self._get_dataref(dataref_name).activate(
+            interval, on_change_callback, filters
+        )
 
-        self._datarefs[dataref_name].activate(interval, on_change_callback)
+    def deactivate_dataref(
+        self, dataref_name: str, subscription: Subscription = None
+    ) -> None:
+        """Release a subscription to a dataref, or all of them. Prosim stops sending
+        the dataref when its last subscription is released.
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            subscription (Subscription, optional): Subscription returned by
+                                                   activate_dataref. Defaults to None,
+                                                   all the dataref subscriptions.
+        """
+        dataref = self._find_dataref(dataref_name)
+        if dataref is not None:
+            dataref.deactivate(subscription)
+
+    def subscriptions(self, pattern: str = None) -> List[Subscription]:
+        """Live subscriptions, see Subscription.stats() for their details
+
+        Args:
+            pattern (str, optional): Only the datarefs matching this name or pattern
+                                     (see resolve). Defaults to None, all datarefs.
+
+        Returns:
+            List[Subscription]: Subscriptions
+        """
+        derived = self._derived.nodes if self._derived is not None else {}
+        if pattern is None:
+            datarefs = list(self._datarefs.values()) + list(derived.values())
+        else:
+            datarefs = [
+                self._datarefs.get(name) or derived[name]
+                for name in self.resolve(pattern)
+                if name in self._datarefs or name in derived
+            ]
+        return [s for dataref in datarefs for s in dataref._subscriptions]
+
+    def resolve(self, pattern: str) -> List[str]:
+        """Resolve a dataref name or pattern into dataref names. Patterns can be globs,
+        e.g. "aircraft.engines.*.n1", or prefixes ending with a dot, e.g. "aircraft.engines.".
+        See NameIndex for the glob syntax.
+
+        Args:
+            pattern (str): Dataref name or pattern
+
+        Returns:
+            List[str]: Matching dataref names. A name which is not a pattern is returned
+                       as given, even if it is not in the Prosim database.
+        """
+        if not is_pattern(pattern):
+            return [pattern]
+        if pattern.endswith("."):
+            return self._index.prefix(pattern)
+        return self._index.glob(pattern)
+
+    def activate_many(
+        self,
+        datarefs: Iterable[ActivationRequest],
+        interval: int = 0,
+        on_change_callback: Callable = None,
+    ) -> ActivationReport:
+        """Activate several datarefs in one pass. Each entry is a dataref name or a
+        pattern, alone or as a tuple (name, interval) or (name, interval, callback).
+        Patterns are resolved as in resolve(). A dataref selected by several entries is
+        only activated once, with the first entry selecting it.
+
+        Failures do not abort the batch, they are collected in the returned report.
+
+        Args:
+            datarefs (Iterable[ActivationRequest]): Names or patterns to activate
+            interval (int, optional): Interval in milliseconds for entries without one.
+                                      Defaults to 0.
+            on_change_callback (Callable, optional): Callback for entries without one.
+                                                     Defaults to None.
+
+        Returns:
+            ActivationReport: Activated and failed datarefs, unmatched patterns and
+                              the batch duration
+        """
+        start = time.perf_counter()
+        report = ActivationReport()
+
+        # Resolve names and patterns, keeping the first request of each dataref
+        resolved: Dict[str, Tuple[int, Callable]] = {}
+        for request in datarefs:
+            if isinstance(request, str):
+                request = (request,)
+            name = request[0]
+            request_interval = request[1] if len(request) > 1 else interval
+            callback = request[2] if len(request) > 2 else on_change_callback
+            names = self.resolve(name)
+            if not names:
+                report.unmatched.append(name)
+            for dataref_name in names:
+                if dataref_name not in resolved:
+                    resolved[dataref_name] = (request_interval, callback)
+
+        # Activate them all, collecting the failures
+        for dataref_name, (request_interval, callback) in resolved.items():
+            try:
+                self._get_dataref(dataref_name).activate(request_interval, callback)
+            except Exception as e:
+                report.failed[dataref_name] = e
+            else:
+                report.activated.append(dataref_name)
+
+        report.duration = time.perf_counter() - start
+        return report
+
+    def activate_subtree(
+        self, path: str, interval: int, on_change_callback: Callable = None, **filters
+    ) -> ActivationReport:
+        """Activate every dataref under a node of the dataref namespace
+
+        Args:
+            path (str): Node path, e.g. "aircraft.engines"
+            interval (int): How frequent prosim should send these datarefs in miliseconds
+            on_change_callback (Callable, optional): Callable object which will be called when
+                                                     any of the datarefs changes. Defaults to None.
+            **filters: can_read, can_write and data_type filters, see NameIndex
+
+        Returns:
+            ActivationReport: Activated and failed datarefs and the batch duration
+        """
+        names = self._index.subtree(path, **filters)
+        report = self.activate_many(names, interval, on_change_callback)
+        if not names:
+            report.unmatched.append(path)
+        return report
 
     def get_value(self, dataref_name: str) -> object:
         """Get dataref value
@@ -309,12 +890,519 @@ class PyProsim:
         Returns:
             object: Dataref value with type as specified by prosim dataref database
         """
-        if dataref_name not in self._datarefs:
+        metrics = self.metrics
+        if metrics is None:
+            return self._get_dataref(dataref_name).value
+        start = time.perf_counter()
+        try:
+            return self._get_dataref(dataref_name).value
+        finally:
+            metrics.bridge_calls["get_value"].observe(time.perf_counter() - start)
+
+    def configure_writes(
+        self, dataref_name: str, deadband: float = 0.0, max_rate: float = None
+    ) -> "WritePipeline":
+        """Send the writes of a dataref through a write pipeline, reducing the load on
+        Prosim for high frequency writers. Values within the deadband of the last value
+        sent are suppressed and at most max_rate writes per second are sent, keeping the
+        latest value. See WritePipeline.
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            deadband (float, optional): Minimum change to send a new value. Defaults to 0.0,
+                                        which suppresses repeated values.
+            max_rate (float, optional): Maximum writes per second. Defaults to None (no limit).
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name. Not part of prosim database.
+
+        Returns:
+            WritePipeline: Write pipeline of the dataref
+        """
+        from .writer import WriteFlusher, WritePipeline
+
+        dataref = self._get_dataref(dataref_name)
+        if self._write_flusher is None:
+            self._write_flusher = WriteFlusher()
+        dataref._writer = WritePipeline(
+            dataref, self._write_flusher, deadband, max_rate
+        )
+        return dataref._writer
+
+    def flush_writes(self) -> int:
+        """Send now all the writes held back by the write pipelines rate limit
+
+        Returns:
+            int: Number of values sent
+        """
+        return sum(
+            dataref._writer.flush()
+            for dataref in list(self._datarefs.values())
+            if dataref._writer is not None
+        )
+
+    def write_stats(self) -> Dict[str, dict]:
+        """Counters of the write pipelines
+
+        Returns:
+            Dict[str, dict]: Writes sent, suppressed and coalesced per dataref
+        """
+        return {
+            name: dataref._writer.stats()
+            for name, dataref in list(self._datarefs.items())
+            if dataref._writer is not None
+        }
+
+    def add_change_listener(self, dataref_name: str, listener: Callable) -> None:
+        """Add an internal change listener to a dataref. Listeners are called in the
+        SDK event thread with (name, value) on every change, before the dataref
+        callback and regardless of its filters. They must return quickly.
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            listener (Callable): Callable object receiving (name, value)
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name. Not part of prosim database.
+        """
+        dataref = self._get_dataref(dataref_name)
+        dataref._listeners = dataref._listeners + (listener,)
+
+    def remove_change_listener(self, dataref_name: str, listener: Callable) -> None:
+        """Remove an internal change listener from a dataref
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            listener (Callable): Listener given to add_change_listener
+        """
+        dataref = self._find_dataref(dataref_name)
+        if dataref is not None:
+            dataref._listeners = tuple(l for l in dataref._listeners if l != listener)
+
+    def filter_stats(self) -> Dict[str, List[dict]]:
+        """Counters of the change event filters
+
+        Returns:
+            Dict[str, List[dict]]: Events received, delivered and suppressed by each
+                                   filter, for each filtered subscription of a dataref
+        """
+        stats = {}
+        for subscription in self.subscriptions():
+            if subscription.filters is not None:
+                stats.setdefault(subscription.name, []).append(
+                    subscription.filters.stats()
+                )
+        return stats
+
+    def stats(self) -> dict:
+        """Snapshot of the PyProsim counters
+
+        Returns:
+            dict: Metrics (None unless enabled, see Metrics.stats), the timings of the
+                  last connection, dispatcher, write pipeline, filter, derived
+                  dataref, frame group and adaptive interval counters
+        """
+        return {
+            "metrics": self.metrics.stats() if self.metrics is not None else None,
+            "connection": dict(self.connection_stats),
+            "subscriptions": len(self.subscriptions()),
+            "dispatcher": (
+                self.dispatcher.stats() if self.dispatcher is not None else None
+            ),
+            "writes": self.write_stats(),
+            "filters": self.filter_stats(),
+            "derived": self._derived.stats() if self._derived is not None else None,
+            "frames": self.frame_stats(),
+            "adaptive": self._adaptive.stats() if self._adaptive is not None else None,
+        }
+
+    def add_derived(
+        self,
+        name: str,
+        expression: Union[str, Callable],
+        interval: int,
+        inputs: Iterable[str] = None,
+    ) -> "DerivedDataref":
+        """Add a dataref computed from other datarefs, real or derived. It is computed
+        again only when one of its inputs changes, and read or subscribed like any
+        dataref (get_value, activate_dataref, add_change_listener). The real inputs
+        are activated at the given interval.
+
+        Args:
+            name (str): Name of the derived dataref, e.g. "hw.annunciators.fuel_low"
+            expression (Union[str, Callable]): Python expression with the input datarefs
+                                               in braces, e.g. "{aircraft.fuel.left} < 500",
+                                               or a function taking the input values
+            interval (int): How frequent prosim should send the inputs in miliseconds
+            inputs (Iterable[str], optional): Input dataref names, in the order of the
+                                              function arguments. Only used with a function.
+                                              Defaults to None.
+
+        Raises:
+            PyProsimDatarefException: The name is already used, an input is unknown or
+                                      the expression is not valid
+
+        Returns:
+            DerivedDataref: Derived dataref
+        """
+        from .derived import DerivedGraph, compile_expression
+
+        if isinstance(expression, str):
+            function, inputs = compile_expression(expression)
+            description = expression
+        else:
+            if not inputs:
+                raise PyProsimDatarefException(
+                    f'Derived dataref "{name}" needs the inputs of its function'
+                )
+            function = expression
+            description = getattr(expression, "__qualname__", repr(expression))
+        if self._derived is None:
+            self._derived = DerivedGraph(self)
+        return self._derived.add(name, function, inputs, interval, description)
+
+    def remove_derived(self, name: str) -> None:
+        """Remove a derived dataref and its subscriptions, releasing the inputs no
+        longer used
+
+        Args:
+            name (str): Name of the derived dataref
+
+        Raises:
+            PyProsimDatarefException: Unknown derived dataref or other derived datarefs
+                                      depend on it
+        """
+        if self._derived is None:
+            raise PyProsimDatarefException(f'Derived dataref "{name}" does not exist')
+        self._derived.remove(name)
+
+    def add_frame_group(
+        self,
+        name: str,
+        rate: float,
+        datarefs: Iterable[str],
+        handler: Callable[[List[object]], None],
+        spin: float = 0.0,
+    ) -> "FrameGroup":
+        """Sample datarefs at a fixed rate and pass them to a handler, instead of a
+        get_value and sleep loop. The datarefs are activated at the frame period and
+        read in one pass each frame into a reused list, in the order given. Each group
+        runs in its own thread. See FrameGroup.
+
+        Args:
+            name (str): Group name, e.g. "gauges"
+            rate (float): Frames per second, e.g. 60
+            datarefs (Iterable[str]): Dataref names, real or derived
+            handler (Callable[[List[object]], None]): Called each frame with the values.
+                                                      Copy them to keep them.
+            spin (float, optional): Seconds before each frame spent busy waiting instead
+                                    of sleeping, trading CPU for a lower jitter.
+                                    Defaults to 0.0.
+
+        Raises:
+            PyProsimDatarefException: Group name already used or unknown dataref name
+
+        Returns:
+            FrameGroup: Running frame group
+        """
+        if self._scheduler is None:
+            from .scheduler import FrameScheduler
+
+            self._scheduler = FrameScheduler(self)
+        return self._scheduler.add(name, rate, datarefs, handler, spin)
+
+    def remove_frame_group(self, name: str) -> None:
+        """Stop a frame group and release its datarefs
+
+        Args:
+            name (str): Group name
+        """
+        if self._scheduler is not None:
+            self._scheduler.remove(name)
+
+    def frame_stats(self) -> Dict[str, dict]:
+        """Frame counters, overruns and jitter of the frame groups
+
+        Returns:
+            Dict[str, dict]: Stats per group name, see FrameGroup.stats()
+        """
+        if self._scheduler is None:
+            return {}
+        return self._scheduler.stats()
+
+    def set_adaptive_interval(
+        self,
+        dataref_name: str,
+        min_interval: int = 20,
+        max_interval: int = 1000,
+        freshness: int = None,
+    ) -> "AdaptiveInterval":
+        """Let PyProsim tune how often Prosim sends a dataref, instead of the fixed
+        intervals of its subscriptions. The interval is halved while the dataref
+        changes on most updates and doubled while it rarely changes, re-activating
+        it each time (logged on the pyprosim.adaptive logger). It never goes below
+        the smallest subscription interval nor above the freshness target.
+        See AdaptiveController.
+
+        Subscriptions asking for a larger interval than the adaptive one keep getting
+        their callbacks throttled to their interval.
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            min_interval (int, optional): Smallest interval in milliseconds. Defaults to 20.
+            max_interval (int, optional): Largest interval in milliseconds. Defaults to 1000.
+            freshness (int, optional): Oldest a value may be, in milliseconds.
+                                       Defaults to None, max_interval.
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name, derived dataref or invalid
+                                      bounds
+
+        Returns:
+            AdaptiveInterval: Adaptive interval state, see AdaptiveInterval.stats()
+        """
+        if self._adaptive is None:
+            from .adaptive import AdaptiveController
+
+            self._adaptive = AdaptiveController(self)
+        return self._adaptive.add(dataref_name, min_interval, max_interval, freshness)
+
+    def clear_adaptive_interval(self, dataref_name: str) -> None:
+        """Go back to the subscription intervals for a dataref
+
+        Args:
+            dataref_name (str): Prosim dataref name
+        """
+        if self._adaptive is not None:
+            self._adaptive.remove(dataref_name)
+
+    def keep_history(
+        self, dataref_name: str, capacity: int = 1024, interval: int = None
+    ) -> "History":
+        """Keep the last samples of a numeric dataref, real or derived, in a ring
+        buffer filled from its change events. Use it for trends, rates of change or
+        smoothing, see History for the window queries.
+
+        Args:
+            dataref_name (str): Prosim dataref name
+            capacity (int, optional): Number of samples kept. Defaults to 1024.
+            interval (int, optional): Activate the dataref at this interval in
+                                      milliseconds. Defaults to None, the dataref
+                                      is activated elsewhere.
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name. Not part of prosim database.
+
+        Returns:
+            History: Sample history of the dataref
+        """
+        history = self._histories.get(dataref_name)
+        if history is not None:
+            return history
+        from .history import History
+
+        dataref = self._get_dataref(dataref_name)
+        history = History(dataref_name, capacity)
+        self.add_change_listener(dataref_name, history.on_change)
+        if interval is not None:
+            history.subscription = dataref.activate(interval)
+        self._histories[dataref_name] = history
+        return history
+
+    def history(self, dataref_name: str) -> "History":
+        """Sample history of a dataref, see keep_history
+
+        Args:
+            dataref_name (str): Prosim dataref name
+
+        Raises:
+            PyProsimDatarefException: No history is kept for this dataref
+
+        Returns:
+            History: Sample history of the dataref
+        """
+        history = self._histories.get(dataref_name)
+        if history is None:
             raise PyProsimDatarefException(
-                f'Dataref "{dataref_name}" is not in Prosim database'
+                f'No history is kept for dataref "{dataref_name}"'
             )
+        return history
 
-        return self._datarefs[dataref_name].value
+    def drop_history(self, dataref_name: str) -> None:
+        """Stop keeping the history of a dataref
+
+        Args:
+            dataref_name (str): Prosim dataref name
+        """
+        history = self._histories.pop(dataref_name, None)
+        if history is not None:
+            self.remove_change_listener(dataref_name, history.on_change)
+            if history.subscription is not None:
+                history.subscription.cancel()
+
+    def snapshot(self, pattern: str = None, keep_active: bool = False) -> "Snapshot":
+        """Read the value of every readable and writable dataref in one pass, e.g.
+        to reset a training scenario later with restore(). Save it with
+        Snapshot.save() and read it back with Snapshot.load().
+
+        Args:
+            pattern (str, optional): Only the datarefs matching this name or pattern
+                                     (see resolve). Defaults to None, all datarefs.
+            keep_active (bool, optional): Keep the datarefs activated for a faster
+                                          restore. Defaults to False.
+
+        Returns:
+            Snapshot: Names and values. Datarefs which could not be read are
+                      listed in Snapshot.failed.
+        """
+        start = time.perf_counter()
+        catalog = self._catalog
+        if pattern is None:
+            positions = range(len(catalog))
+        else:
+            positions = [
+                catalog.index[name]
+                for name in self.resolve(pattern)
+                if name in catalog.index
+            ]
+        names = [
+            catalog.names[position]
+            for position in catalog.select(positions, can_read=True, can_write=True)
+        ]
+
+        datarefs, subscriptions, failed = self._activate_batch(names)
+        snapshot_names = []
+        values = []
+        for dataref in datarefs:
+            try:
+                value = dataref._dataref_obj.value
+            except Exception as e:
+                failed[dataref.name] = e
+            else:
+                snapshot_names.append(dataref.name)
+                values.append(value)
+        if not keep_active:
+            self._release_batch(subscriptions)
+
+        from .snapshot import Snapshot
+
+        snapshot = Snapshot(snapshot_names, values)
+        snapshot.failed = failed
+        snapshot.duration = time.perf_counter() - start
+        return snapshot
+
+    def restore(
+        self,
+        snapshot: "Snapshot",
+        order: Iterable[str] = None,
+        chunk_size: int = 100,
+        progress: "RestoreProgress" = None,
+        chunk_delay: float = 0.0,
+        keep_active: bool = False,
+    ) -> "RestoreReport":
+        """Write back the values of a snapshot. The current values are read in one
+        pass and only the datarefs holding a different value are written, in chunks.
+        Write pipelines are bypassed.
+
+        Args:
+            snapshot (Snapshot): Snapshot to restore
+            order (Iterable[str], optional): Names or patterns (see resolve) of the
+                                             datarefs to write first, in this order,
+                                             e.g. power buses before the switches.
+                                             The others follow in snapshot order.
+                                             Defaults to None, snapshot order.
+            chunk_size (int, optional): Writes between two progress calls. Defaults to 100.
+            progress (RestoreProgress, optional): Called after each chunk with the number
+                                                  of datarefs written and to write.
+                                                  Defaults to None.
+            chunk_delay (float, optional): Seconds to wait between chunks, to let Prosim
+                                           process the writes. Defaults to 0.0.
+            keep_active (bool, optional): Keep the datarefs activated. Defaults to False.
+
+        Returns:
+            RestoreReport: Datarefs written, unchanged and failed, and the timings
+        """
+        from .snapshot import RestoreReport
+
+        start = time.perf_counter()
+        report = RestoreReport(len(snapshot))
+        names = snapshot.names
+        if order:
+            first = [self.resolve(pattern) for pattern in order]
+            remaining = dict.fromkeys(names)
+            ordered = []
+            for group in first:
+                for name in group:
+                    if name in remaining:
+                        del remaining[name]
+                        ordered.append(name)
+            names = ordered + list(remaining)
+        values = snapshot.as_dict()
+
+        # Read pass, keeping the casted values which differ
+        datarefs, subscriptions, report.failed = self._activate_batch(names)
+        pending: List[Tuple[PyProsim.Dataref, object]] = []
+        for dataref in datarefs:
+            try:
+                value = dataref._cast(values[dataref.name])
+                if dataref._dataref_obj.value == value:
+                    report.unchanged += 1
+                else:
+                    pending.append((dataref, value))
+            except Exception as e:
+                report.failed[dataref.name] = e
+        write_start = time.perf_counter()
+        report.read_duration = write_start - start
+
+        # Write pass, in chunks
+        total = len(pending)
+        for offset in range(0, total, max(1, chunk_size)):
+            if offset and chunk_delay > 0:
+                time.sleep(chunk_delay)
+            for dataref, value in pending[offset : offset + max(1, chunk_size)]:
+                try:
+                    dataref._send(value)
+                except Exception as e:
+                    report.failed[dataref.name] = e
+                else:
+                    report.written.append(dataref.name)
+            if progress is not None:
+                progress(min(offset + max(1, chunk_size), total), total)
+        if not keep_active:
+            self._release_batch(subscriptions)
+
+        end = time.perf_counter()
+        report.write_duration = end - write_start
+        report.duration = end - start
+        return report
+
+    def _activate_batch(
+        self, names: Iterable[str]
+    ) -> Tuple[List["PyProsim.Dataref"], List[Subscription], Dict[str, Exception]]:
+        """Activate datarefs to read or write them once, collecting the failures
+
+        Returns:
+            Tuple[List[PyProsim.Dataref], List[Subscription], Dict[str, Exception]]:
+                Activated datarefs, their subscriptions to release and the failures
+        """
+        datarefs = []
+        subscriptions = []
+        failed = {}
+        with self._subscription_lock:
+            for name in names:
+                try:
+                    dataref = self._get_dataref(name)
+                    subscriptions.append(dataref.activate(0))
+                except Exception as e:
+                    failed[name] = e
+                else:
+                    datarefs.append(dataref)
+        return datarefs, subscriptions, failed
+
+    def _release_batch(self, subscriptions: List[Subscription]):
+        with self._subscription_lock:
+            for subscription in subscriptions:
+                subscription.cancel()
 
     def get_dataref_database(self) -> dict:
         """Returns dictionary with all available Prosim datarefs
@@ -322,17 +1410,28 @@ class PyProsim:
         Returns:
             dict: All available Prosim datarefs
         """
+        catalog = self._catalog
         dataref_database = {}
-        for name, dr in self._datarefs.items():
-            dataref_database[dr.name] = {
-                "description": dr.description,
-                "data_type": dr.data_type.__name__,
-                "data_unit": dr.data_unit,
-                "read_access": dr.can_read,
-                "write_access": dr.can_write,
+        for position, name in enumerate(catalog.names):
+            dataref_database[name] = {
+                "description": catalog.description(position),
+                "data_type": catalog.type_label(position),
+                "data_unit": catalog.data_unit(position),
+                "read_access": catalog.can_read(position),
+                "write_access": catalog.can_write(position),
             }
         return dataref_database
 
+    @property
+    def index(self) -> NameIndex:
+        """Tree index of the dataref names. Use it to browse and query the dataref
+        database by prefix, glob or regular expression.
+
+        Returns:
+            NameIndex: Index of the current dataref database
+        """
+        return self._index
+
     def get_info(self) -> dict:
         """General Prosim information like licensee and etc.
 
@@ -364,12 +1463,20 @@ class PyProsim:
         Raises:
             PyProsimDatarefException: Unknown dataref name. Not part of prosim database.
         """
-        if dataref_name not in self._datarefs:
-            raise PyProsimDatarefException(
-                f'Dataref "{dataref_name}" is not in Prosim database'
-            )
-
-        self._datarefs[dataref_name].value = value
+        metrics = self.metrics
+        tracer = self.tracer
+        if metrics is None and tracer is None:
+            self._get_dataref(dataref_name).value = value
+            return
+        start = time.perf_counter()
+        try:
+            self._get_dataref(dataref_name).value = value
+        finally:
+            end = time.perf_counter()
+            if metrics is not None:
+                metrics.bridge_calls["set_value"].observe(end - start)
+            if tracer is not None:
+                tracer.record(tracer.SET_VALUE, tracer.intern(dataref_name), start, end)
 
     def get_dataref_obj(self, dataref_name: str) -> Dataref:
         """Get PyProsim dataref object reference
@@ -383,9 +1490,26 @@ class PyProsim:
         Returns:
             Dataref: Reference to dataref object
         """
-        if dataref_name not in self._datarefs:
+        return self._get_dataref(dataref_name)
+
+    def handle(self, dataref_name: str) -> DatarefHandle:
+        """Get a pre-resolved accessor for an active dataref. Its get() and set()
+        skip the name lookup and access checks done by get_value/set_value,
+        use it in hot loops.
+
+        Args:
+            dataref_name (str): Name of dataref as per Prosim specification
+
+        Raises:
+            PyProsimDatarefException: Dataref requested does not exist or it has not
+                                      been activated
+
+        Returns:
+            DatarefHandle: Dataref accessor
+        """
+        dataref = self._get_dataref(dataref_name)
+        if not dataref.active:
             raise PyProsimDatarefException(
-                f'Dataref "{dataref_name}" is not in Prosim database'
+                f'Dataref "{dataref_name}" has not been initialized'
             )
-
-        return self._datarefs[dataref_name]
+        return DatarefHandle(dataref)
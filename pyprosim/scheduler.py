@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List
+
+from .exceptions import PyProsimDatarefException
+from .metrics import Histogram
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+logger = logging.getLogger(__name__)
+
+# Jitter and frame time bounds in seconds, from 10 us to 1 s
+FRAME_BUCKETS = tuple(
+    base * 10.0**exponent for exponent in range(-5, 0) for base in (1.0, 2.5, 5.0)
+) + (1.0,)
+
+
+class FrameGroup:
+    """Datarefs sampled at a fixed rate and passed to a handler, for outputs
+    like servo gauges or LED matrices which want a frame loop rather than
+    change callbacks.
+
+    The datarefs are activated at the frame period and resolved into handles
+    once. Each frame they are read in one pass into the same buffer, a list in
+    the order of the dataref names, and the handler is called with it. The
+    handler must copy the buffer to keep the values past the call.
+
+    A frame starting after the next one was due is an overrun, the frames
+    missed meanwhile are skipped rather than run late in a burst.
+    """
+
+    def __init__(
+        self,
+        prosim: "PyProsim",
+        name: str,
+        rate: float,
+        datarefs: Iterable[str],
+        handler: Callable[[List[object]], None],
+        spin: float = 0.0,
+    ):
+        """FrameGroup class init
+
+        Args:
+            prosim (PyProsim): PyProsim providing the datarefs
+            name (str): Group name, e.g. "gauges"
+            rate (float): Frames per second
+            datarefs (Iterable[str]): Dataref names, real or derived, sampled each frame
+            handler (Callable[[List[object]], None]): Called each frame with the values
+            spin (float, optional): Seconds before each frame spent busy waiting instead
+                                    of sleeping, trading CPU for a lower jitter.
+                                    Defaults to 0.0.
+
+        Raises:
+            PyProsimDatarefException: Unknown dataref name
+        """
+        self.prosim = prosim
+        self.name = name
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.names = tuple(datarefs)
+        self.handler = handler
+        self.spin = spin
+        # Activated at the frame period, so each frame reads a fresh value
+        interval = max(1, int(self.period * 1000))
+        self._subscriptions = []
+        try:
+            for dataref_name in self.names:
+                self._subscriptions.append(
+                    prosim.activate_dataref(dataref_name, interval)
+                )
+            self._getters = tuple(prosim.handle(n).get for n in self.names)
+        except PyProsimDatarefException:
+            self._release()
+            raise
+        # Reused every frame
+        self.buffer: List[object] = [None] * len(self.names)
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        # Counters
+        self.frames = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.errors = 0
+        # Frame start delay from its due time, and sample plus handler duration
+        self.jitter = Histogram(FRAME_BUCKETS)
+        self.frame_time = Histogram(FRAME_BUCKETS)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "FrameGroup":
+        """Start the frame loop in a background thread
+
+        Returns:
+            FrameGroup: This group
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"pyprosim-frames-{self.name}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the frame loop, the datarefs stay activated"""
+        self._stop.set()
+        if self._thread is not None:
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop the frame loop and release the datarefs"""
+        self.stop()
+        self._release()
+
+    def sample(self) -> List[object]:
+        """Read the datarefs into the buffer
+
+        Returns:
+            List[object]: The buffer, values in the order of the dataref names
+        """
+        buffer = self.buffer
+        index = 0
+        for get in self._getters:
+            buffer[index] = get()
+            index += 1
+        return buffer
+
+    def stats(self) -> dict:
+        """Frame counters and timings in seconds
+
+        Returns:
+            dict: Rate, frames run, overruns, frames skipped, handler errors, and the
+                  jitter and frame time summaries
+        """
+        return {
+            "rate": self.rate,
+            "datarefs": len(self.names),
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "jitter": self.jitter.stats(),
+            "frame_time": self.frame_time.stats(),
+        }
+
+    def _release(self):
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+
+    def _wait(self, deadline: float) -> bool:
+        """Wait for a frame due time
+
+        Returns:
+            bool: False when the group is stopping
+        """
+        delay = deadline - time.perf_counter() - self.spin
+        if delay > 0 and self._stop.wait(delay):
+            return False
+        while time.perf_counter() < deadline:
+            pass
+        return not self._stop.is_set()
+
+    def _run(self):
+        period = self.period
+        perf_counter = time.perf_counter
+        observe_jitter = self.jitter.observe
+        observe_frame_time = self.frame_time.observe
+        deadline = perf_counter()
+        while self._wait(deadline):
+            start = perf_counter()
+            observe_jitter(start - deadline)
+            try:
+                self.handler(self.sample())
+            except Exception:
+                self.errors += 1
+                logger.exception('Frame handler of group "%s" failed', self.name)
+            end = perf_counter()
+            observe_frame_time(end - start)
+            self.frames += 1
+
+            deadline += period
+            if end > deadline:
+                # Late, skip the frames already missed
+                self.overruns += 1
+                missed = int((end - deadline) / period) + 1
+                self.skipped += missed - 1
+                deadline += (missed - 1) * period
+                if deadline < end:
+                    deadline = end
+
+
+class FrameScheduler:
+    """Frame groups of a PyProsim, see PyProsim.add_frame_group"""
+
+    def __init__(self, prosim: "PyProsim"):
+        """FrameScheduler class init
+
+        Args:
+            prosim (PyProsim): PyProsim providing the datarefs
+        """
+        self.prosim = prosim
+        self.groups: Dict[str, FrameGroup] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        rate: float,
+        datarefs: Iterable[str],
+        handler: Callable[[List[object]], None],
+        spin: float = 0.0,
+    ) -> FrameGroup:
+        """Add a frame group and start it. See FrameGroup.
+
+        Raises:
+            PyProsimDatarefException: Group name already used or unknown dataref name
+
+        Returns:
+            FrameGroup: Running frame group
+        """
+        with self._lock:
+            if name in self.groups:
+                raise PyProsimDatarefException(f'Frame group "{name}" already exists')
+            group = FrameGroup(self.prosim, name, rate, datarefs, handler, spin)
+            self.groups[name] = group
+        return group.start()
+
+    def remove(self, name: str) -> None:
+        """Stop a frame group and release its datarefs
+
+        Args:
+            name (str): Group name
+        """
+        with self._lock:
+            group = self.groups.pop(name, None)
+        if group is not None:
+            group.close()
+
+    def stop(self) -> None:
+        """Stop and remove all the frame groups"""
+        for name in list(self.groups):
+            self.remove(name)
+
+    def stats(self) -> Dict[str, dict]:
+        """Counters and timings of every frame group, see FrameGroup.stats()
+
+        Returns:
+            Dict[str, dict]: Stats per group name
+        """
+        return {name: group.stats() for name, group in list(self.groups.items())}
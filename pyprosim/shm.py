@@ -0,0 +1,323 @@
+import json
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import PyProsimDatarefException
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+    from .subscription import Subscription
+
+# Default shared memory segment name
+DEFAULT_SEGMENT = "pyprosim"
+
+
+class SharedMemoryFormat:
+    """Layout of the shared memory segment.
+
+    - header: magic, version, reserved, slot count, slot size, directory length
+    - directory: JSON list of the published dataref names, padded to 64 bytes
+    - slots: one per dataref, 64 bytes aligned
+
+    Each slot holds a sequence counter, the value in 8 bytes (float64 for
+    floats and booleans, int64 or uint64 for integers, so Int64 and UInt64
+    values are exact), the value kind and, for strings, the UTF-8 text. The publisher
+    makes the counter odd while it writes the slot and even once done, so a
+    reader seeing the same even counter before and after reading the slot has
+    read a consistent value (seqlock). There is a single writer per slot.
+    """
+
+    MAGIC = b"PPSM"
+    VERSION = 2
+    # magic, version, reserved, slot count, slot size, directory length
+    HEADER = struct.Struct("<4sHHIII")
+    # sequence, value, kind, text length
+    SLOT = struct.Struct("<QdB3xI")
+    SLOT_INT = struct.Struct("<QqB3xI")
+    SLOT_UINT = struct.Struct("<QQB3xI")
+    SEQUENCE = struct.Struct("<Q")
+    ALIGNMENT = 64
+    KIND_NONE = 0
+    KIND_FLOAT = 1
+    KIND_BOOL = 2
+    KIND_INT = 3
+    KIND_STR = 4
+    KIND_UINT = 5
+
+    @classmethod
+    def align(cls, length: int) -> int:
+        return length + -length % cls.ALIGNMENT
+
+
+class SharedMemoryPublisher:
+    """Publishes the values of a set of datarefs into a shared memory segment,
+    so other processes on the host read them with SharedMemoryReader instead of
+    opening their own ProSim connection.
+
+    The values are written by internal change listeners in the SDK event thread.
+    """
+
+    def __init__(
+        self,
+        prosim: "PyProsim",
+        datarefs: Iterable[str],
+        segment: str = DEFAULT_SEGMENT,
+        interval: Optional[int] = None,
+        text_capacity: int = 40,
+    ):
+        """SharedMemoryPublisher class init
+
+        Args:
+            prosim (PyProsim): Connected PyProsim
+            datarefs (Iterable[str]): Dataref names or patterns (see PyProsim.resolve)
+            segment (str, optional): Shared memory segment name. Defaults to "pyprosim".
+            interval (int, optional): Activation interval in milliseconds for the datarefs
+                                      not active yet. Defaults to None (they must be active).
+            text_capacity (int, optional): Maximum bytes of string values, longer ones
+                                           are truncated. Defaults to 40.
+        """
+        self.prosim = prosim
+        self.segment = segment
+        self.interval = interval
+        self.names: List[str] = []
+        for pattern in datarefs:
+            for name in prosim.resolve(pattern):
+                if name not in self.names:
+                    self.names.append(name)
+        self.text_capacity = text_capacity
+        self.slot_size = SharedMemoryFormat.align(
+            SharedMemoryFormat.SLOT.size + text_capacity
+        )
+        self._shm: shared_memory.SharedMemory = None
+        self._offsets: Dict[str, int] = {}
+        # Subscriptions of the datarefs activated by the publisher
+        self._subscriptions: List["Subscription"] = []
+
+    def start(self) -> "SharedMemoryPublisher":
+        """Create the segment and start publishing
+
+        Returns:
+            SharedMemoryPublisher: This publisher
+        """
+        directory = json.dumps(self.names).encode()
+        slots_offset = SharedMemoryFormat.align(
+            SharedMemoryFormat.HEADER.size + len(directory)
+        )
+        size = slots_offset + self.slot_size * len(self.names)
+        self._shm = shared_memory.SharedMemory(self.segment, create=True, size=size)
+        buf = self._shm.buf
+        SharedMemoryFormat.HEADER.pack_into(
+            buf,
+            0,
+            SharedMemoryFormat.MAGIC,
+            SharedMemoryFormat.VERSION,
+            0,
+            len(self.names),
+            self.slot_size,
+            len(directory),
+        )
+        start = SharedMemoryFormat.HEADER.size
+        buf[start : start + len(directory)] = directory
+        self._offsets = {
+            name: slots_offset + i * self.slot_size for i, name in enumerate(self.names)
+        }
+
+        for name in self.names:
+            dataref = self.prosim.get_dataref_obj(name)
+            self.prosim.add_change_listener(name, self._on_change)
+            if not dataref.active and self.interval is not None:
+                self._subscriptions.append(
+                    self.prosim.activate_dataref(name, self.interval)
+                )
+            if dataref.active and dataref.can_read:
+                self._on_change(name, dataref.value)
+        return self
+
+    def stop(self) -> None:
+        """Stop publishing and remove the segment"""
+        for name in self.names:
+            self.prosim.remove_change_listener(name, self._on_change)
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+        shm, self._shm = self._shm, None
+        shm.close()
+        shm.unlink()
+
+    def __enter__(self) -> "SharedMemoryPublisher":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _on_change(self, name: str, value: object):
+        shm = self._shm
+        if shm is None:
+            return
+        buf = shm.buf
+        offset = self._offsets[name]
+        text = b""
+        slot = SharedMemoryFormat.SLOT
+        if isinstance(value, bool):
+            kind, number = SharedMemoryFormat.KIND_BOOL, float(value)
+        elif isinstance(value, int) and -(2**63) <= value < 2**64:
+            number = value
+            if value < 2**63:
+                kind, slot = SharedMemoryFormat.KIND_INT, SharedMemoryFormat.SLOT_INT
+            else:
+                kind, slot = SharedMemoryFormat.KIND_UINT, SharedMemoryFormat.SLOT_UINT
+        elif isinstance(value, float):
+            kind, number = SharedMemoryFormat.KIND_FLOAT, value
+        elif isinstance(value, str):
+            kind, number = SharedMemoryFormat.KIND_STR, float("nan")
+            text = value.encode()[: self.text_capacity]
+        else:
+            # Other numeric types, e.g. Decimal, are stored as float
+            try:
+                kind, number = SharedMemoryFormat.KIND_FLOAT, float(value)
+            except (TypeError, ValueError):
+                kind, number = SharedMemoryFormat.KIND_STR, float("nan")
+                text = str(value).encode()[: self.text_capacity]
+
+        (sequence,) = SharedMemoryFormat.SEQUENCE.unpack_from(buf, offset)
+        # Odd while the slot is being written
+        SharedMemoryFormat.SEQUENCE.pack_into(buf, offset, sequence + 1)
+        slot.pack_into(buf, offset, sequence + 1, number, kind, len(text))
+        if text:
+            start = offset + SharedMemoryFormat.SLOT.size
+            buf[start : start + len(text)] = text
+        SharedMemoryFormat.SEQUENCE.pack_into(buf, offset, sequence + 2)
+
+
+class SharedMemoryReader:
+    """Reads the dataref values published by a SharedMemoryPublisher.
+
+    It only depends on the standard library, it neither loads the SDK nor
+    connects to ProSim. Values are decoded straight from the shared memory.
+    """
+
+    def __init__(self, segment: str = DEFAULT_SEGMENT, retries: int = 100):
+        """SharedMemoryReader class init
+
+        Args:
+            segment (str, optional): Shared memory segment name. Defaults to "pyprosim".
+            retries (int, optional): Attempts to get a consistent read of a slot
+                                     being written. Defaults to 100.
+
+        Raises:
+            FileNotFoundError: The segment does not exist, the publisher is not running
+            PyProsimDatarefException: The segment is not a PyProsim segment
+        """
+        self._shm = _attach(segment)
+        self.retries = retries
+        buf = self._shm.buf
+        magic, version, _, count, slot_size, directory_length = (
+            SharedMemoryFormat.HEADER.unpack_from(buf, 0)
+        )
+        if magic != SharedMemoryFormat.MAGIC or version != SharedMemoryFormat.VERSION:
+            self.close()
+            raise PyProsimDatarefException(
+                f'Shared memory segment "{segment}" is not a PyProsim segment'
+            )
+        start = SharedMemoryFormat.HEADER.size
+        self.names: List[str] = json.loads(bytes(buf[start : start + directory_length]))
+        slots_offset = SharedMemoryFormat.align(start + directory_length)
+        self._offsets = {
+            name: slots_offset + i * slot_size for i, name in enumerate(self.names)
+        }
+
+    def close(self) -> None:
+        """Detach from the segment"""
+        self._shm.close()
+
+    def __enter__(self) -> "SharedMemoryReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._offsets
+
+    def read(self, dataref_name: str) -> Tuple[int, object]:
+        """Read a dataref value and its sequence number. The sequence number
+        increases with every change, compare it to detect changes.
+
+        Args:
+            dataref_name (str): Published dataref name
+
+        Raises:
+            PyProsimDatarefException: The dataref is not published
+            TimeoutError: No consistent read after the retries
+
+        Returns:
+            Tuple[int, object]: Sequence number and value. The value is None until
+                                the dataref is published.
+        """
+        try:
+            offset = self._offsets[dataref_name]
+        except KeyError:
+            raise PyProsimDatarefException(
+                f'Dataref "{dataref_name}" is not published in shared memory'
+            )
+        buf = self._shm.buf
+        unpack_slot = SharedMemoryFormat.SLOT.unpack_from
+        unpack_sequence = SharedMemoryFormat.SEQUENCE.unpack_from
+        for _ in range(self.retries):
+            sequence, number, kind, length = unpack_slot(buf, offset)
+            if not sequence & 1:
+                if kind == SharedMemoryFormat.KIND_INT:
+                    number = SharedMemoryFormat.SLOT_INT.unpack_from(buf, offset)[1]
+                elif kind == SharedMemoryFormat.KIND_UINT:
+                    number = SharedMemoryFormat.SLOT_UINT.unpack_from(buf, offset)[1]
+                elif kind == SharedMemoryFormat.KIND_STR:
+                    start = offset + SharedMemoryFormat.SLOT.size
+                    text = bytes(buf[start : start + length])
+                if unpack_sequence(buf, offset)[0] == sequence:
+                    break
+            time.sleep(0)
+        else:
+            raise TimeoutError(f'Dataref "{dataref_name}" shared memory slot is busy')
+
+        if kind == SharedMemoryFormat.KIND_FLOAT:
+            return sequence, number
+        if kind == SharedMemoryFormat.KIND_BOOL:
+            return sequence, bool(number)
+        if kind in (SharedMemoryFormat.KIND_INT, SharedMemoryFormat.KIND_UINT):
+            return sequence, number
+        if kind == SharedMemoryFormat.KIND_STR:
+            return sequence, text.decode(errors="replace")
+        return sequence, None
+
+    def get(self, dataref_name: str) -> object:
+        """Get a dataref value
+
+        Args:
+            dataref_name (str): Published dataref name
+
+        Raises:
+            PyProsimDatarefException: The dataref is not published
+
+        Returns:
+            object: Dataref value, None until the dataref is published
+        """
+        return self.read(dataref_name)[1]
+
+
+def _attach(segment: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without taking over its ownership. Before
+    Python 3.13 the resource tracker of the reader process would remove the
+    segment when the reader exits."""
+    try:
+        return shared_memory.SharedMemory(segment, track=False)
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(segment)
+    if os.name == "posix":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
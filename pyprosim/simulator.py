@@ -0,0 +1,432 @@
+import random
+import threading
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from .backend import PyProsimBackend
+
+
+class SimulatedEvent:
+    """Minimal .NET like event. Handlers are added with += and removed with -="""
+
+    def __init__(self):
+        # Handlers are stored in a tuple so that firing the event while another
+        # thread changes the handlers does not require a lock.
+        self._handlers = ()
+
+    def __iadd__(self, handler: Callable):
+        self._handlers = self._handlers + (handler,)
+        return self
+
+    def __isub__(self, handler: Callable):
+        handlers = list(self._handlers)
+        handlers.remove(handler)
+        self._handlers = tuple(handlers)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def __call__(self, *args):
+        for handler in self._handlers:
+            handler(*args)
+
+
+class SimulatedDataRefDescription:
+    """Simulated version of the ProSim SDK DataRefDescription"""
+
+    __slots__ = ("Name", "Description", "DataType", "DataUnit", "CanRead", "CanWrite")
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        data_type: str,
+        data_unit: str,
+        can_read: bool,
+        can_write: bool,
+    ):
+        self.Name = name
+        self.Description = description
+        self.DataType = data_type
+        self.DataUnit = data_unit
+        self.CanRead = can_read
+        self.CanWrite = can_write
+
+
+class SimulatedLicensingInfo:
+    """Simulated version of the ProSim SDK LicensingInfo"""
+
+    def __init__(self, mode: str, features: List[str], licensee: str):
+        self.Mode = mode
+        self.Features = features
+        self.Licensee = licensee
+
+
+def _integer_type(name: str, minimum: int, maximum: int) -> Callable:
+    def cast(value) -> int:
+        result = int(value)
+        if result < minimum or result > maximum:
+            raise OverflowError(f"{value} out of range for {name}")
+        return result
+
+    cast.__name__ = name
+    return cast
+
+
+def _simple_type(name: str, python_type: type) -> Callable:
+    def cast(value):
+        return python_type(value)
+
+    cast.__name__ = name
+    return cast
+
+
+def _char(value) -> str:
+    value = str(value)
+    if len(value) != 1:
+        raise ValueError(f'"{value}" is not a single character')
+    return value
+
+
+_char.__name__ = "Char"
+
+# Callable types mimicking the C# types used by ProSim datarefs
+SIMULATED_DATA_TYPES: Dict[str, Callable] = {
+    "System.Boolean": _simple_type("Boolean", bool),
+    "System.Byte": _integer_type("Byte", 0, 2**8 - 1),
+    "System.SByte": _integer_type("SByte", -(2**7), 2**7 - 1),
+    "System.Char": _char,
+    "System.Decimal": _simple_type("Decimal", Decimal),
+    "System.Double": _simple_type("Double", float),
+    "System.Single": _simple_type("Single", float),
+    "System.Int32": _integer_type("Int32", -(2**31), 2**31 - 1),
+    "System.UInt32": _integer_type("UInt32", 0, 2**32 - 1),
+    "System.IntPtr": _integer_type("IntPtr", -(2**63), 2**63 - 1),
+    "System.UIntPtr": _integer_type("UIntPtr", 0, 2**64 - 1),
+    "System.Int64": _integer_type("Int64", -(2**63), 2**63 - 1),
+    "System.UInt64": _integer_type("UInt64", 0, 2**64 - 1),
+    "System.Int16": _integer_type("Int16", -(2**15), 2**15 - 1),
+    "System.UInt16": _integer_type("UInt16", 0, 2**16 - 1),
+    "System.String": _simple_type("String", str),
+}
+
+# Templates used to generate a ProSim like catalog. The "{i}" field is replaced
+# by the instance number, so names like "aircraft.engines.*.n1" are available.
+# (name, description, data type, data unit, can read, can write)
+CATALOG_TEMPLATES = (
+    ("aircraft.engines.{i}.n1", "Engine N1", "System.Double", "%", True, False),
+    ("aircraft.engines.{i}.thrust", "Engine thrust", "System.Double", "", True, False),
+    (
+        "aircraft.fuel.tank{i}.amount.kg",
+        "Fuel amount",
+        "System.Double",
+        "kg",
+        True,
+        True,
+    ),
+    (
+        "aircraft.electrical.bus{i}.voltage",
+        "Bus voltage",
+        "System.Single",
+        "V",
+        True,
+        False,
+    ),
+    ("system.switches.S_PANEL_{i}", "Switch position", "System.Int32", "", True, True),
+    ("system.gates.B_GATE_{i}", "Logic gate", "System.Boolean", "", True, True),
+    (
+        "system.indicators.I_LIGHT_{i}",
+        "Indicator state",
+        "System.Int32",
+        "",
+        True,
+        False,
+    ),
+    ("system.analog.A_POT_{i}", "Analog input", "System.Single", "", True, True),
+    ("system.numerical.N_COUNTER_{i}", "Counter", "System.Int16", "", True, True),
+    ("system.text.T_DISPLAY_{i}", "Display text", "System.String", "", True, False),
+)
+
+
+def generate_catalog(size: int) -> List[SimulatedDataRefDescription]:
+    """Generate a deterministic ProSim like dataref catalog
+
+    Args:
+        size (int): Number of datarefs in the catalog
+
+    Returns:
+        List[SimulatedDataRefDescription]: Catalog descriptions
+    """
+    catalog = []
+    for n in range(size):
+        name, description, data_type, data_unit, can_read, can_write = (
+            CATALOG_TEMPLATES[n % len(CATALOG_TEMPLATES)]
+        )
+        i = n // len(CATALOG_TEMPLATES) + 1
+        catalog.append(
+            SimulatedDataRefDescription(
+                name=name.format(i=i),
+                description=f"{description} {i}",
+                data_type=data_type,
+                data_unit=data_unit,
+                can_read=can_read,
+                can_write=can_write,
+            )
+        )
+    return catalog
+
+
+def _initial_value(data_type: str) -> object:
+    if data_type == "System.String":
+        return ""
+    if data_type == "System.Char":
+        return " "
+    return SIMULATED_DATA_TYPES[data_type](0)
+
+
+class SimulatedDataRef:
+    """Simulated version of the ProSim SDK DataRef"""
+
+    def __init__(self, name: str, interval: int, sdk: "SimulatedProSimConnect"):
+        self.name = name
+        self.interval = interval
+        self.onDataChange = SimulatedEvent()
+        self._sdk = sdk
+        self._server = sdk.server
+        self._last_emit = 0.0
+        self._server.register(self)
+
+    @property
+    def value(self) -> object:
+        return self._server.values[self.name]
+
+    @value.setter
+    def value(self, value):
+        self._server.write(self.name, value)
+
+
+class SimulatedProSimConnect:
+    """Simulated version of the ProSim SDK ProSimConnect"""
+
+    def __init__(self, server: "SimulatedBackend"):
+        self.server = server
+        self.onConnect = SimulatedEvent()
+        self.onDisconnect = SimulatedEvent()
+        self.connected = False
+
+    def Connect(self, ip_addr: str, synchronous: bool = True) -> None:
+        if synchronous:
+            self._connect()
+        else:
+            threading.Thread(target=self._connect, daemon=True).start()
+
+    def _connect(self):
+        self.server.delay()
+        with self.server._lock:
+            if self.connected or not self.server.available:
+                return
+            self.connected = True
+        self.server.attach(self)
+        self.onConnect()
+
+    def simulate_disconnect(self) -> None:
+        """Drop the connection as if the ProSim server went away"""
+        if self.connected:
+            self.connected = False
+            self.server.detach(self)
+            self.onDisconnect()
+
+    def getDataRefDescriptions(self) -> List[SimulatedDataRefDescription]:
+        self.server.delay()
+        return list(self.server.catalog)
+
+    def getLicensingInfo(self) -> SimulatedLicensingInfo:
+        self.server.delay()
+        return SimulatedLicensingInfo(
+            mode=self.server.mode,
+            features=list(self.server.features),
+            licensee=self.server.licensee,
+        )
+
+
+class SimulatedBackend(PyProsimBackend):
+    """Pure Python backend simulating a ProSim server. It does not require .NET
+    nor a running ProSim, which makes it suitable to profile and load test PyProsim.
+
+    All SDK objects created by the same SimulatedBackend share the same server state.
+    """
+
+    value_exceptions = (TypeError, ValueError, ArithmeticError)
+
+    def __init__(
+        self,
+        catalog_size: int = 20000,
+        update_rate: float = 0.0,
+        latency: float = 0.0,
+        catalog: Optional[List[SimulatedDataRefDescription]] = None,
+        seed: int = 0,
+    ):
+        """SimulatedBackend class init
+
+        Args:
+            catalog_size (int, optional): Number of generated datarefs. Ignored when a catalog
+                                          is given. Defaults to 20000.
+            update_rate (float, optional): Rate in Hz at which active datarefs change and emit
+                                           onDataChange events. Zero disables automatic
+                                           changes. Defaults to 0.0.
+            latency (float, optional): Seconds added to every simulated network round trip
+                                       (connect, catalog, activation and writes). Defaults to 0.0.
+            catalog (List[SimulatedDataRefDescription], optional): Explicit catalog to serve.
+                                                                   Defaults to None.
+            seed (int, optional): Seed for the generated value changes. Defaults to 0.
+        """
+        self.catalog = (
+            catalog if catalog is not None else generate_catalog(catalog_size)
+        )
+        self.update_rate = update_rate
+        self.latency = latency
+        self.available = True
+        self.mode = "Simulated"
+        self.features = ["B738"]
+        self.licensee = "PyProsim simulator"
+        self.values: Dict[str, object] = {
+            dr.Name: _initial_value(dr.DataType) for dr in self.catalog
+        }
+        self._types = {dr.Name: dr.DataType for dr in self.catalog}
+        self._datarefs: Dict[str, List[SimulatedDataRef]] = {}
+        self._connections: List[SimulatedProSimConnect] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ticker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def create_sdk(self) -> SimulatedProSimConnect:
+        return SimulatedProSimConnect(self)
+
+    def create_dataref(
+        self, name: str, interval: int, sdk: SimulatedProSimConnect
+    ) -> SimulatedDataRef:
+        return SimulatedDataRef(name, interval, sdk)
+
+    def release_dataref(self, dataref: SimulatedDataRef) -> None:
+        self.unregister(dataref)
+
+    def get_data_type(self, type_name: str) -> Optional[Callable]:
+        return SIMULATED_DATA_TYPES.get(type_name)
+
+    def delay(self) -> None:
+        """Wait for the configured latency"""
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def attach(self, sdk: SimulatedProSimConnect) -> None:
+        with self._lock:
+            self._connections.append(sdk)
+            if self.update_rate > 0 and self._ticker is None:
+                self._stop.clear()
+                self._ticker = threading.Thread(target=self._run, daemon=True)
+                self._ticker.start()
+
+    def detach(self, sdk: SimulatedProSimConnect) -> None:
+        with self._lock:
+            self._connections.remove(sdk)
+            for name, datarefs in list(self._datarefs.items()):
+                datarefs = [dr for dr in datarefs if dr._sdk is not sdk]
+                if datarefs:
+                    self._datarefs[name] = datarefs
+                else:
+                    del self._datarefs[name]
+
+    def register(self, dataref: SimulatedDataRef) -> None:
+        if dataref.name not in self.values:
+            raise KeyError(f'Dataref "{dataref.name}" is not in the simulated catalog')
+        self.delay()
+        with self._lock:
+            self._datarefs.setdefault(dataref.name, []).append(dataref)
+
+    def unregister(self, dataref: SimulatedDataRef) -> None:
+        with self._lock:
+            datarefs = self._datarefs.get(dataref.name)
+            if datarefs is not None and dataref in datarefs:
+                datarefs.remove(dataref)
+                if not datarefs:
+                    del self._datarefs[dataref.name]
+
+    def write(self, name: str, value: object) -> None:
+        """Value written by a client. Active datarefs with an interval are notified."""
+        self.delay()
+        self.emit(name, value)
+
+    def emit(self, name: str, value: object) -> None:
+        """Change a dataref value on the server side and fire onDataChange
+
+        Args:
+            name (str): Dataref name
+            value (object): New value
+        """
+        self.values[name] = value
+        for dr in self._datarefs.get(name, ()):
+            if dr.interval > 0:
+                dr.onDataChange(dr)
+
+    def pump(self, rounds: int = 1) -> int:
+        """Synchronously change every active dataref and fire its events, ignoring
+        the dataref interval. Useful to measure callback throughput.
+
+        Args:
+            rounds (int, optional): Number of changes per active dataref. Defaults to 1.
+
+        Returns:
+            int: Number of dataref changes emitted
+        """
+        emitted = 0
+        for _ in range(rounds):
+            for name in list(self._datarefs):
+                self.emit(name, self._next_value(name))
+                emitted += 1
+        return emitted
+
+    def stop(self) -> None:
+        """Stop the background update thread"""
+        self._stop.set()
+        ticker = self._ticker
+        if ticker is not None:
+            ticker.join()
+        self._ticker = None
+
+    def _next_value(self, name: str) -> object:
+        data_type = self._types[name]
+        current = self.values[name]
+        if data_type in ("System.Double", "System.Single", "System.Decimal"):
+            return current + SIMULATED_DATA_TYPES[data_type](
+                self._random.uniform(-1, 1)
+            )
+        if data_type == "System.Boolean":
+            return not current
+        if data_type == "System.String":
+            return f"{self._random.randint(0, 9999):04d}"
+        if data_type == "System.Char":
+            return chr(self._random.randint(65, 90))
+        return (current + 1) % 100
+
+    def _run(self):
+        period = 1.0 / self.update_rate
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            for name, datarefs in list(self._datarefs.items()):
+                due = [
+                    dr
+                    for dr in datarefs
+                    if dr.interval > 0 and (now - dr._last_emit) * 1000 >= dr.interval
+                ]
+                if not due:
+                    continue
+                self.values[name] = self._next_value(name)
+                for dr in due:
+                    dr._last_emit = now
+                    dr.onDataChange(dr)
+            next_tick += period
+            self._stop.wait(max(0.0, next_tick - time.perf_counter()))
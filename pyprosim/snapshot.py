@@ -0,0 +1,231 @@
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Snapshot:
+    """Values of a set of datarefs at one point in time, taken by
+    PyProsim.snapshot() and written back by PyProsim.restore().
+
+    The file is a small header followed by a zlib compressed payload: the
+    names in one text block, a kind byte per value, an 8 byte slot per value
+    holding the numbers, and the texts in another block. Integers are kept
+    exact: int64 and uint64 in the slot, larger ones as decimal text. Values
+    which are not bool, int, float or str are stored as float when possible,
+    else as text, and cast back to the dataref type on restore.
+    """
+
+    MAGIC = b"PPSN"
+    FORMAT_VERSION = 1
+    # magic, format version, count, taken (unix time), payload length, payload crc32
+    _HEADER = struct.Struct("<4sHIdII")
+    # names length, texts length
+    _COUNTS = struct.Struct("<II")
+    KIND_NONE, KIND_BOOL, KIND_INT, KIND_FLOAT, KIND_STR, KIND_UINT, KIND_BIG_INT = (
+        range(7)
+    )
+    _INT64 = struct.Struct("<q")
+    _UINT64 = struct.Struct("<Q")
+    _DOUBLE = struct.Struct("<d")
+
+    def __init__(
+        self, names: List[str], values: List[object], taken: Optional[float] = None
+    ):
+        """Snapshot class init
+
+        Args:
+            names (List[str]): Dataref names
+            values (List[object]): Values, in the order of the names
+            taken (float, optional): Unix time of the snapshot. Defaults to None, now.
+        """
+        self.names = names
+        self.values = values
+        self.taken = time.time() if taken is None else taken
+        # Datarefs which could not be read and the reason
+        self.failed: Dict[str, Exception] = {}
+        # Time taken to read the values in seconds
+        self.duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def as_dict(self) -> Dict[str, object]:
+        return dict(zip(self.names, self.values))
+
+    def __repr__(self) -> str:
+        return (
+            f"Snapshot({len(self.names)} datarefs, "
+            f"taken={time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.taken))})"
+        )
+
+    @classmethod
+    def encode(cls, names: List[str], values: List[object]) -> bytes:
+        """Encode names and values into the uncompressed payload"""
+        kinds = bytearray(len(values))
+        numbers = bytearray(8 * len(values))
+        texts = []
+        for i, value in enumerate(values):
+            kind, value = cls._classify(value)
+            kinds[i] = kind
+            if kind == cls.KIND_FLOAT:
+                cls._DOUBLE.pack_into(numbers, 8 * i, value)
+            elif kind in (cls.KIND_INT, cls.KIND_BOOL):
+                cls._INT64.pack_into(numbers, 8 * i, value)
+            elif kind == cls.KIND_UINT:
+                cls._UINT64.pack_into(numbers, 8 * i, value)
+            elif kind == cls.KIND_STR:
+                texts.append(value)
+            elif kind == cls.KIND_BIG_INT:
+                texts.append(str(value))
+
+        # NUL separated, which is never part of a Prosim name
+        name_block = "\0".join(names).encode()
+        text_block = "\0".join(texts).encode("utf-8", "surrogatepass")
+        return (
+            cls._COUNTS.pack(len(name_block), len(text_block))
+            + name_block
+            + bytes(kinds)
+            + bytes(numbers)
+            + text_block
+        )
+
+    @classmethod
+    def decode(cls, payload: bytes, count: int) -> Tuple[List[str], List[object]]:
+        """Decode the uncompressed payload into names and values"""
+        view = memoryview(payload)
+        names_length, texts_length = cls._COUNTS.unpack_from(view)
+        offset = cls._COUNTS.size
+        names = str(view[offset : offset + names_length], "utf-8").split("\0")
+        offset += names_length
+        kinds = view[offset : offset + count]
+        offset += count
+        numbers = view[offset : offset + 8 * count]
+        offset += 8 * count
+        texts = iter(
+            str(view[offset : offset + texts_length], "utf-8", "surrogatepass").split(
+                "\0"
+            )
+        )
+        if len(names) != count or len(numbers) != 8 * count:
+            raise ValueError("Inconsistent snapshot payload")
+
+        values = []
+        for i, kind in enumerate(kinds):
+            if kind == cls.KIND_FLOAT:
+                values.append(cls._DOUBLE.unpack_from(numbers, 8 * i)[0])
+            elif kind == cls.KIND_INT:
+                values.append(cls._INT64.unpack_from(numbers, 8 * i)[0])
+            elif kind == cls.KIND_BOOL:
+                values.append(bool(cls._INT64.unpack_from(numbers, 8 * i)[0]))
+            elif kind == cls.KIND_UINT:
+                values.append(cls._UINT64.unpack_from(numbers, 8 * i)[0])
+            elif kind == cls.KIND_STR:
+                values.append(next(texts))
+            elif kind == cls.KIND_BIG_INT:
+                values.append(int(next(texts)))
+            else:
+                values.append(None)
+        return names, values
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot to a file
+
+        Args:
+            path (Path): Snapshot file path
+        """
+        compressed = zlib.compress(self.encode(self.names, self.values), 6)
+        header = self._HEADER.pack(
+            self.MAGIC,
+            self.FORMAT_VERSION,
+            len(self.names),
+            self.taken,
+            len(compressed),
+            zlib.crc32(compressed),
+        )
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(header + compressed)
+
+    @classmethod
+    def load(cls, path: Path) -> "Snapshot":
+        """Read a snapshot file
+
+        Args:
+            path (Path): Snapshot file path
+
+        Raises:
+            ValueError: Not a snapshot file, unsupported version or corrupted
+
+        Returns:
+            Snapshot: Snapshot read
+        """
+        data = Path(path).read_bytes()
+        if len(data) < cls._HEADER.size:
+            raise ValueError(f"{path} is not a snapshot file")
+        magic, version, count, taken, length, crc = cls._HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        if version != cls.FORMAT_VERSION:
+            raise ValueError(f"{path} snapshot format {version} is not supported")
+        compressed = memoryview(data)[cls._HEADER.size :]
+        if len(compressed) != length or zlib.crc32(compressed) != crc:
+            raise ValueError(f"{path} snapshot file is corrupted")
+        names, values = cls.decode(zlib.decompress(compressed), count)
+        return cls(names, values, taken)
+
+    @classmethod
+    def _classify(cls, value: object) -> Tuple[int, object]:
+        if value is None:
+            return cls.KIND_NONE, None
+        if isinstance(value, bool):
+            return cls.KIND_BOOL, int(value)
+        if isinstance(value, int):
+            if -(2**63) <= value < 2**63:
+                return cls.KIND_INT, value
+            if 0 <= value < 2**64:
+                return cls.KIND_UINT, value
+            return cls.KIND_BIG_INT, value
+        if isinstance(value, float):
+            return cls.KIND_FLOAT, value
+        if isinstance(value, str):
+            return cls.KIND_STR, value.replace("\0", "")
+        # e.g. Decimal or .NET numeric types
+        try:
+            return cls.KIND_FLOAT, float(value)
+        except (TypeError, ValueError):
+            return cls.KIND_STR, str(value).replace("\0", "")
+
+
+class RestoreReport:
+    """Result of a snapshot restore"""
+
+    def __init__(self, total: int):
+        # Datarefs in the snapshot
+        self.total = total
+        # Names of the datarefs written, in the order they were written
+        self.written: List[str] = []
+        # Datarefs already holding the snapshot value
+        self.unchanged = 0
+        # Datarefs which could not be read or written and the reason
+        self.failed: Dict[str, Exception] = {}
+        # Time reading the current values, writing, and in total, in seconds
+        self.read_duration = 0.0
+        self.write_duration = 0.0
+        self.duration = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def __repr__(self) -> str:
+        return (
+            f"RestoreReport(total={self.total}, written={len(self.written)}, "
+            f"unchanged={self.unchanged}, failed={len(self.failed)}, "
+            f"duration={self.duration * 1000:.1f} ms)"
+        )
+
+
+# Restore progress callback, called with (datarefs written, datarefs to write)
+RestoreProgress = Callable[[int, int], None]
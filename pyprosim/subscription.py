@@ -0,0 +1,123 @@
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from .filters import ChangeFilter, FilterChain
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+
+class Subscription:
+    """One consumer of a dataref, created by PyProsim.activate_dataref.
+
+    All the subscriptions of a dataref share one SDK dataref object, activated
+    at the smallest interval requested. Subscriptions asking for a larger
+    interval get their callback called at most once per their own interval.
+    Activating again with the same callback and interval, and without filters,
+    returns the same subscription with one more reference. cancel() drops a
+    reference, the SDK object is released with the last subscription.
+    """
+
+    __slots__ = (
+        "dataref",
+        "interval",
+        "callback",
+        "filters",
+        "refs",
+        "events",
+        "_handler",
+        "_last_call",
+    )
+
+    def __init__(
+        self,
+        dataref: "PyProsim.Dataref",
+        interval: int,
+        callback: Optional[Callable] = None,
+        filters: Optional[Iterable[ChangeFilter]] = None,
+    ):
+        """Subscription class init
+
+        Args:
+            dataref (PyProsim.Dataref): Subscribed dataref
+            interval (int): Requested interval in milliseconds
+            callback (Callable, optional): Change callback receiving the SDK dataref.
+                                           Defaults to None.
+            filters (Iterable[ChangeFilter], optional): Filters evaluated before the
+                                                        callback. Defaults to None.
+        """
+        self.dataref = dataref
+        self.interval = interval
+        self.callback = callback
+        self.filters: Optional[FilterChain] = None
+        self.refs = 1
+        # Change events passed to the filters and callback
+        self.events = 0
+        self._last_call = float("-inf")
+
+        # The filters are evaluated in the SDK event thread. With a dispatcher the
+        # callback is queued and runs in the dispatcher threads.
+        handler = callback
+        if callback is not None:
+            metrics = dataref._parent.metrics
+            if metrics is not None:
+                handler = metrics.wrap_callback(dataref.name, handler)
+            tracer = dataref._parent.tracer
+            if tracer is not None:
+                handler = tracer.wrap_callback(dataref.name, handler)
+            dispatcher = dataref._parent.dispatcher
+            if dispatcher is not None:
+                handler = dispatcher.wrap(self, handler)
+            if filters:
+                self.filters = FilterChain(filters)
+                handler = self.filters.wrap(handler)
+        self._handler = handler
+
+    @property
+    def name(self) -> str:
+        return self.dataref.name
+
+    @property
+    def active(self) -> bool:
+        return self.refs > 0
+
+    def cancel(self) -> None:
+        """Drop a reference to this subscription"""
+        self.dataref.deactivate(self)
+
+    def stats(self) -> dict:
+        """Subscription details and counters
+
+        Returns:
+            dict: Name, requested and effective interval, references, change events
+                  and filter counters
+        """
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "effective_interval": self.dataref.interval,
+            "refs": self.refs,
+            "callback": getattr(self.callback, "__qualname__", repr(self.callback)),
+            "events": self.events,
+            "filters": self.filters.stats() if self.filters is not None else None,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Subscription({self.name!r}, interval={self.interval}, refs={self.refs})"
+        )
+
+    def _deliver(self, dataref: object, effective_interval: int):
+        """Call the handler, throttled to the requested interval when the SDK
+        object is activated at a smaller one"""
+        handler = self._handler
+        if handler is None:
+            return
+        if self.interval > effective_interval:
+            now = time.monotonic()
+            # Half an SDK period of tolerance, the SDK events are not exactly periodic
+            if (now - self._last_call) * 1000 < self.interval - effective_interval / 2:
+                return
+            self._last_call = now
+        self.events += 1
+        handler(dataref)
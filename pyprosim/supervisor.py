@@ -0,0 +1,142 @@
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+logger = logging.getLogger(__name__)
+
+
+class ReconnectSupervisor:
+    """Keeps a PyProsim connected, replacing the connection polling loops.
+
+    The supervisor connects and, whenever the connection is lost, tries again
+    with an exponential backoff. On every connection PyProsim activates again
+    the datarefs subscribed so far, keeping the Dataref objects when the
+    catalog did not change (see PyProsim.connection_stats).
+    """
+
+    def __init__(
+        self,
+        prosim: "PyProsim",
+        ip_addr: str,
+        initial_delay: float = 0.25,
+        max_delay: float = 10.0,
+        factor: float = 2.0,
+        jitter: float = 0.1,
+    ):
+        """ReconnectSupervisor class init
+
+        Args:
+            prosim (PyProsim): PyProsim to keep connected
+            ip_addr (str): Host IP address when ProSim is running
+            initial_delay (float, optional): Seconds to wait for the first attempts.
+                                             Defaults to 0.25.
+            max_delay (float, optional): Maximum seconds between attempts. Defaults to 10.0.
+            factor (float, optional): Delay growth after each failed attempt. Defaults to 2.0.
+            jitter (float, optional): Random fraction added to the delays, so many clients
+                                      do not reconnect at once. Defaults to 0.1.
+        """
+        self.prosim = prosim
+        self.ip_addr = ip_addr
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        # Counters and timings
+        self.attempts = 0
+        self.connections = 0
+        self.last_downtime: Optional[float] = None
+        self.last_reconnect: Optional[float] = None
+
+    def start(self) -> "ReconnectSupervisor":
+        """Start connecting in a background thread
+
+        Returns:
+            ReconnectSupervisor: This supervisor
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pyprosim-supervisor", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop supervising the connection. The connection is not closed."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ReconnectSupervisor":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def wait_connected(self, timeout: float = None) -> bool:
+        """Wait until PyProsim is connected
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: True if connected
+        """
+        return self.prosim._connected.wait(timeout)
+
+    def stats(self) -> dict:
+        """Reconnection counters and timings, in seconds
+
+        Returns:
+            dict: Connection attempts, connections, the last downtime and the time from
+                  the first attempt to the connection, plus the catalog and resubscribe
+                  timings of the last connection
+        """
+        stats = {
+            "connected": self.prosim.connected,
+            "attempts": self.attempts,
+            "connections": self.connections,
+            "last_downtime": self.last_downtime,
+            "last_reconnect": self.last_reconnect,
+        }
+        stats.update(self.prosim.connection_stats)
+        return stats
+
+    def _run(self):
+        prosim = self.prosim
+        disconnected_at = None
+        while not self._stop.is_set():
+            # Wait for a disconnection, checking now and then whether to stop
+            if prosim.connected:
+                if not prosim._disconnected.wait(0.25):
+                    continue
+                disconnected_at = time.monotonic()
+                logger.info("Prosim disconnected, reconnecting")
+
+            delay = self.initial_delay
+            first_attempt = time.monotonic()
+            while not self._stop.is_set():
+                self.attempts += 1
+                try:
+                    prosim.connect(self.ip_addr, synchronous=False)
+                except Exception as e:
+                    logger.warning("Prosim connection attempt failed: %s", e)
+                wait = delay * (1 + random.uniform(0, self.jitter))
+                if prosim._connected.wait(wait):
+                    break
+                delay = min(delay * self.factor, self.max_delay)
+            else:
+                return
+
+            now = time.monotonic()
+            self.connections += 1
+            self.last_reconnect = now - first_attempt
+            if disconnected_at is not None:
+                self.last_downtime = now - disconnected_at
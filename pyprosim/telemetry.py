@@ -0,0 +1,486 @@
+import json
+import mmap
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import PyProsimImportException
+from .pyprosim import PyProsim
+from .simulator import SimulatedBackend, SimulatedDataRefDescription
+from .subscription import Subscription
+
+
+class TelemetryFormat:
+    """Layout of the telemetry log files.
+
+    The file starts with a header holding the recorded datarefs (JSON), followed
+    by chunks appended as the recording goes. Each chunk stores its events as
+    columns, float64 columns first so every column is aligned when the file is
+    memory-mapped:
+
+    - chunk header: magic, event count, text block length, reserved
+    - time: float64, seconds since the epoch
+    - value: float64, numeric value (NaN for strings). Integers beyond 2^53, e.g.
+      large UInt64 values, are rounded here and kept exactly in the text block.
+    - id: uint32, index of the dataref in the header
+    - text_length: uint32, length of the string value (0 for other numbers)
+    - kind: uint8, value type (see KIND_*)
+    - text block: UTF-8 string values, padded to 8 bytes
+    """
+
+    MAGIC = b"PPTL"
+    VERSION = 1
+    # magic, version, reserved, header JSON length
+    HEADER = struct.Struct("<4sHHI")
+    CHUNK_MAGIC = b"PPCK"
+    # magic, count, text block length, reserved
+    CHUNK_HEADER = struct.Struct("<4sIII")
+    KIND_FLOAT = 0
+    KIND_BOOL = 1
+    KIND_INT = 2
+    KIND_STR = 3
+    KIND_BIG_INT = 4
+    # Largest integer magnitude a float64 value holds exactly
+    MAX_EXACT_INT = 2**53
+    # Bytes per event, excluding strings
+    EVENT_SIZE = 8 + 8 + 4 + 4 + 1
+
+    @staticmethod
+    def padding(length: int) -> int:
+        return -length % 8
+
+
+class TelemetryRecorder:
+    """Records every change of a set of datarefs into a telemetry log.
+
+    The change listeners only timestamp and queue the events, a writer thread
+    encodes and appends them in chunks, so recording does not slow down the
+    dataref callbacks.
+    """
+
+    def __init__(
+        self,
+        prosim: PyProsim,
+        path: Path,
+        datarefs: Iterable[str],
+        interval: Optional[int] = None,
+        chunk_size: int = 4096,
+        flush_interval: float = 0.5,
+    ):
+        """TelemetryRecorder class init
+
+        Args:
+            prosim (PyProsim): Connected PyProsim
+            path (Path): Log file path. An existing file is overwritten.
+            datarefs (Iterable[str]): Dataref names or patterns (see PyProsim.resolve)
+            interval (int, optional): Activation interval in milliseconds for the datarefs
+                                      not active yet. Defaults to None (they must be active).
+            chunk_size (int, optional): Maximum events per chunk. Defaults to 4096.
+            flush_interval (float, optional): Maximum seconds between chunks. Defaults to 0.5.
+        """
+        self.prosim = prosim
+        self.path = Path(path)
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.names: List[str] = []
+        for pattern in datarefs:
+            for name in prosim.resolve(pattern):
+                if name not in self.names:
+                    self.names.append(name)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        self._events = deque()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        self._file = None
+        # Subscriptions of the datarefs activated by the recorder
+        self._subscriptions: List[Subscription] = []
+        # Counters
+        self.recorded = 0
+        self.chunks = 0
+
+    def start(self) -> "TelemetryRecorder":
+        """Write the log header and start recording
+
+        Returns:
+            TelemetryRecorder: This recorder
+        """
+        datarefs = []
+        for name in self.names:
+            dataref = self.prosim.get_dataref_obj(name)
+            datarefs.append(
+                {
+                    "name": name,
+                    "description": dataref.description,
+                    "data_type": self.prosim._catalog.type_name(
+                        self.prosim._catalog.index[name]
+                    ),
+                    "data_unit": dataref.data_unit,
+                    "can_read": dataref.can_read,
+                    "can_write": dataref.can_write,
+                }
+            )
+        header = json.dumps({"datarefs": datarefs, "start": time.time()}).encode()
+        header += b" " * TelemetryFormat.padding(
+            TelemetryFormat.HEADER.size + len(header)
+        )
+        self._file = open(self.path, "wb")
+        self._file.write(
+            TelemetryFormat.HEADER.pack(
+                TelemetryFormat.MAGIC, TelemetryFormat.VERSION, 0, len(header)
+            )
+            + header
+        )
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pyprosim-recorder", daemon=True
+        )
+        self._thread.start()
+        for name in self.names:
+            self.prosim.add_change_listener(name, self._on_change)
+            if (
+                self.interval is not None
+                and not self.prosim.get_dataref_obj(name).active
+            ):
+                self._subscriptions.append(
+                    self.prosim.activate_dataref(name, self.interval)
+                )
+        return self
+
+    def stop(self) -> None:
+        """Stop recording and write the remaining events"""
+        for name in self.names:
+            self.prosim.remove_change_listener(name, self._on_change)
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+        self._stop.set()
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self) -> "TelemetryRecorder":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _on_change(self, name: str, value: object):
+        self._events.append((time.time(), self._ids[name], value))
+
+    def _run(self):
+        events = self._events
+        last_chunk = time.monotonic()
+        while not self._stop.wait(min(self.flush_interval, 0.05)):
+            while len(events) >= self.chunk_size:
+                self._write_chunk(self.chunk_size)
+                last_chunk = time.monotonic()
+            if events and time.monotonic() - last_chunk >= self.flush_interval:
+                self._write_chunk(len(events))
+                last_chunk = time.monotonic()
+        while events:
+            self._write_chunk(min(len(events), self.chunk_size))
+        self._file.flush()
+
+    def _write_chunk(self, count: int):
+        events = self._events
+        times = array("d")
+        values = array("d")
+        ids = array("I")
+        text_lengths = array("I")
+        kinds = array("B")
+        texts = []
+        for _ in range(count):
+            timestamp, dataref_id, value = events.popleft()
+            times.append(timestamp)
+            ids.append(dataref_id)
+            text = b""
+            if isinstance(value, bool):
+                kind, number = TelemetryFormat.KIND_BOOL, float(value)
+            elif isinstance(value, int):
+                number = float(value)
+                if (
+                    -TelemetryFormat.MAX_EXACT_INT
+                    <= value
+                    <= TelemetryFormat.MAX_EXACT_INT
+                ):
+                    kind = TelemetryFormat.KIND_INT
+                else:
+                    kind = TelemetryFormat.KIND_BIG_INT
+                    text = str(value).encode()
+            elif isinstance(value, float):
+                kind, number = TelemetryFormat.KIND_FLOAT, value
+            elif isinstance(value, str):
+                kind, number = TelemetryFormat.KIND_STR, float("nan")
+                text = value.encode()
+            else:
+                # Other numeric types, e.g. Decimal, are stored as float
+                try:
+                    kind, number = TelemetryFormat.KIND_FLOAT, float(value)
+                except (TypeError, ValueError):
+                    kind, number = TelemetryFormat.KIND_STR, float("nan")
+                    text = str(value).encode()
+            values.append(number)
+            kinds.append(kind)
+            text_lengths.append(len(text))
+            texts.append(text)
+
+        text_block = b"".join(texts)
+        columns = (
+            times.tobytes()
+            + values.tobytes()
+            + ids.tobytes()
+            + text_lengths.tobytes()
+            + kinds.tobytes()
+        )
+        columns += b"\0" * TelemetryFormat.padding(len(columns))
+        text_block += b"\0" * TelemetryFormat.padding(len(text_block))
+        self._file.write(
+            TelemetryFormat.CHUNK_HEADER.pack(
+                TelemetryFormat.CHUNK_MAGIC, count, len(text_block), 0
+            )
+            + columns
+            + text_block
+        )
+        self.recorded += count
+        self.chunks += 1
+
+
+class TelemetryLog:
+    """Reader of a telemetry log. The file is memory-mapped and the chunk columns
+    are exposed without copying them."""
+
+    def __init__(self, path: Path):
+        """TelemetryLog class init
+
+        Args:
+            path (Path): Log file path
+
+        Raises:
+            ValueError: The file is not a telemetry log
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_length = TelemetryFormat.HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != TelemetryFormat.MAGIC or version != TelemetryFormat.VERSION:
+            raise ValueError(f"{self.path} is not a telemetry log")
+        offset = TelemetryFormat.HEADER.size
+        header = json.loads(bytes(self._mmap[offset : offset + header_length]))
+        self.datarefs: List[dict] = header["datarefs"]
+        self.start_time: float = header["start"]
+        self.names = [dataref["name"] for dataref in self.datarefs]
+
+        # Scan the chunks: (count, columns offset, text block offset, text block length)
+        self._chunks: List[Tuple[int, int, int, int]] = []
+        offset += header_length
+        size = len(self._mmap)
+        while offset + TelemetryFormat.CHUNK_HEADER.size <= size:
+            magic, count, text_length, _ = TelemetryFormat.CHUNK_HEADER.unpack_from(
+                self._mmap, offset
+            )
+            columns_length = count * TelemetryFormat.EVENT_SIZE
+            columns_length += TelemetryFormat.padding(columns_length)
+            columns = offset + TelemetryFormat.CHUNK_HEADER.size
+            end = columns + columns_length + text_length
+            if magic != TelemetryFormat.CHUNK_MAGIC or end > size:
+                # Truncated chunk, e.g. the recording is still running
+                break
+            self._chunks.append((count, columns, columns + columns_length, text_length))
+            offset = end
+
+    def __len__(self) -> int:
+        return sum(chunk[0] for chunk in self._chunks)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def chunk_columns(self, chunk: int) -> Dict[str, memoryview]:
+        """Columns of a chunk, as memoryviews of the mapped file
+
+        Args:
+            chunk (int): Chunk number
+
+        Returns:
+            Dict[str, memoryview]: time, value, id, text_length and kind columns
+        """
+        count, offset, _, _ = self._chunks[chunk]
+        view = memoryview(self._mmap)
+        columns = {}
+        for name, code, size in (
+            ("time", "d", 8),
+            ("value", "d", 8),
+            ("id", "I", 4),
+            ("text_length", "I", 4),
+            ("kind", "B", 1),
+        ):
+            columns[name] = view[offset : offset + count * size].cast(code)
+            offset += count * size
+        return columns
+
+    def events(self) -> Iterator[Tuple[float, str, object]]:
+        """Iterate over the recorded events
+
+        Yields:
+            Tuple[float, str, object]: Timestamp, dataref name and value
+        """
+        names = self.names
+        for chunk, (count, _, text_offset, _) in enumerate(self._chunks):
+            columns = self.chunk_columns(chunk)
+            times, values, ids = columns["time"], columns["value"], columns["id"]
+            text_lengths, kinds = columns["text_length"], columns["kind"]
+            for i in range(count):
+                kind = kinds[i]
+                if kind == TelemetryFormat.KIND_STR:
+                    length = text_lengths[i]
+                    value = self._mmap[text_offset : text_offset + length].decode()
+                    text_offset += length
+                elif kind == TelemetryFormat.KIND_BIG_INT:
+                    length = text_lengths[i]
+                    value = int(self._mmap[text_offset : text_offset + length])
+                    text_offset += length
+                elif kind == TelemetryFormat.KIND_BOOL:
+                    value = bool(values[i])
+                elif kind == TelemetryFormat.KIND_INT:
+                    value = int(values[i])
+                else:
+                    value = values[i]
+                yield times[i], names[ids[i]], value
+
+    def to_numpy(self) -> Dict[str, object]:
+        """Numeric columns of the whole log as NumPy arrays. Each chunk is mapped
+        without copying, the chunks are concatenated into one array per column.
+
+        Raises:
+            PyProsimImportException: NumPy is not installed
+
+        Returns:
+            Dict[str, numpy.ndarray]: time, value, id, text_length and kind columns
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise PyProsimImportException(e)
+
+        layout = (
+            ("time", numpy.float64),
+            ("value", numpy.float64),
+            ("id", numpy.uint32),
+            ("text_length", numpy.uint32),
+            ("kind", numpy.uint8),
+        )
+        columns = {name: [] for name, _ in layout}
+        for count, offset, _, _ in self._chunks:
+            for name, dtype in layout:
+                columns[name].append(numpy.frombuffer(self._mmap, dtype, count, offset))
+                offset += count * numpy.dtype(dtype).itemsize
+        return {
+            name: (
+                numpy.concatenate(columns[name])
+                if columns[name]
+                else numpy.empty(0, dtype)
+            )
+            for name, dtype in layout
+        }
+
+
+class ReplayBackend(SimulatedBackend):
+    """Simulated backend replaying a telemetry log. The recorded datarefs form the
+    catalog, and their recorded changes are emitted as onDataChange events of the
+    active datarefs, so PyProsim callbacks see them as if they came from ProSim.
+
+    By default the replay starts with the first connection. The datarefs activated
+    by the connect callback may miss the first events, use autostart=False and
+    call start() once the datarefs are active to replay every event.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        speed: Optional[float] = 1.0,
+        latency: float = 0.0,
+        autostart: bool = True,
+    ):
+        """ReplayBackend class init
+
+        Args:
+            path (Path): Telemetry log path
+            speed (float, optional): Replay speed, 1.0 is real time, 2.0 twice as fast.
+                                     None replays as fast as possible. Defaults to 1.0.
+            latency (float, optional): Seconds added to every simulated round trip.
+                                       Defaults to 0.0.
+            autostart (bool, optional): Start the replay with the first connection.
+                                        Defaults to True.
+        """
+        self.log = TelemetryLog(path)
+        catalog = [
+            SimulatedDataRefDescription(
+                name=dataref["name"],
+                description=dataref["description"],
+                data_type=dataref["data_type"],
+                data_unit=dataref["data_unit"],
+                can_read=dataref["can_read"],
+                can_write=dataref["can_write"],
+            )
+            for dataref in self.log.datarefs
+        ]
+        super().__init__(catalog=catalog, latency=latency)
+        self.speed = speed
+        self.autostart = autostart
+        self.replayed = 0
+        self.finished = threading.Event()
+        self._replay: threading.Thread = None
+
+    def attach(self, sdk) -> None:
+        super().attach(sdk)
+        if self.autostart:
+            self.start()
+
+    def start(self) -> None:
+        """Start the replay, if not started yet"""
+        with self._lock:
+            if self._replay is None:
+                self._replay = threading.Thread(
+                    target=self._run_replay, name="pyprosim-replay", daemon=True
+                )
+                self._replay.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for the end of the replay
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: True if the replay finished
+        """
+        return self.finished.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop the replay and the background update thread"""
+        super().stop()
+        replay = self._replay
+        if replay is not None and replay is not threading.current_thread():
+            replay.join()
+
+    def _run_replay(self):
+        start = time.perf_counter()
+        first = None
+        for timestamp, name, value in self.log.events():
+            if self._stop.is_set():
+                break
+            if self.speed:
+                if first is None:
+                    first = timestamp
+                delay = (timestamp - first) / self.speed - (time.perf_counter() - start)
+                if delay > 0 and self._stop.wait(delay):
+                    break
+            self.emit(name, value)
+            self.replayed += 1
+        self.finished.set()
@@ -0,0 +1,196 @@
+import itertools
+import json
+import os
+import signal
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+
+class Tracer:
+    """Records spans of the PyProsim pipeline into a preallocated ring buffer, to
+    be dumped in the Chrome trace format (chrome://tracing, ui.perfetto.dev).
+
+    Enabled with PyProsim(tracer=Tracer()), it records:
+
+    - connect: the connect() call
+    - catalog: the catalog download and parse on connection
+    - activate: each dataref activation
+    - event: the arrival of an SDK change event (instant)
+    - callback: each subscription callback, in the thread running it
+    - set_value: each set_value call
+
+    Once the buffer is full the oldest spans are overwritten.
+    """
+
+    KINDS = ("connect", "catalog", "activate", "event", "callback", "set_value")
+    CONNECT, CATALOG, ACTIVATE, EVENT, CALLBACK, SET_VALUE = range(len(KINDS))
+
+    def __init__(self, capacity: int = 65536):
+        """Tracer class init
+
+        Args:
+            capacity (int, optional): Maximum number of spans kept. Defaults to 65536.
+        """
+        self.capacity = capacity
+        self._origin = time.perf_counter()
+        # Span columns, a slot is reserved by the lock free counter
+        self._start = array("d", bytes(8 * capacity))
+        self._duration = array("d", bytes(8 * capacity))
+        self._name = array("I", bytes(4 * capacity))
+        self._kind = array("B", bytes(capacity))
+        self._thread = array("Q", bytes(8 * capacity))
+        self._counter = itertools.count()
+        self._recorded = 0
+        # Interned span names
+        self._names: List[str] = [""]
+        self._ids: Dict[str, int] = {"": 0}
+        self._lock = threading.Lock()
+
+    def intern(self, name: str) -> int:
+        """Id of a span name, used by record()"""
+        name_id = self._ids.get(name)
+        if name_id is None:
+            with self._lock:
+                name_id = self._ids.get(name)
+                if name_id is None:
+                    name_id = self._ids[name] = len(self._names)
+                    self._names.append(name)
+        return name_id
+
+    def record(self, kind: int, name_id: int, start: float, end: float = None) -> None:
+        """Record a span
+
+        Args:
+            kind (int): Span kind, e.g. Tracer.CALLBACK
+            name_id (int): Span name id, see intern()
+            start (float): time.perf_counter() value at the span start
+            end (float, optional): time.perf_counter() value at the span end.
+                                   Defaults to None, an instant event.
+        """
+        index = next(self._counter)
+        slot = index % self.capacity
+        self._start[slot] = start
+        self._duration[slot] = -1.0 if end is None else end - start
+        self._name[slot] = name_id
+        self._kind[slot] = kind
+        self._thread[slot] = threading.get_ident()
+        self._recorded = index + 1
+
+    @contextmanager
+    def span(self, kind: int, name: str = "") -> Iterator[None]:
+        """Record the span of a with block
+
+        Args:
+            kind (int): Span kind, e.g. Tracer.CONNECT
+            name (str, optional): Span name. Defaults to "".
+        """
+        name_id = self.intern(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name_id, start, time.perf_counter())
+
+    def wrap_callback(self, name: str, callback: Callable) -> Callable:
+        """Record the spans of a subscription callback
+
+        Args:
+            name (str): Dataref name
+            callback (Callable): Subscription callback
+
+        Returns:
+            Callable: Traced callback
+        """
+        record = self.record
+        name_id = self.intern(name)
+        perf_counter = time.perf_counter
+
+        def traced(*args):
+            start = perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                record(Tracer.CALLBACK, name_id, start, perf_counter())
+
+        return traced
+
+    def clear(self) -> None:
+        """Forget the recorded spans"""
+        self._counter = itertools.count()
+        self._recorded = 0
+
+    def events(self) -> List[dict]:
+        """Recorded spans as Chrome trace events, oldest first
+
+        Returns:
+            List[dict]: Trace events
+        """
+        recorded = self._recorded
+        first = max(0, recorded - self.capacity)
+        names = list(self._names)
+        pid = os.getpid()
+        events = []
+        for index in range(first, recorded):
+            slot = index % self.capacity
+            kind = self.KINDS[self._kind[slot]]
+            name = names[self._name[slot]]
+            event = {
+                "name": f"{kind} {name}" if name else kind,
+                "cat": kind,
+                "ts": (self._start[slot] - self._origin) * 1e6,
+                "pid": pid,
+                "tid": self._thread[slot],
+            }
+            duration = self._duration[slot]
+            if duration < 0:
+                event["ph"] = "i"
+                event["s"] = "t"
+            else:
+                event["ph"] = "X"
+                event["dur"] = duration * 1e6
+            events.append(event)
+        events.sort(key=lambda e: e["ts"])
+
+        # Thread names
+        for thread in threading.enumerate():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread.ident,
+                    "args": {"name": thread.name},
+                }
+            )
+        return events
+
+    def dump(self, path: Path) -> int:
+        """Write the recorded spans as a Chrome trace JSON file
+
+        Args:
+            path (Path): Output file path
+
+        Returns:
+            int: Number of trace events written
+        """
+        events = self.events()
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def install_signal_handler(self, path: Path, signum: int = None) -> None:
+        """Dump the spans to a file whenever the process receives a signal, e.g.
+        "kill -USR1 <pid>". Must be called from the main thread.
+
+        Args:
+            path (Path): Output file path, overwritten on every signal
+            signum (int, optional): Signal number. Defaults to SIGUSR1, or SIGBREAK
+                                    (Ctrl+Break) on Windows.
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None) or signal.SIGBREAK
+        signal.signal(signum, lambda *_: self.dump(path))
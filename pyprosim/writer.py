@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .pyprosim import PyProsim
+
+logger = logging.getLogger(__name__)
+
+# Marker of "no value", None is a valid value to compare with
+_NO_VALUE = object()
+
+
+class WritePipeline:
+    """Optional write stage of a dataref, reducing the writes sent to Prosim.
+
+    - Deadband: values within the deadband of the last value sent are suppressed.
+      With the default deadband of 0 only repeated values are suppressed.
+    - Rate limit: at most max_rate writes per second are sent. Writes arriving
+      faster are coalesced, the latest one is kept (last write wins) and sent by
+      the WriteFlusher as soon as the rate allows, or by flush().
+
+    Note the deadband compares with the last value sent by this pipeline, not with
+    the current Prosim value. Call reset() if Prosim may have changed the value.
+    """
+
+    def __init__(
+        self,
+        dataref: "PyProsim.Dataref",
+        flusher: "WriteFlusher",
+        deadband: float = 0.0,
+        max_rate: Optional[float] = None,
+    ):
+        """WritePipeline class init
+
+        Args:
+            dataref (PyProsim.Dataref): Dataref written through this pipeline
+            flusher (WriteFlusher): Flusher sending the coalesced writes
+            deadband (float, optional): Minimum change to send a new value. Defaults to 0.0.
+            max_rate (float, optional): Maximum writes per second. Defaults to None (no limit).
+        """
+        self._dataref = dataref
+        self._flusher = flusher
+        self.deadband = deadband
+        self.min_period = 1.0 / max_rate if max_rate else 0.0
+        self._lock = threading.Lock()
+        self._last_value = _NO_VALUE
+        self._last_time = float("-inf")
+        # (value, casted value) waiting for the rate limit
+        self._pending = None
+        # Counters
+        self.sent = 0
+        self.suppressed = 0
+        self.coalesced = 0
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def write(self, value: object) -> None:
+        """Write a value through the pipeline
+
+        Args:
+            value (object): Value to write. Cast errors are raised here, even
+                            if the value is sent later.
+        """
+        casted = self._dataref._cast(value)
+        with self._lock:
+            if self._pending is None and self._within_deadband(value):
+                self.suppressed += 1
+                return
+            now = time.monotonic()
+            if now - self._last_time >= self.min_period:
+                self._pending = None
+                self._send(value, casted, now)
+                return
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (value, casted)
+        self._flusher.schedule(self)
+
+    def flush(self) -> bool:
+        """Send the pending write now, ignoring the rate limit
+
+        Returns:
+            bool: True if a value was sent
+        """
+        with self._lock:
+            return self._flush(time.monotonic())
+
+    def tick(self, now: float) -> bool:
+        """Send the pending write if the rate limit allows it
+
+        Args:
+            now (float): time.monotonic() value
+
+        Returns:
+            bool: True if a write is still pending
+        """
+        with self._lock:
+            if self._pending is not None and now - self._last_time >= self.min_period:
+                self._flush(now)
+            return self._pending is not None
+
+    def reset(self) -> None:
+        """Forget the last value sent, the next write is not suppressed"""
+        with self._lock:
+            self._last_value = _NO_VALUE
+
+    def stats(self) -> dict:
+        """Pipeline counters
+
+        Returns:
+            dict: Writes sent, suppressed by the deadband and coalesced
+        """
+        return {
+            "sent": self.sent,
+            "suppressed": self.suppressed,
+            "coalesced": self.coalesced,
+            "pending": self.pending,
+        }
+
+    def _flush(self, now: float) -> bool:
+        if self._pending is None:
+            return False
+        value, casted = self._pending
+        self._pending = None
+        if self._within_deadband(value):
+            self.suppressed += 1
+            return False
+        self._send(value, casted, now)
+        return True
+
+    def _send(self, value: object, casted: object, now: float):
+        self._dataref._send(casted)
+        self._last_value = value
+        self._last_time = now
+        self.sent += 1
+
+    def _within_deadband(self, value: object) -> bool:
+        last = self._last_value
+        if last is _NO_VALUE:
+            return False
+        try:
+            return abs(value - last) <= self.deadband
+        except TypeError:
+            return value == last
+
+
+class WriteFlusher:
+    """Background thread sending the writes coalesced by the write pipelines"""
+
+    def __init__(self, tick: float = 0.005):
+        """WriteFlusher class init
+
+        Args:
+            tick (float, optional): Maximum time in seconds between flushes. Defaults to 0.005.
+        """
+        self.tick = tick
+        self._scheduled = set()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+
+    def schedule(self, pipeline: WritePipeline) -> None:
+        """Flush a pipeline once its rate limit allows it
+
+        Args:
+            pipeline (WritePipeline): Pipeline with a pending write
+        """
+        with self._condition:
+            self._scheduled.add(pipeline)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pyprosim-write-flusher", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._scheduled:
+                    self._condition.wait()
+                scheduled = list(self._scheduled)
+            now = time.monotonic()
+            done = []
+            for pipeline in scheduled:
+                try:
+                    if not pipeline.tick(now):
+                        done.append(pipeline)
+                except Exception:
+                    logger.exception("Dataref write failed")
+                    done.append(pipeline)
+            with self._condition:
+                # A pipeline may have got a new write meanwhile
+                self._scheduled.difference_update(p for p in done if not p.pending)
+            time.sleep(self.tick)
@@ -0,0 +1,43 @@
+import socket
+
+import pytest
+
+from pyprosim import PyProsim, SimulatedBackend
+from pyprosim.simulator import SimulatedDataRefDescription
+
+
+@pytest.fixture
+def backend() -> SimulatedBackend:
+    catalog = [
+        SimulatedDataRefDescription("test.uint64", "", "System.UInt64", "", True, True),
+        SimulatedDataRefDescription("test.int32", "", "System.Int32", "", True, True),
+        SimulatedDataRefDescription("test.double", "", "System.Double", "", True, True),
+        SimulatedDataRefDescription("test.string", "", "System.String", "", True, True),
+        SimulatedDataRefDescription("test.bool", "", "System.Boolean", "", True, True),
+        SimulatedDataRefDescription(
+            "test.readonly", "", "System.Double", "", True, False
+        ),
+    ]
+    return SimulatedBackend(catalog=catalog)
+
+
+@pytest.fixture
+def prosim(backend: SimulatedBackend) -> PyProsim:
+    prosim = PyProsim(backend=backend)
+    prosim.connect("localhost")
+    return prosim
+
+
+@pytest.fixture
+def free_port() -> int:
+    """Port free for TCP and UDP on the loopback interface"""
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp:
+            tcp.bind(("127.0.0.1", 0))
+            port = tcp.getsockname()[1]
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp:
+                try:
+                    udp.bind(("127.0.0.1", port))
+                except OSError:
+                    continue
+        return port
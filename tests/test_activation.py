@@ -0,0 +1,49 @@
+from pyprosim import PyProsim, SimulatedBackend
+
+
+def connect() -> PyProsim:
+    prosim = PyProsim(backend=SimulatedBackend(catalog_size=100))
+    prosim.connect("localhost")
+    return prosim
+
+
+def test_patterns_and_tuples():
+    prosim = connect()
+    received = []
+    report = prosim.activate_many(
+        [
+            ("aircraft.engines.*.n1", 50, lambda dataref: received.append(dataref)),
+            "aircraft.electrical.",
+            "system.gates.B_GATE_1",
+        ],
+        interval=200,
+    )
+    assert report.ok
+    assert "aircraft.engines.1.n1" in report.activated
+    assert "aircraft.electrical.bus1.voltage" in report.activated
+    assert "system.gates.B_GATE_1" in report.activated
+    assert len(report.activated) == 10 + 10 + 1
+    assert prosim.get_dataref_obj("aircraft.engines.2.n1").interval == 50
+    assert prosim.get_dataref_obj("system.gates.B_GATE_1").interval == 200
+
+    prosim.backend.emit("aircraft.engines.3.n1", 80.0)
+    assert len(received) == 1
+
+
+def test_first_request_of_a_dataref_wins():
+    prosim = connect()
+    report = prosim.activate_many(
+        [("aircraft.engines.1.n1", 10), ("aircraft.engines.1.", 500)]
+    )
+    assert report.activated.count("aircraft.engines.1.n1") == 1
+    assert prosim.get_dataref_obj("aircraft.engines.1.n1").interval == 10
+    assert prosim.get_dataref_obj("aircraft.engines.1.thrust").interval == 500
+
+
+def test_failures_do_not_abort_the_batch():
+    prosim = connect()
+    report = prosim.activate_many(["unknown.dataref", "nothing.*", "aircraft.fuel."])
+    assert not report.ok
+    assert list(report.failed) == ["unknown.dataref"]
+    assert report.unmatched == ["nothing.*"]
+    assert len(report.activated) == 10
@@ -0,0 +1,70 @@
+import pytest
+
+from pyprosim.exceptions import PyProsimDatarefException
+
+
+def evaluate(prosim, state, changes: int = 0) -> int:
+    """Evaluate the intervals one second after the window start"""
+    state.changes = changes
+    return prosim._adaptive.evaluate(state.window_start + 1.0)
+
+
+@pytest.fixture(autouse=True)
+def stop_controller(prosim):
+    yield
+    if prosim._adaptive is not None:
+        prosim._adaptive.stop()
+
+
+def test_rarely_changing_dataref_is_polled_less(prosim):
+    prosim.activate_dataref("test.double", 100, lambda dataref: None)
+    state = prosim.set_adaptive_interval("test.double", 20, 1000)
+    dataref = prosim.get_dataref_obj("test.double")
+    assert state.interval == dataref.interval == 100
+
+    assert evaluate(prosim, state) == 1
+    assert state.interval == dataref.interval == 200
+    assert state.stats()["adjustments"] == 1
+
+
+def test_changing_dataref_is_polled_more_down_to_the_demand(prosim):
+    prosim.activate_dataref("test.double", 0, lambda dataref: None)
+    state = prosim.set_adaptive_interval("test.double", 20, 1000)
+    assert state.interval == 1000
+    evaluate(prosim, state, changes=100)
+    assert state.interval == 500
+
+    prosim.activate_dataref("test.double", 400, lambda dataref: None)
+    evaluate(prosim, state, changes=100)
+    # Not below the 400 ms asked by a subscription
+    assert state.interval == 400
+
+
+def test_unused_dataref_goes_to_the_upper_bound(prosim):
+    subscription = prosim.activate_dataref("test.double", 100, lambda dataref: None)
+    state = prosim.set_adaptive_interval("test.double", 20, 800)
+    subscription.cancel()
+    evaluate(prosim, state, changes=100)
+    assert state.interval == prosim.get_dataref_obj("test.double").interval == 800
+
+
+def test_clear_goes_back_to_the_subscription_intervals(prosim):
+    prosim.activate_dataref("test.double", 100, lambda dataref: None)
+    state = prosim.set_adaptive_interval("test.double", 20, 1000)
+    evaluate(prosim, state)
+    prosim.clear_adaptive_interval("test.double")
+    assert prosim.get_dataref_obj("test.double").interval == 100
+
+
+def test_interval_stays_within_the_freshness_target(prosim):
+    prosim.activate_dataref("test.double", 500, lambda dataref: None)
+    state = prosim.set_adaptive_interval("test.double", 20, 1000, freshness=300)
+    assert state.interval == 300
+    evaluate(prosim, state)
+    # The subscription asks for 500 ms, the freshness target wins
+    assert state.interval == prosim.get_dataref_obj("test.double").interval == 300
+
+
+def test_invalid_bounds_are_rejected(prosim):
+    with pytest.raises(PyProsimDatarefException):
+        prosim.set_adaptive_interval("test.double", 100, 50)
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from pyprosim import AsyncPyProsim
+
+
+def test_wait_for_a_condition(backend):
+    async def main():
+        prosim = AsyncPyProsim(backend=backend)
+        await prosim.connect("localhost", timeout=1.0)
+        assert prosim.connected
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, backend.emit, "test.double", 10.0)
+        loop.call_later(0.02, backend.emit, "test.double", 25.0)
+        return await prosim.wait_for("test.double", lambda v: v > 20, timeout=1.0)
+
+    assert asyncio.run(main()) == 25.0
+
+
+def test_wait_for_times_out(backend):
+    async def main():
+        prosim = AsyncPyProsim(backend=backend)
+        await prosim.connect("localhost", timeout=1.0)
+        await prosim.wait_for("test.double", lambda v: v > 20, timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+
+
+def test_changes_stream(backend):
+    async def main():
+        prosim = AsyncPyProsim(backend=backend)
+        await prosim.connect("localhost", timeout=1.0)
+        loop = asyncio.get_running_loop()
+        for i, name in enumerate(("test.double", "test.int32", "test.double")):
+            loop.call_later(0.01 * (i + 1), backend.emit, name, i + 1)
+        received = []
+        async for name, value in prosim.changes("test.*"):
+            received.append((name, value))
+            if len(received) == 3:
+                break
+        return received
+
+    assert asyncio.run(main()) == [
+        ("test.double", 1),
+        ("test.int32", 2),
+        ("test.double", 3),
+    ]
+
+
+def test_wait_for_skips_the_condition_without_value(backend):
+    async def main():
+        prosim = AsyncPyProsim(backend=backend)
+        await prosim.connect("localhost", timeout=1.0)
+        # No value received yet
+        prosim.prosim.get_value = lambda name: None
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, backend.emit, "test.double", 25.0)
+        return await prosim.wait_for("test.double", lambda v: v > 20, timeout=1.0)
+
+    assert asyncio.run(main()) == 25.0
+
+
+def test_connect_returns_when_already_connected(backend):
+    async def main():
+        prosim = AsyncPyProsim(backend=backend)
+        await prosim.connect("localhost", timeout=1.0)
+        prosim.prosim.connect = lambda *args, **kwargs: pytest.fail("reconnected")
+        await prosim.connect("localhost", timeout=1.0)
+        assert prosim.connected
+
+    asyncio.run(main())
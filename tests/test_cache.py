@@ -0,0 +1,117 @@
+import logging
+import time
+
+from pyprosim import PyProsim, SimulatedBackend
+from pyprosim.cache import CatalogCache
+from pyprosim.simulator import generate_catalog
+
+FIELDS = ("Name", "Description", "DataType", "DataUnit", "CanRead", "CanWrite")
+
+
+def fields(descriptions):
+    return [tuple(getattr(d, field) for field in FIELDS) for d in descriptions]
+
+
+def test_store_and_load_round_trip(tmp_path):
+    catalog = generate_catalog(500)
+    cache = CatalogCache(tmp_path / "catalog.bin")
+    key = CatalogCache.make_key({"mode": "Simulated"})
+    cache.store(key, catalog)
+
+    loaded = CatalogCache(tmp_path / "catalog.bin").load(key)
+    assert fields(loaded) == fields(catalog)
+
+
+def test_load_rejects_other_keys_and_corrupted_files(tmp_path):
+    path = tmp_path / "catalog.bin"
+    cache = CatalogCache(path)
+    key = CatalogCache.make_key({"mode": "Simulated"})
+    cache.store(key, generate_catalog(50))
+
+    assert cache.load(CatalogCache.make_key({"mode": "Other"})) is None
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert cache.load(key) is None
+    assert CatalogCache(tmp_path / "missing.bin").load(key) is None
+
+
+def test_digest_follows_the_catalog():
+    catalog = generate_catalog(50)
+    digest = CatalogCache.catalog_digest(catalog)
+    assert CatalogCache.catalog_digest(generate_catalog(50)) == digest
+    assert CatalogCache.catalog_digest(catalog[:-1]) != digest
+
+
+def test_second_connection_reads_the_cache(tmp_path):
+    path = tmp_path / "catalog.bin"
+    first = PyProsim(backend=SimulatedBackend(catalog_size=200), catalog_cache=path)
+    first.connect("localhost")
+    assert path.exists()
+
+    second = PyProsim(backend=SimulatedBackend(catalog_size=200), catalog_cache=path)
+    second.connect("localhost")
+    assert second.get_dataref_database() == first.get_dataref_database()
+
+
+class CountingBackend(SimulatedBackend):
+    """Counts the full catalog downloads"""
+
+    downloads = 0
+
+    def create_sdk(self):
+        sdk = super().create_sdk()
+        download = sdk.getDataRefDescriptions
+
+        def counted():
+            CountingBackend.downloads += 1
+            return download()
+
+        sdk.getDataRefDescriptions = counted
+        return sdk
+
+
+def test_cache_hit_does_not_download_the_catalog(tmp_path):
+    path = tmp_path / "catalog.bin"
+    PyProsim(backend=SimulatedBackend(catalog_size=50), catalog_cache=path).connect(
+        "localhost"
+    )
+    CountingBackend.downloads = 0
+    prosim = PyProsim(backend=CountingBackend(catalog_size=50), catalog_cache=path)
+    prosim.connect("localhost")
+    # A revalidation would download it in the background
+    time.sleep(0.1)
+    assert CountingBackend.downloads == 0
+    assert len(prosim.get_dataref_database()) == 50
+
+
+def test_revalidation_refreshes_a_changed_catalog(tmp_path):
+    path = tmp_path / "catalog.bin"
+    PyProsim(backend=SimulatedBackend(catalog_size=50), catalog_cache=path).connect(
+        "localhost"
+    )
+    cache = CatalogCache(path, revalidate=True)
+    prosim = PyProsim(backend=SimulatedBackend(catalog_size=60), catalog_cache=cache)
+    prosim.connect("localhost")
+    deadline = time.monotonic() + 5
+    while len(prosim.get_dataref_database()) != 60 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(prosim.get_dataref_database()) == 60
+    assert (
+        len(
+            CatalogCache(path).load(
+                cache.make_key(prosim.get_info(), prosim.backend.version)
+            )
+        )
+        == 60
+    )
+
+
+def test_revalidation_errors_are_logged(tmp_path, caplog):
+    path = tmp_path / "catalog.bin"
+    prosim = PyProsim(backend=SimulatedBackend(catalog_size=50), catalog_cache=path)
+    prosim.connect("localhost")
+    prosim.sdk.getDataRefDescriptions = lambda: 1 / 0
+    with caplog.at_level(logging.ERROR, logger="pyprosim.pyprosim"):
+        prosim._revalidate_catalog(b"")
+    assert "Catalog revalidation failed" in caplog.text
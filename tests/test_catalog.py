@@ -0,0 +1,56 @@
+from pyprosim import PyProsim, SimulatedBackend
+from pyprosim.catalog import Catalog, DataTypeTable
+from pyprosim.simulator import SimulatedDataRefDescription, generate_catalog
+
+
+def test_entries_match_the_descriptions():
+    descriptions = generate_catalog(100)
+    catalog = Catalog.from_descriptions(
+        descriptions, DataTypeTable(SimulatedBackend(catalog_size=0))
+    )
+    assert len(catalog) == 100
+    for position, d in enumerate(descriptions):
+        assert catalog.entry(position) == (
+            d.Name,
+            d.Description,
+            d.DataType,
+            d.DataUnit,
+            d.CanRead,
+            d.CanWrite,
+        )
+        assert d.Name in catalog
+
+
+def test_types_and_units_are_interned():
+    descriptions = generate_catalog(1000)
+    data_types = DataTypeTable(SimulatedBackend(catalog_size=0))
+    catalog = Catalog.from_descriptions(descriptions, data_types)
+    assert sorted(data_types.names) == sorted({d.DataType for d in descriptions})
+    assert sorted(catalog.units) == sorted({d.DataUnit for d in descriptions})
+    assert catalog.type_label(catalog.index["aircraft.engines.1.n1"]) == "Double"
+
+
+def test_repeated_names_keep_the_first_description():
+    descriptions = [
+        SimulatedDataRefDescription("a", "first", "System.Int32", "", True, False),
+        SimulatedDataRefDescription("a", "second", "System.Double", "", True, True),
+    ]
+    catalog = Catalog.from_descriptions(
+        descriptions, DataTypeTable(SimulatedBackend(catalog_size=0))
+    )
+    assert len(catalog) == 1
+    assert catalog.description(0) == "first"
+
+
+def test_dataref_objects_are_created_on_demand():
+    prosim = PyProsim(backend=SimulatedBackend(catalog_size=1000))
+    prosim.connect("localhost")
+    assert len(prosim._datarefs) == 0
+    assert len(prosim.get_dataref_database()) == 1000
+
+    dataref = prosim.get_dataref_obj("aircraft.engines.1.n1")
+    assert dataref is prosim.get_dataref_obj("aircraft.engines.1.n1")
+    assert dataref.description == "Engine N1 1"
+    assert dataref.data_unit == "%"
+    assert not dataref.can_write
+    assert list(prosim._datarefs) == ["aircraft.engines.1.n1"]
@@ -0,0 +1,82 @@
+import pytest
+
+from pyprosim.exceptions import PyProsimDatarefException
+
+
+def test_expression_is_computed_when_an_input_changes(prosim, backend):
+    prosim.add_derived("hw.sum", "{test.double} + {test.int32}", 100)
+    received = []
+    prosim.activate_dataref("hw.sum", 0, lambda dataref: received.append(dataref.value))
+    backend.emit("test.double", 1.5)
+    backend.emit("test.int32", 2)
+    assert prosim.get_value("hw.sum") == 3.5
+    assert received[-1] == 3.5
+
+
+def test_only_the_affected_datarefs_are_computed(prosim, backend):
+    prosim.add_derived("hw.double", "{test.double} * 2", 100)
+    prosim.add_derived("hw.high", lambda value: value > 10, 100, inputs=["hw.double"])
+    prosim.add_derived("hw.negative", "{test.int32} < 0", 100)
+    backend.emit("test.int32", -1)
+    computed = prosim.stats()["derived"]["computed"]
+
+    backend.emit("test.double", 6.0)
+    assert prosim.get_value("hw.double") == 12.0
+    assert prosim.get_value("hw.high") is True
+    # hw.double and hw.high, not hw.negative
+    assert prosim.stats()["derived"]["computed"] == computed + 2
+
+
+def test_unchanged_value_does_not_notify(prosim, backend):
+    prosim.add_derived("hw.positive", "{test.double} > 0", 100)
+    received = []
+    prosim.activate_dataref(
+        "hw.positive", 0, lambda dataref: received.append(dataref.value)
+    )
+    for value in (1.0, 2.0, 3.0, -1.0):
+        backend.emit("test.double", value)
+    assert received == [True, False]
+
+
+def test_invalid_derived_datarefs_are_rejected(prosim):
+    prosim.add_derived("hw.copy", "{test.double}", 100)
+    with pytest.raises(PyProsimDatarefException):
+        prosim.add_derived("hw.copy", "{test.double}", 100)
+    with pytest.raises(PyProsimDatarefException):
+        prosim.add_derived("hw.unknown", "{test.missing} + 1", 100)
+    with pytest.raises(PyProsimDatarefException):
+        prosim.set_value("hw.copy", 1.0)
+
+
+def test_remove_releases_the_inputs(prosim, backend):
+    prosim.add_derived("hw.copy", "{test.double}", 100)
+    prosim.remove_derived("hw.copy")
+    assert prosim.subscriptions() == []
+    with pytest.raises(PyProsimDatarefException):
+        prosim.get_value("hw.copy")
+
+
+def test_deactivate_releases_the_derived_subscriptions(prosim, backend):
+    prosim.add_derived("hw.copy", "{test.double}", 100)
+    received = []
+    prosim.activate_dataref(
+        "hw.copy", 0, lambda dataref: received.append(dataref.value)
+    )
+    prosim.deactivate_dataref("hw.copy")
+    backend.emit("test.double", 1.0)
+    assert received == []
+    assert prosim.subscriptions("hw.copy") == []
+
+
+def test_change_listener_of_a_derived_dataref_can_be_removed(prosim, backend):
+    prosim.add_derived("hw.copy", "{test.double}", 100)
+    changes = []
+
+    def listener(name, value):
+        changes.append(value)
+
+    prosim.add_change_listener("hw.copy", listener)
+    backend.emit("test.double", 1.0)
+    prosim.remove_change_listener("hw.copy", listener)
+    backend.emit("test.double", 2.0)
+    assert changes == [1.0]
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from pyprosim import CallbackDispatcher, PyProsim
+
+
+def test_events_of_a_busy_key_are_merged():
+    dispatcher = CallbackDispatcher()
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def slow(value):
+        started.set()
+        release.wait(1.0)
+        received.append(value)
+
+    dispatcher.submit("key", slow, (0,))
+    assert started.wait(1.0)
+    for value in range(1, 10):
+        dispatcher.submit("key", slow, (value,))
+    release.set()
+    assert dispatcher.join(1.0)
+    dispatcher.stop()
+
+    # The first call, then only the latest of the events queued meanwhile
+    assert received == [0, 9]
+    stats = dispatcher.stats()
+    assert stats["submitted"] == 10
+    assert stats["merged"] == 8
+    assert stats["delivered"] == 2
+
+
+def test_callback_errors_are_counted():
+    dispatcher = CallbackDispatcher()
+    dispatcher.submit("key", lambda: 1 / 0, ())
+    dispatcher.submit("other", lambda: None, ())
+    assert dispatcher.join(1.0)
+    dispatcher.stop()
+    assert dispatcher.stats()["errors"] == 1
+    assert dispatcher.stats()["delivered"] == 2
+
+
+def test_callbacks_run_outside_the_event_thread(backend):
+    dispatcher = CallbackDispatcher()
+    prosim = PyProsim(backend=backend, dispatcher=dispatcher)
+    prosim.connect("localhost")
+    threads = []
+    prosim.activate_dataref(
+        "test.double", 100, lambda dataref: threads.append(threading.current_thread())
+    )
+    backend.emit("test.double", 1.0)
+    assert dispatcher.join(1.0)
+    dispatcher.stop()
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
+
+
+def test_join_returns_after_stop():
+    dispatcher = CallbackDispatcher()
+    release = threading.Event()
+    dispatcher.submit("slow", release.wait, (1.0,))
+    for key in range(100):
+        dispatcher.submit(key, lambda: None, ())
+    threading.Timer(0.05, release.set).start()
+    dispatcher.stop()
+
+    start = time.monotonic()
+    assert dispatcher.join(1.0)
+    assert time.monotonic() - start < 0.5
+    assert dispatcher.stats()["pending"] == 0
@@ -0,0 +1,53 @@
+from pyprosim import Deadband, DiscreteChange, Hysteresis, MinInterval
+from pyprosim.filters import FilterChain
+
+
+def delivered(chain: FilterChain, values, times=None):
+    times = times or range(len(values))
+    return [value for value, now in zip(values, times) if chain.accept(value, now)]
+
+
+def test_deadband():
+    chain = FilterChain([Deadband(absolute=0.5)])
+    assert delivered(chain, [10.0, 10.3, 10.6, 10.7, 9.0]) == [10.0, 10.6, 9.0]
+    chain = FilterChain([Deadband(relative=0.1)])
+    assert delivered(chain, [100.0, 109.0, 111.0, 101.0]) == [100.0, 111.0]
+
+
+def test_hysteresis_delivers_state_changes():
+    running = Hysteresis(low=18, high=22)
+    chain = FilterChain([running])
+    assert delivered(chain, [0, 20, 23, 20, 19, 17, 20]) == [0, 23, 17]
+    assert running.state is False
+
+
+def test_min_interval_and_discrete_change():
+    chain = FilterChain([MinInterval(1.0)])
+    assert delivered(chain, [1, 2, 3, 4], [0.0, 0.5, 1.0, 1.2]) == [1, 3]
+    chain = FilterChain([DiscreteChange()])
+    assert delivered(chain, [1, 1, 2, 2, 1]) == [1, 2, 1]
+
+
+def test_first_rejecting_filter_counts_the_event():
+    deadband = Deadband(absolute=1.0)
+    discrete = DiscreteChange()
+    chain = FilterChain([deadband, discrete])
+    delivered(chain, [0.0, 0.5, 2.0])
+    stats = chain.stats()
+    assert stats["received"] == 3
+    assert stats["delivered"] == 2
+    assert stats["suppressed"] == [("Deadband", 1), ("DiscreteChange", 0)]
+
+
+def test_filtered_activation(prosim, backend):
+    received = []
+    prosim.activate_dataref(
+        "test.double",
+        100,
+        lambda dataref: received.append(dataref.value),
+        filters=[Deadband(absolute=1.0)],
+    )
+    for value in (1.0, 1.5, 3.0, 3.2):
+        backend.emit("test.double", value)
+    assert received == [1.0, 3.0]
+    assert "test.double" in prosim.filter_stats()
@@ -0,0 +1,130 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from pyprosim.exceptions import PyProsimDatarefException
+from pyprosim.gateway import Gateway, GatewayClient, GatewayProtocol
+
+
+@pytest.mark.parametrize(
+    "value", [None, True, -(2**63), 2**63 - 1, 0.25, "", "TEXT", "é" * 10]
+)
+def test_values_round_trip(value):
+    decoded, offset = GatewayProtocol.decode_value(GatewayProtocol.encode_value(value))
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+@pytest.mark.parametrize("udp", [False, True])
+def test_get_set_and_subscribe(prosim, backend, free_port, udp):
+    with Gateway(prosim, port=free_port), GatewayClient(
+        port=free_port, udp=udp
+    ) as client:
+        client.set("test.int32", 5)
+        assert backend.values["test.int32"] == 5
+        assert client.get("test.int32") == 5
+
+        updated = threading.Event()
+        received = []
+
+        def on_update(name, value):
+            received.append((name, value))
+            updated.set()
+
+        assert client.subscribe("test.double", 10, on_update) == 0.0
+        backend.emit("test.double", 3.5)
+        assert updated.wait(2.0)
+        assert received[-1] == ("test.double", 3.5)
+
+
+def test_unknown_dataref_is_an_error(prosim, free_port):
+    with Gateway(prosim, port=free_port), GatewayClient(port=free_port) as client:
+        with pytest.raises(PyProsimDatarefException):
+            client.get("test.unknown")
+        with pytest.raises(PyProsimDatarefException):
+            client.set("test.readonly", 1.0)
+
+
+def test_clients_share_one_activation(prosim, free_port):
+    with Gateway(prosim, port=free_port), GatewayClient(
+        port=free_port
+    ) as first, GatewayClient(port=free_port) as second:
+        first.subscribe("test.double", 200, lambda name, value: None)
+        second.subscribe("test.double", 50, lambda name, value: None)
+        assert prosim.get_dataref_obj("test.double").interval == 50
+
+
+def test_encode_uint64_and_long_text():
+    value, _ = GatewayProtocol.decode_value(GatewayProtocol.encode_value(2**64 - 1))
+    assert value == 2**64 - 1
+    text, _ = GatewayProtocol.decode_value(GatewayProtocol.encode_value("é" * 40000))
+    assert len(text.encode()) <= GatewayProtocol.MAX_TEXT
+    assert text == "é" * len(text)
+
+
+def test_unencodable_values_keep_serving(prosim, backend, free_port):
+    with Gateway(prosim, port=free_port), GatewayClient(port=free_port) as client:
+        received = []
+        updated = threading.Event()
+
+        def on_update(name, value):
+            received.append(value)
+            if value == "after":
+                updated.set()
+
+        client.subscribe("test.uint64", 10, on_update)
+        client.subscribe("test.string", 10, on_update)
+        backend.emit("test.uint64", 2**63 + 5)
+        backend.emit("test.string", "x" * 100000)
+        backend.emit("test.string", "after")
+        assert updated.wait(2.0)
+        assert 2**63 + 5 in received
+
+        # Past uint64 the value is sent as text
+        backend.values["test.uint64"] = 2**70
+        assert client.get("test.uint64") == str(2**70)
+        backend.values["test.uint64"] = 2**64 - 1
+        assert client.get("test.uint64") == 2**64 - 1
+
+
+def test_start_raises_when_the_port_is_taken(prosim, free_port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as taken:
+        taken.bind(("127.0.0.1", free_port))
+        taken.listen()
+        gateway = Gateway(prosim, port=free_port)
+        with pytest.raises(OSError):
+            gateway.start()
+
+
+def test_slow_sdk_calls_do_not_block_the_other_clients(prosim, backend, free_port):
+    with Gateway(prosim, port=free_port) as gateway, GatewayClient(
+        port=free_port
+    ) as first, GatewayClient(port=free_port) as second:
+        backend.latency = 0.5
+        subscribe = threading.Thread(
+            target=first.subscribe, args=("test.double", 10, lambda name, value: None)
+        )
+        subscribe.start()
+        # The activation of the subscription is in progress
+        time.sleep(0.1)
+        start = time.monotonic()
+        second._request(GatewayProtocol.PING, b"")
+        elapsed = time.monotonic() - start
+        subscribe.join()
+        backend.latency = 0.0
+        assert gateway.stats()["subscriptions"] == 1
+    assert elapsed < 0.25
+
+
+def test_closed_clients_release_their_subscriptions(prosim, free_port):
+    with Gateway(prosim, port=free_port) as gateway:
+        with GatewayClient(port=free_port) as client:
+            client.subscribe("test.double", 10, lambda name, value: None)
+            assert prosim.get_dataref_obj("test.double").interval == 10
+        deadline = time.monotonic() + 2
+        while gateway.stats()["subscriptions"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert gateway.stats()["subscriptions"] == 0
+    assert prosim.subscriptions("test.double") == []
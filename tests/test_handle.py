@@ -0,0 +1,24 @@
+import pytest
+
+from pyprosim.exceptions import PyProsimDatarefException, PyProsimTypeException
+
+
+def test_get_and_set(prosim, backend):
+    prosim.activate_dataref("test.int32", 0)
+    handle = prosim.handle("test.int32")
+    assert handle.name == "test.int32"
+    handle.set("7")
+    assert backend.values["test.int32"] == 7
+    backend.emit("test.int32", 9)
+    assert handle.get() == 9
+
+
+def test_checks_are_kept(prosim):
+    with pytest.raises(PyProsimDatarefException):
+        prosim.handle("test.int32")
+    prosim.activate_dataref("test.int32", 0)
+    prosim.activate_dataref("test.readonly", 0)
+    with pytest.raises(PyProsimTypeException):
+        prosim.handle("test.int32").set("not a number")
+    with pytest.raises(PyProsimDatarefException):
+        prosim.handle("test.readonly").set(1.0)
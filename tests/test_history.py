@@ -0,0 +1,77 @@
+import pytest
+
+from pyprosim import History
+from pyprosim.exceptions import PyProsimDatarefException
+
+
+def filled(capacity: int, samples: int) -> History:
+    history = History("test.double", capacity)
+    for t in range(samples):
+        history.append(float(t), 2.0 * t)
+    return history
+
+
+def test_full_buffer_keeps_the_latest_samples_contiguous():
+    history = filled(4, 10)
+    assert len(history) == 4
+    times, values = history.window()
+    assert list(times) == [6.0, 7.0, 8.0, 9.0]
+    assert list(values) == [12.0, 14.0, 16.0, 18.0]
+    assert history.last(2) == [(8.0, 16.0), (9.0, 18.0)]
+
+
+def test_window_queries():
+    history = filled(8, 6)
+    # Samples at t = 3, 4 and 5
+    times, values = history.window(seconds=2.5, now=5.0)
+    assert list(times) == [3.0, 4.0, 5.0]
+    assert history.min() == 0.0
+    assert history.max() == 10.0
+    assert history.mean() == 5.0
+    assert history.slope() == pytest.approx(2.0)
+    stats = history.stats()
+    assert stats["samples"] == 6
+    assert stats["last"] == 10.0
+
+
+def test_empty_history():
+    history = History("test.double", 4)
+    assert history.min() is None
+    assert history.slope() is None
+    assert history.stats()["samples"] == 0
+
+
+def test_history_is_filled_from_the_change_events(prosim, backend):
+    history = prosim.keep_history("test.double", capacity=16, interval=100)
+    assert prosim.keep_history("test.double") is history
+    for value in (1.0, 2.0, 3.0):
+        backend.emit("test.double", value)
+    assert [value for _, value in history.last(3)] == [1.0, 2.0, 3.0]
+    assert prosim.history("test.double") is history
+
+    prosim.drop_history("test.double")
+    backend.emit("test.double", 4.0)
+    assert len(history) == 3
+    assert not prosim.get_dataref_obj("test.double").active
+    with pytest.raises(PyProsimDatarefException):
+        prosim.history("test.double")
+
+
+def test_non_numeric_values_are_rejected(prosim, backend):
+    history = prosim.keep_history("test.string", interval=100)
+    backend.emit("test.string", "abc")
+    assert len(history) == 0
+    assert history.rejected == 1
+
+
+def test_history_of_a_derived_dataref(prosim, backend):
+    prosim.add_derived("hw.double", "{test.double} * 2", 100)
+    history = prosim.keep_history("hw.double", interval=100)
+    backend.emit("test.double", 1.0)
+    assert [value for _, value in history.last()] == [2.0]
+
+    prosim.drop_history("hw.double")
+    backend.emit("test.double", 2.0)
+    assert len(history) == 1
+    assert prosim.get_dataref_obj("hw.double")._listeners == ()
+    assert prosim.subscriptions("hw.double") == []
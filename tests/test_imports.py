@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import pyprosim
+
+
+def loaded_modules(statement: str) -> set:
+    """Modules loaded by a statement in a fresh interpreter"""
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[1],
+    ).stdout
+    return set(output.split())
+
+
+def test_import_loads_no_submodule():
+    modules = loaded_modules("import pyprosim")
+    assert "pyprosim" in modules
+    assert not {name for name in modules if name.startswith("pyprosim.")}
+    assert not {"asyncio", "http.server", "clr"} & modules
+
+
+def test_names_are_imported_on_first_access():
+    modules = loaded_modules("from pyprosim import SimulatedBackend")
+    assert "pyprosim.simulator" in modules
+    assert "pyprosim.gateway" not in modules
+
+
+def test_optional_features_are_imported_on_first_use():
+    modules = loaded_modules("from pyprosim import PyProsim")
+    features = ("adaptive", "cache", "history", "metrics", "snapshot", "trace")
+    assert not {f"pyprosim.{name}" for name in features} & modules
+
+
+@pytest.mark.parametrize("name", pyprosim.__all__)
+def test_every_export_resolves(name):
+    assert getattr(pyprosim, name).__name__ == name
+
+
+def test_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        pyprosim.NotAName
@@ -0,0 +1,138 @@
+import fnmatch
+import re
+
+import pytest
+
+from pyprosim import PyProsim, SimulatedBackend
+from pyprosim.simulator import SimulatedDataRefDescription
+
+
+@pytest.fixture(scope="module")
+def prosim() -> PyProsim:
+    prosim = PyProsim(backend=SimulatedBackend(catalog_size=2000))
+    prosim.connect("localhost")
+    return prosim
+
+
+def glob_match(pattern: str, name: str) -> bool:
+    """Reference glob: segments matched one by one, "**" any number of them"""
+
+    def match(patterns, segments):
+        if not patterns:
+            return not segments
+        if patterns[0] == "**":
+            return any(
+                match(patterns[1:], segments[i:]) for i in range(len(segments) + 1)
+            )
+        return bool(segments) and (
+            fnmatch.fnmatchcase(segments[0], patterns[0])
+            and match(patterns[1:], segments[1:])
+        )
+
+    return match(pattern.split("."), name.split("."))
+
+
+def matches(entry, can_read=None, can_write=None, data_type=None):
+    """Reference filters on a get_dataref_database() entry"""
+    return (
+        (can_read is None or entry["read_access"] == can_read)
+        and (can_write is None or entry["write_access"] == can_write)
+        and (data_type is None or entry["data_type"] == data_type)
+    )
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "aircraft.engines.*.n1",
+        "system.gates.B_GATE_1?",
+        "system.*.[AB]_*_7",
+        "**.n1",
+        "aircraft.**.voltage",
+        "**.engines.**.n1",
+        "aircraft.**",
+        "**.B_GATE_1?",
+        "system.gates.B_GATE_1[0-2]*",
+        "**",
+        "aircraft.engines.1.n1",
+        "nothing.*",
+    ],
+)
+def test_glob_matches_the_reference(prosim, pattern):
+    names = prosim.get_dataref_database()
+    expected = {name for name in names if glob_match(pattern, name)}
+    result = prosim.index.glob(pattern)
+    assert len(result) == len(set(result))
+    assert set(result) == expected
+
+
+def test_prefix_subtree_and_regex(prosim):
+    names = list(prosim.get_dataref_database())
+    assert set(prosim.index.prefix("system.gates.B_GATE_1")) == {
+        name for name in names if name.startswith("system.gates.B_GATE_1")
+    }
+    subtree = prosim.index.subtree("aircraft.engines")
+    assert set(subtree) == {n for n in names if n.startswith("aircraft.engines.")}
+    assert subtree == sorted(subtree, key=lambda name: name.split("."))
+    assert prosim.index.subtree("aircraft.engines.1.n1") == ["aircraft.engines.1.n1"]
+    assert set(prosim.index.regex(r"tank\d+\.amount")) == {
+        name for name in names if re.search(r"tank\d+\.amount", name)
+    }
+
+
+def test_filters(prosim):
+    database = prosim.get_dataref_database()
+    writable = prosim.index.subtree("system", can_write=True)
+    assert set(writable) == {
+        name
+        for name, entry in database.items()
+        if name.startswith("system.") and entry["write_access"]
+    }
+    assert prosim.index.glob("system.*.*", data_type="Int16") == prosim.index.glob(
+        "system.*.*", data_type="System.Int16"
+    )
+    assert all(
+        database[name]["data_type"] == "Int16"
+        for name in prosim.index.glob("system.*.*", data_type="Int16")
+    )
+
+
+def test_children_and_is_dataref(prosim):
+    assert set(prosim.index.children()) == {"aircraft", "system"}
+    assert "aircraft.engines" in prosim.index.children("aircraft")
+    assert prosim.index.is_dataref("aircraft.engines.1.n1")
+    assert not prosim.index.is_dataref("aircraft.engines")
+
+
+def test_glob_with_repeated_segment_names():
+    names = ["a.x", "a.x.x", "a.x.x.x", "a.y.x", "b.x.y", "x", "x.a"]
+    prosim = PyProsim(
+        backend=SimulatedBackend(
+            catalog=[
+                SimulatedDataRefDescription(name, "", "System.Double", "", True, True)
+                for name in names
+            ]
+        )
+    )
+    prosim.connect("localhost")
+    for pattern in ("**.x", "a.**.x", "x.**", "**.x.**", "a.x.**.x", "**.x.x"):
+        result = prosim.index.glob(pattern)
+        assert len(result) == len(set(result))
+        assert set(result) == {name for name in names if glob_match(pattern, name)}
+
+
+def test_filtered_ranges_match_the_catalog(prosim):
+    database = prosim.get_dataref_database()
+    for path in ("", "aircraft", "system.gates"):
+        for filters in (
+            {"can_read": True},
+            {"can_write": False},
+            {"data_type": "Double"},
+            {"can_write": True, "data_type": "Int32"},
+        ):
+            result = prosim.index.subtree(path, **filters)
+            assert result == [
+                name
+                for name in prosim.index.subtree(path)
+                if matches(database[name], **filters)
+            ]
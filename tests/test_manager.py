@@ -0,0 +1,106 @@
+import pytest
+
+from pyprosim import ProsimManager, SimulatedBackend
+from pyprosim.exceptions import PyProsimDatarefException
+from pyprosim.simulator import SimulatedDataRefDescription
+
+CATALOG = [
+    SimulatedDataRefDescription("test.double", "", "System.Double", "", True, True),
+    SimulatedDataRefDescription("test.int32", "", "System.Int32", "", True, True),
+]
+
+
+@pytest.fixture
+def manager():
+    manager = ProsimManager()
+    backends = {}
+    for name in ("main", "ios"):
+        backends[name] = SimulatedBackend(catalog=list(CATALOG))
+        manager.add_node(name, "localhost", backend=backends[name])
+    with manager:
+        assert manager.wait_connected(timeout=5)
+        yield manager, backends
+
+
+def test_nodes_share_one_catalog(manager):
+    manager, _ = manager
+    main = manager.node("main").prosim
+    ios = manager.node("ios").prosim
+    assert main._catalog is ios._catalog
+    assert manager.stats()["catalogs"]["catalogs"] == 1
+
+
+def test_namespaced_reads_writes_and_events(manager):
+    manager, backends = manager
+    received = []
+    manager.subscribe(
+        "ios:test.double", 100, lambda dataref: received.append(dataref.value)
+    )
+    manager.subscribe("main:test.int32", 0)
+    manager.set_value("main:test.int32", 7)
+    backends["ios"].emit("test.double", 2.5)
+
+    assert manager.get_value("main:test.int32") == 7
+    assert received == [2.5]
+    stats = manager.stats()["nodes"]
+    assert (stats["main"]["reads"], stats["main"]["writes"]) == (1, 1)
+    assert stats["ios"]["events"] == 1
+    assert len(manager.subscriptions()) == 2
+
+
+def test_same_callback_shares_the_subscription(manager):
+    manager, backends = manager
+    received = []
+
+    def on_change(dataref):
+        received.append(dataref.value)
+
+    first = manager.subscribe("ios:test.double", 100, on_change)
+    second = manager.subscribe("ios:test.double", 100, on_change)
+    assert first is second
+    assert first.refs == 2
+    backends["ios"].emit("test.double", 1.5)
+    assert received == [1.5]
+    assert manager.stats()["nodes"]["ios"]["events"] == 1
+
+
+def test_invalid_names_are_rejected(manager):
+    manager, _ = manager
+    with pytest.raises(PyProsimDatarefException):
+        manager.get_value("test.double")
+    with pytest.raises(PyProsimDatarefException):
+        manager.get_value("other:test.double")
+    with pytest.raises(PyProsimDatarefException):
+        manager.add_node("main", "localhost", backend=SimulatedBackend())
+
+
+def test_released_subscriptions_are_not_counted(manager):
+    manager, backends = manager
+    node = manager.node("ios")
+    subscription = manager.subscribe("ios:test.double", 100)
+    backends["ios"].emit("test.double", 1.5)
+    subscription.cancel()
+    assert node.stats()["events"] == 1
+    assert node.prosim.get_dataref_obj("test.double")._listeners == ()
+
+    # Subscribed outside the manager
+    node.prosim.activate_dataref("test.double", 100)
+    backends["ios"].emit("test.double", 2.5)
+    assert node.stats()["events"] == 1
+
+
+def test_events_are_counted_after_a_catalog_change(manager):
+    manager, backends = manager
+    node = manager.node("ios")
+    manager.subscribe("ios:test.double", 100)
+    backends["ios"].catalog[0] = SimulatedDataRefDescription(
+        "test.double", "", "System.Double", "ft", True, True
+    )
+    before = node.prosim.get_dataref_obj("test.double")
+    assert node.prosim._parse_supported_datarefs() == (False, 1)
+    assert node.prosim.get_dataref_obj("test.double") is not before
+
+    manager.subscribe("ios:test.double", 100)
+    backends["ios"].emit("test.double", 1.5)
+    assert node.stats()["events"] == 1
+    assert before._listeners == ()
@@ -0,0 +1,57 @@
+import urllib.request
+
+from pyprosim import MetricsExporter, PyProsim
+from pyprosim.metrics import Histogram
+
+
+def test_histogram_quantiles():
+    histogram = Histogram(buckets=(0.001, 0.01, 0.1))
+    for value in (0.0005, 0.0005, 0.005, 0.05):
+        histogram.observe(value)
+    stats = histogram.stats()
+    assert stats["count"] == 4
+    assert stats["max"] == 0.05
+    assert stats["p50"] == 0.001
+    assert stats["p99"] == 0.05
+
+
+def test_metrics_are_disabled_by_default(prosim):
+    assert prosim.metrics is None
+    assert prosim.stats()["metrics"] is None
+
+
+def test_updates_callbacks_and_calls_are_measured(backend):
+    prosim = PyProsim(backend=backend, metrics=True)
+    prosim.connect("localhost")
+    received = []
+    prosim.activate_dataref(
+        "test.double", 100, lambda dataref: received.append(dataref.value)
+    )
+    for value in (1.0, 2.0, 3.0):
+        backend.emit("test.double", value)
+    prosim.activate_dataref("test.int32", 0)
+    prosim.set_value("test.int32", 5)
+    assert prosim.get_value("test.int32") == 5
+
+    metrics = prosim.stats()["metrics"]
+    assert received == [1.0, 2.0, 3.0]
+    assert metrics["datarefs"]["test.double"]["updates"] == 3
+    assert metrics["callback_time"]["count"] == 3
+    assert metrics["event_age"]["count"] == 3
+    assert metrics["bridge_calls"]["get_value"]["count"] == 1
+    assert metrics["bridge_calls"]["set_value"]["count"] == 1
+    assert metrics["catalog_parse"]["count"] == 1
+
+
+def test_exporter_serves_prometheus_text(backend):
+    prosim = PyProsim(backend=backend, metrics=True)
+    prosim.connect("localhost")
+    prosim.activate_dataref("test.double", 100, lambda dataref: None)
+    backend.emit("test.double", 1.0)
+    with MetricsExporter(prosim.metrics, port=0) as exporter:
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            text = response.read().decode()
+    assert 'pyprosim_dataref_updates_total{dataref="test.double"} 1' in text
+    assert "pyprosim_callback_seconds_count 1" in text
+    assert 'pyprosim_bridge_call_seconds_bucket{call="get_value",le="+Inf"} 0' in text
@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+from pyprosim.exceptions import PyProsimDatarefException
+
+
+def test_frames_pass_the_values_in_order(prosim, backend):
+    frames = []
+    done = threading.Event()
+
+    def handler(values):
+        frames.append(list(values))
+        if len(frames) == 3:
+            done.set()
+
+    backend.emit("test.double", 1.5)
+    backend.emit("test.int32", 7)
+    group = prosim.add_frame_group(
+        "gauges", 100, ["test.int32", "test.double"], handler
+    )
+    assert done.wait(5)
+    assert prosim.frame_stats()["gauges"]["frames"] >= 3
+    prosim.remove_frame_group("gauges")
+    assert not group.running
+    assert frames[0] == [7, 1.5]
+
+
+def test_slow_handler_counts_overruns_and_skips_frames(prosim):
+    group = prosim.add_frame_group(
+        "slow", 200, ["test.double"], lambda values: time.sleep(0.03)
+    )
+    time.sleep(0.3)
+    prosim.remove_frame_group("slow")
+    stats = group.stats()
+    assert stats["frames"] >= 2
+    assert stats["overruns"] >= 1
+    assert stats["skipped"] >= stats["overruns"]
+    assert stats["frame_time"]["count"] == stats["frames"]
+
+
+def test_handler_errors_do_not_stop_the_group(prosim):
+    group = prosim.add_frame_group("broken", 100, ["test.double"], lambda values: 1 / 0)
+    time.sleep(0.1)
+    prosim.remove_frame_group("broken")
+    assert group.errors == group.frames >= 1
+
+
+def test_invalid_groups_are_rejected(prosim):
+    prosim.add_frame_group("gauges", 10, ["test.double"], lambda values: None)
+    try:
+        with pytest.raises(PyProsimDatarefException):
+            prosim.add_frame_group("gauges", 10, ["test.double"], lambda values: None)
+        with pytest.raises(PyProsimDatarefException):
+            prosim.add_frame_group("other", 10, ["test.missing"], lambda values: None)
+    finally:
+        prosim.remove_frame_group("gauges")
+    assert prosim.subscriptions() == []
@@ -0,0 +1,40 @@
+import uuid
+
+import pytest
+
+from pyprosim import SharedMemoryPublisher, SharedMemoryReader
+
+
+@pytest.fixture
+def segment() -> str:
+    return f"pyprosim-test-{uuid.uuid4().hex[:8]}"
+
+
+def test_reader_sees_the_published_values(prosim, backend, segment):
+    with SharedMemoryPublisher(prosim, ["test.*"], segment=segment, interval=100):
+        with SharedMemoryReader(segment) as reader:
+            assert "test.double" in reader
+            assert "test.unknown" not in reader
+            sequence, _ = reader.read("test.double")
+
+            backend.emit("test.double", 12.5)
+            backend.emit("test.int32", -3)
+            backend.emit("test.string", "é" * 100)
+            backend.emit("test.bool", True)
+
+            new_sequence, value = reader.read("test.double")
+            assert value == 12.5
+            assert new_sequence != sequence
+            assert reader.get("test.int32") == -3
+            assert reader.get("test.bool") is True
+            # Strings are truncated to the text capacity on a character boundary
+            text = reader.get("test.string")
+            assert 0 < len(text.encode()) <= 40
+            assert text == "é" * len(text)
+
+
+def test_segment_is_removed_on_stop(prosim, segment):
+    with SharedMemoryPublisher(prosim, ["test.double"], segment=segment, interval=100):
+        pass
+    with pytest.raises(FileNotFoundError):
+        SharedMemoryReader(segment, retries=1)
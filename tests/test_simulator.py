@@ -0,0 +1,74 @@
+import pytest
+
+from pyprosim import PyProsim, SimulatedBackend
+from pyprosim.exceptions import (
+    PyProsimDatarefException,
+    PyProsimTypeException,
+)
+from pyprosim.simulator import generate_catalog
+
+
+def test_connect_parses_the_catalog(prosim):
+    database = prosim.get_dataref_database()
+    assert sorted(database) == [
+        "test.bool",
+        "test.double",
+        "test.int32",
+        "test.readonly",
+        "test.string",
+        "test.uint64",
+    ]
+    assert database["test.int32"] == {
+        "description": "",
+        "data_type": "Int32",
+        "data_unit": "",
+        "read_access": True,
+        "write_access": True,
+    }
+
+
+def test_generated_catalog_is_deterministic():
+    names = [description.Name for description in generate_catalog(100)]
+    assert names == [description.Name for description in generate_catalog(100)]
+    assert len(set(names)) == 100
+    assert "aircraft.engines.1.n1" in names
+
+
+def test_set_value_casts_and_reaches_the_server(prosim, backend):
+    prosim.activate_dataref("test.int32", 0)
+    prosim.set_value("test.int32", "42")
+    assert backend.values["test.int32"] == 42
+    assert prosim.get_value("test.int32") == 42
+
+
+def test_set_value_rejects_bad_values(prosim):
+    prosim.activate_dataref("test.int32", 0)
+    prosim.activate_dataref("test.readonly", 0)
+    with pytest.raises(PyProsimTypeException):
+        prosim.set_value("test.int32", 2**40)
+    with pytest.raises(PyProsimDatarefException):
+        prosim.set_value("test.readonly", 1.0)
+    with pytest.raises(PyProsimDatarefException):
+        prosim.set_value("test.unknown", 1.0)
+
+
+def test_emit_calls_the_change_callback(prosim, backend):
+    received = []
+    prosim.activate_dataref(
+        "test.double", 100, lambda dataref: received.append(dataref.value)
+    )
+    backend.emit("test.double", 1.5)
+    backend.pump(2)
+    assert len(received) == 3
+    assert received[0] == 1.5
+
+
+def test_disconnect_calls_the_disconnect_callback():
+    disconnected = []
+    backend = SimulatedBackend(catalog_size=10)
+    prosim = PyProsim(
+        backend=backend, on_disconnect_callback=lambda: disconnected.append(1)
+    )
+    prosim.connect("localhost")
+    prosim.sdk.simulate_disconnect()
+    assert disconnected == [1]
@@ -0,0 +1,82 @@
+import struct
+
+import pytest
+
+from pyprosim.snapshot import Snapshot
+
+
+def test_save_load_round_trip(prosim, backend, tmp_path):
+    values = {
+        "test.uint64": 2**63 + 5,
+        "test.int32": -123456,
+        "test.double": 0.1,
+        "test.string": "TEXT",
+        "test.bool": True,
+    }
+    for name, value in values.items():
+        backend.values[name] = value
+
+    snapshot = prosim.snapshot("test.*")
+    path = tmp_path / "state.ppsn"
+    snapshot.save(path)
+    loaded = Snapshot.load(path)
+
+    # Read-only datarefs are not part of a snapshot
+    assert loaded.as_dict() == values
+    assert type(loaded.as_dict()["test.uint64"]) is int
+    assert loaded.taken == snapshot.taken
+    assert not prosim.get_dataref_obj("test.double").active
+
+
+def test_restore_writes_the_changed_values_in_order(prosim, backend):
+    backend.values.update({"test.int32": 1, "test.double": 1.5, "test.bool": True})
+    snapshot = prosim.snapshot("test.*")
+    backend.values.update({"test.int32": 2, "test.double": 2.5, "test.bool": False})
+
+    written = []
+    write = backend.write
+
+    def recording_write(name, value):
+        written.append(name)
+        write(name, value)
+
+    backend.write = recording_write
+    progress = []
+    report = prosim.restore(
+        snapshot,
+        order=["test.bool"],
+        chunk_size=2,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert report.ok
+    assert written[0] == "test.bool"
+    assert sorted(written[1:]) == ["test.double", "test.int32"]
+    assert sorted(report.written) == sorted(written)
+    assert report.unchanged == report.total - 3
+    assert progress[-1] == (3, 3)
+    assert backend.values["test.double"] == 1.5
+
+
+def test_restore_keeps_large_integers_exact(prosim, backend, tmp_path):
+    backend.values["test.uint64"] = 2**64 - 1
+    path = tmp_path / "state.ppsn"
+    prosim.snapshot("test.*").save(path)
+
+    backend.values["test.uint64"] = 0
+    report = prosim.restore(Snapshot.load(path))
+
+    assert report.ok
+    assert report.written == ["test.uint64"]
+    assert report.unchanged == report.total - 1
+    assert backend.values["test.uint64"] == 2**64 - 1
+
+
+def test_other_format_versions_are_rejected(tmp_path):
+    path = tmp_path / "state.ppsn"
+    Snapshot(["test.double"], [1.5]).save(path)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<H", data, 4, Snapshot.FORMAT_VERSION + 1)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="not supported"):
+        Snapshot.load(path)
@@ -0,0 +1,56 @@
+import time
+
+
+def sdk_objects(backend, name):
+    return len(backend._datarefs.get(name, ()))
+
+
+def test_subscriptions_share_one_sdk_object(prosim, backend):
+    fast = prosim.activate_dataref("test.double", 50, lambda dataref: None)
+    slow = prosim.activate_dataref("test.double", 1000, lambda dataref: None)
+    dataref = prosim.get_dataref_obj("test.double")
+    assert sdk_objects(backend, "test.double") == 1
+    assert dataref.interval == 50
+    assert len(prosim.subscriptions("test.double")) == 2
+
+    fast.cancel()
+    assert dataref.interval == 1000
+    assert sdk_objects(backend, "test.double") == 1
+    slow.cancel()
+    assert not dataref.active
+    assert sdk_objects(backend, "test.double") == 0
+
+
+def test_same_callback_and_interval_adds_a_reference(prosim, backend):
+    def on_change(dataref):
+        pass
+
+    first = prosim.activate_dataref("test.double", 100, on_change)
+    second = prosim.activate_dataref("test.double", 100, on_change)
+    assert first is second
+    assert first.refs == 2
+    first.cancel()
+    assert prosim.get_dataref_obj("test.double").active
+    second.cancel()
+    assert not prosim.get_dataref_obj("test.double").active
+
+
+def test_slower_subscriptions_are_throttled(prosim, backend):
+    fast, slow = [], []
+    prosim.activate_dataref("test.double", 10, lambda dataref: fast.append(1))
+    prosim.activate_dataref("test.double", 10000, lambda dataref: slow.append(1))
+    for i in range(5):
+        backend.emit("test.double", float(i))
+        time.sleep(0.001)
+    assert len(fast) == 5
+    assert len(slow) == 1
+
+
+def test_deactivate_releases_every_subscription(prosim, backend):
+    subscriptions = [
+        prosim.activate_dataref("test.double", interval, lambda dataref: None)
+        for interval in (50, 100, 200)
+    ]
+    prosim.deactivate_dataref("test.double")
+    assert not any(subscription.active for subscription in subscriptions)
+    assert sdk_objects(backend, "test.double") == 0
@@ -0,0 +1,59 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SUITE_PATH = Path(__file__).parents[1] / "benchmarks" / "suite.py"
+
+
+@pytest.fixture(scope="module")
+def suite():
+    spec = importlib.util.spec_from_file_location("suite", SUITE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_summarize_returns_the_median_and_its_spread(suite):
+    median, spread = suite.summarize([1.0, 1.1, 0.9, 1.0, 5.0])
+    assert median == 1.0
+    assert spread == pytest.approx(0.1)
+    assert suite.summarize([0.0, 0.0]) == (0.0, 0.0)
+
+
+def test_compare_flags_the_regressions_past_the_threshold(suite, capsys):
+    baseline = {
+        "get_value.System.Double": {"value": 100.0, "spread": 0.01},
+        "dispatch.inline": {"value": 1000.0, "spread": 0.01},
+        "set_value.System.Double": {"value": 100.0, "spread": 0.01},
+    }
+    results = {
+        # 30 % slower
+        "get_value.System.Double": (130.0, 0.01, "ns/call", suite.LOWER),
+        # 30 % fewer events per second
+        "dispatch.inline": (700.0, 0.01, "events/s", suite.HIGHER),
+        # 10 % slower, within the threshold
+        "set_value.System.Double": (110.0, 0.01, "ns/call", suite.LOWER),
+        "activate.1000": (5.0, 0.01, "ms", suite.LOWER),
+    }
+    assert suite.compare(results, baseline, 0.2) == 2
+    output = capsys.readouterr().out
+    assert output.count("REGRESSION") == 2
+    assert "(new)" in output
+
+
+def test_noisy_results_need_a_larger_change(suite):
+    baseline = {"get_value.System.Double": {"value": 100.0, "spread": 0.01}}
+    # 30 % slower, but the runs spread by 15 %: the limit is 45 %
+    results = {"get_value.System.Double": (130.0, 0.15, "ns/call", suite.LOWER)}
+    assert suite.compare(results, baseline, 0.2) == 0
+
+
+def test_value_benchmarks_cover_every_type(suite):
+    samples = {}
+    suite.bench_values(samples, 10, (1, 3))
+    for type_name in suite.TYPE_VALUES:
+        values, unit, _ = samples[f"get_value.{type_name}"]
+        assert len(values) == 3
+        assert unit == "ns/call"
+        assert f"set_value.{type_name}" in samples
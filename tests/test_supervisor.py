@@ -0,0 +1,44 @@
+import time
+
+from pyprosim import PyProsim, ReconnectSupervisor
+
+
+def wait_until(condition, timeout=2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_subscriptions_survive_a_reconnection(backend):
+    prosim = PyProsim(backend=backend)
+    prosim.connect("localhost")
+    received = []
+    with ReconnectSupervisor(prosim, "localhost", initial_delay=1.0) as supervisor:
+        prosim.activate_dataref(
+            "test.double", 100, lambda dataref: received.append(dataref.value)
+        )
+        dataref = prosim.get_dataref_obj("test.double")
+
+        prosim.sdk.simulate_disconnect()
+        assert wait_until(lambda: supervisor.connections == 1)
+        backend.emit("test.double", 4.0)
+        assert received == [4.0]
+        # The catalog did not change, the Dataref objects are kept
+        assert prosim.get_dataref_obj("test.double") is dataref
+        assert supervisor.stats()["last_downtime"] is not None
+
+
+def test_retries_until_the_server_is_available(backend):
+    backend.available = False
+    prosim = PyProsim(backend=backend)
+    with ReconnectSupervisor(
+        prosim, "localhost", initial_delay=0.01, max_delay=0.02
+    ) as supervisor:
+        assert wait_until(lambda: supervisor.attempts >= 3)
+        assert not prosim.connected
+        backend.available = True
+        assert supervisor.wait_connected(2.0)
+        assert supervisor.stats()["connections"] == 1
@@ -0,0 +1,88 @@
+import struct
+import time
+
+import pytest
+
+from pyprosim import PyProsim, ReplayBackend, TelemetryLog, TelemetryRecorder
+from pyprosim.telemetry import TelemetryFormat
+
+CHANGES = [
+    ("test.double", 1.5),
+    ("test.int32", -7),
+    ("test.string", "TEXT"),
+    ("test.bool", True),
+    ("test.double", 2.5),
+]
+
+
+def record(prosim, backend, path):
+    with TelemetryRecorder(prosim, path, ["test.*"], interval=100) as recorder:
+        for name, value in CHANGES:
+            backend.emit(name, value)
+    assert recorder.recorded == len(CHANGES)
+
+
+def test_record_and_read_back(prosim, backend, tmp_path):
+    path = tmp_path / "flight.ptl"
+    record(prosim, backend, path)
+
+    log = TelemetryLog(path)
+    try:
+        assert len(log) == len(CHANGES)
+        events = list(log.events())
+        assert [(name, value) for _, name, value in events] == CHANGES
+        timestamps = [timestamp for timestamp, _, _ in events]
+        assert timestamps == sorted(timestamps)
+    finally:
+        log.close()
+
+
+def test_replay_as_a_backend(prosim, backend, tmp_path):
+    path = tmp_path / "flight.ptl"
+    record(prosim, backend, path)
+
+    replay = ReplayBackend(path, speed=None, autostart=False)
+    replayed = PyProsim(backend=replay)
+    replayed.connect("localhost")
+    assert sorted(replayed.get_dataref_database()) == sorted(
+        prosim.get_dataref_database()
+    )
+    received = []
+    for name in ("test.double", "test.int32"):
+        replayed.activate_dataref(
+            name, 100, lambda dataref: received.append((dataref.name, dataref.value))
+        )
+    replay.start()
+    assert replay.wait(2.0)
+    replay.stop()
+    assert received == [("test.double", 1.5), ("test.int32", -7), ("test.double", 2.5)]
+
+
+def test_stop_interrupts_a_real_time_replay(prosim, backend, tmp_path):
+    path = tmp_path / "flight.ptl"
+    with TelemetryRecorder(prosim, path, ["test.*"], interval=100):
+        backend.emit("test.double", 1.0)
+        time.sleep(0.05)
+        backend.emit("test.double", 2.0)
+
+    replay = ReplayBackend(path, speed=0.01, autostart=False)
+    PyProsim(backend=replay).connect("localhost")
+    replay.start()
+    deadline = time.monotonic() + 2
+    while replay.replayed < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    started = time.monotonic()
+    replay.stop()
+    assert time.monotonic() - started < 1
+    assert replay.replayed == 1
+    assert replay.finished.is_set()
+
+
+def test_other_format_versions_are_rejected(prosim, backend, tmp_path):
+    path = tmp_path / "flight.ptl"
+    record(prosim, backend, path)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<H", data, 4, TelemetryFormat.VERSION + 1)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        TelemetryLog(path)
@@ -0,0 +1,37 @@
+import json
+
+from pyprosim import PyProsim, Tracer
+
+
+def test_ring_buffer_keeps_the_latest_spans():
+    tracer = Tracer(capacity=4)
+    name_id = tracer.intern("test.double")
+    for start in range(10):
+        tracer.record(Tracer.EVENT, name_id, float(start))
+    spans = [event for event in tracer.events() if event["ph"] != "M"]
+    assert len(spans) == 4
+    assert [event["ts"] for event in spans] == sorted(event["ts"] for event in spans)
+    assert {event["name"] for event in spans} == {"event test.double"}
+
+
+def test_pipeline_spans_are_dumped(backend, tmp_path):
+    tracer = Tracer()
+    prosim = PyProsim(backend=backend, tracer=tracer)
+    prosim.connect("localhost")
+    prosim.activate_dataref("test.double", 100, lambda dataref: None)
+    backend.emit("test.double", 1.0)
+    prosim.set_value("test.double", 2.0)
+
+    path = tmp_path / "trace.json"
+    assert tracer.dump(path) > 0
+    events = json.loads(path.read_text())["traceEvents"]
+    names = {event["name"] for event in events if event["ph"] != "M"}
+    assert {
+        "connect localhost",
+        "catalog",
+        "activate test.double",
+        "event test.double",
+        "callback test.double",
+        "set_value test.double",
+    } <= names
+    assert any(event["ph"] == "M" for event in events)
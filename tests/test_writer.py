@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def writes(backend):
+    """Values written to the server"""
+    written = []
+    write = backend.write
+
+    def recording_write(name, value):
+        written.append((name, value))
+        write(name, value)
+
+    backend.write = recording_write
+    return written
+
+
+def test_deadband_suppresses_small_changes(prosim, writes):
+    prosim.activate_dataref("test.double", 0)
+    pipeline = prosim.configure_writes("test.double", deadband=0.1)
+    for value in (10.0, 10.05, 9.95, 10.2, 10.2):
+        prosim.set_value("test.double", value)
+    assert writes == [("test.double", 10.0), ("test.double", 10.2)]
+    assert pipeline.stats()["suppressed"] == 3
+
+    pipeline.reset()
+    prosim.set_value("test.double", 10.2)
+    assert writes[-1] == ("test.double", 10.2)
+    assert len(writes) == 3
+
+
+def test_rate_limit_keeps_the_latest_value(prosim, writes):
+    prosim.activate_dataref("test.int32", 0)
+    pipeline = prosim.configure_writes("test.int32", max_rate=1)
+    for value in range(1, 6):
+        prosim.set_value("test.int32", value)
+    assert writes == [("test.int32", 1)]
+    assert pipeline.pending
+    assert pipeline.stats()["coalesced"] == 3
+
+    assert prosim.flush_writes() == 1
+    assert writes == [("test.int32", 1), ("test.int32", 5)]
+    assert not pipeline.pending
+
+
+def test_flusher_sends_the_pending_write(prosim, writes):
+    prosim.activate_dataref("test.int32", 0)
+    prosim.configure_writes("test.int32", max_rate=20)
+    prosim.set_value("test.int32", 1)
+    prosim.set_value("test.int32", 2)
+    deadline = time.monotonic() + 1.0
+    while len(writes) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writes == [("test.int32", 1), ("test.int32", 2)]